@@ -1,14 +1,17 @@
 import streamlit as st
-import os
+import time
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
-from src.document_parser import DocumentParser
-from src.analyzer import PitchDeckAnalyzer
-from src.memo_generator import MemoGenerator
-from src.exporter import Exporter
-from src.models import PitchDeckData, InvestmentMemo, ExecutiveSummary
+from src.jobs import JobRunner, DONE, FAILED, RUNNING
+from src.llm import missing_api_key
+from src.store import AnalysisStore, content_hash
+from src.exporter import Exporter, export_cache
+from src.pdf_renderer import render_batch
+from src.similarity import shared_index
+from src.trace_panel import render_trace_panel
+from src.tracing import span
 
 
 # --- Page Config ---
@@ -21,6 +24,45 @@ st.set_page_config(
 
 
 
+@st.cache_resource
+def get_store():
+    return AnalysisStore()
+
+
+@st.cache_resource
+def get_job_runner():
+    return JobRunner()
+
+
+store = get_store()
+
+if "analysis_result" not in st.session_state:
+    st.session_state.analysis_result = None
+
+
+def cancel_prefetch():
+    """
+    Stops prefetching Ready Queries for the current analysis.
+    """
+    prefetcher = (st.session_state.analysis_result or {}).get("prefetch")
+    if prefetcher is not None:
+        prefetcher.cancel()
+
+
+def toggle_prefetch():
+    if not st.session_state.prefetch_ready_queries:
+        cancel_prefetch()
+
+
+def set_analysis_result(result):
+    """
+    Makes result the active analysis; the previous one's prefetch is cancelled.
+    """
+    if result is not st.session_state.analysis_result:
+        cancel_prefetch()
+    st.session_state.analysis_result = result
+
+
 # --- Sidebar & Setup ---
 with st.sidebar:
     st.title("🥚 HatchUp for VCs")
@@ -28,6 +70,36 @@ with st.sidebar:
     
 
     st.info("Upload a Pitch Deck (PDF, PPTX, or Image) to begin analysis.")
+    st.toggle(
+        "Prefetch Ready Queries",
+        key="prefetch_ready_queries",
+        help="Answer the Research Engine's Ready Queries in the background once an analysis completes.",
+        on_change=toggle_prefetch
+    )
+
+    # Past analyses from the persistent store
+    with st.expander("📁 Past Analyses"):
+        name_filter = st.text_input("Startup name", key="past_filter")
+        past = store.list(name=name_filter or None, limit=50)
+        if past:
+            picked = st.selectbox(
+                "Saved deals",
+                past,
+                format_func=lambda r: f"{r['startup_name']} · {time.strftime('%Y-%m-%d', time.localtime(r['created_at']))}"
+            )
+            if st.button("Load", use_container_width=True):
+                set_analysis_result(store.get(picked["content_hash"]))
+                st.session_state.pop("trace_id", None)
+            # Every saved deal in one workbook, streamed from the store when clicked
+            st.download_button(
+                "Portfolio Workbook (.xlsx)",
+                data=lambda: Exporter.to_portfolio_excel(store.iter_results()),
+                file_name="hatchup_portfolio.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True
+            )
+        else:
+            st.caption("No saved analyses yet.")
     st.caption("Powered by HatchUp.ai")
 
 # --- Main App Logic ---
@@ -35,57 +107,83 @@ with st.sidebar:
 st.title("Pitch Deck Analyzer")
 st.markdown("Generated structured insights, investment memos, and executive summaries in seconds.")
 
-if "analysis_result" not in st.session_state:
-    st.session_state.analysis_result = None
+STAGE_LABELS = {
+    "parse": "Reading Document...",
+    "extract": "Extracting Insights (Analyst Agent)...",
+    "memo": "Drafting Memo (Partner Agent)...",
+    "summary": "Finalizing Executive Summary..."
+}
 
-# File Uploader
-uploaded_file = st.file_uploader("Upload Pitch Deck", type=["pdf", "pptx", "ppt", "png", "jpg", "jpeg"])
 
-if uploaded_file and not os.environ.get("GROQ_API_KEY"):
-    st.error("GROQ_API_KEY not found. Please check your .env file.")
+def start_prefetch(result):
+    """
+    Optional: speculatively answer the Research Engine's Ready Queries.
+    """
+    if st.session_state.get("prefetch_ready_queries"):
+        # Imported on demand so the page doesn't load the LLM stack until it's needed
+        from src.llm import get_llm
+        from src.prefetch import ReadyQueryPrefetcher
 
-if uploaded_file and st.button("Analyze Deck") and os.environ.get("GROQ_API_KEY"):
-    # Hardcoded model
-    model_choice = "openai/gpt-oss-20b"
-    
-    with st.spinner("Reading Document..."):
-        try:
-            # 1. Parse Document
-            raw_text = DocumentParser.parse_file(uploaded_file)
-            description_preview = raw_text[:500] + "..." if len(raw_text) > 500 else raw_text
-            # st.expander("Show extracted text").text(description_preview) # Debug
+        prefetcher = ReadyQueryPrefetcher(get_llm(temperature=0.5))
+        prefetcher.start(result["data"], result["memo"], result["deck_index"], deal=result.get("content_hash"))
+        result["prefetch"] = prefetcher
+
+
+def traced_download(name, render):
+    """
+    Deferred download data that records a span in the session's current trace when clicked.
+    """
+    trace_id = st.session_state.get("trace_id")
+
+    def data():
+        with span(f"download.{name}", trace_id=trace_id):
+            return render()
+    return data
 
-            
-            # 2. Extract Data
-            with st.spinner("Extracting Insights (Analyst Agent)..."):
-                analyzer = PitchDeckAnalyzer(api_key=os.environ["GROQ_API_KEY"], model_name=model_choice)
-                deck_data: PitchDeckData = analyzer.analyze_pitch_deck(raw_text)
-            
-            # 3. Generate Memo & Summary
-            with st.spinner("Drafting Memo (Partner Agent)..."):
-                generator = MemoGenerator(api_key=os.environ["GROQ_API_KEY"], model_name=model_choice)
-                memo: InvestmentMemo = generator.generate_memo(deck_data)
-                
-            with st.spinner("Finalizing Executive Summary..."):
-                summary: ExecutiveSummary = generator.generate_executive_summary(deck_data, memo)
-                
-            # Store in session state
-            st.session_state.analysis_result = {
-                "data": deck_data,
-                "memo": memo,
-                "summary": summary
-            }
-            st.success("Analysis Complete!")
-            
-        except Exception as e:
-            st.error(f"An error occurred during analysis: {str(e)}")
 
 # --- Display Results ---
-if st.session_state.analysis_result:
-    res = st.session_state.analysis_result
+def render_version(version):
+    """
+    Banner linking the analysis to the earlier version of the deck it was updated from.
+    """
+    diff = version["diff"]
+
+    def slides(numbers):
+        return ("slide " if len(numbers) == 1 else "slides ") + ", ".join(map(str, numbers))
+
+    changes = []
+    if diff["modified"]:
+        changes.append(f"{slides([n for n, _ in diff['modified']])} changed")
+    if diff["added"]:
+        changes.append(f"{slides(diff['added'])} added")
+    if diff["removed"]:
+        changes.append(f"old {slides(diff['removed'])} removed")
+    st.info(
+        f"Updated version of **{version.get('previous_filename') or 'a previous deck'}** "
+        f"({version['similarity']:.0%} similar): " + ("; ".join(changes) or "no slide changes") + ".",
+        icon="🔁"
+    )
+    if version["mode"] == "incremental":
+        if version["fields"]:
+            st.caption(f"Re-extracted {', '.join(version['fields'])}; regenerated memo sections "
+                       f"{', '.join(version['sections'])}. Everything else reused from the previous version.")
+        else:
+            st.caption("Reused the previous version's analysis.")
+    else:
+        st.caption(f"Fully re-analyzed ({version['reason']}).")
+
+
+def render_analysis(res):
+    """
+    Renders the result tabs for one analysis.
+    """
     data = res["data"]
     memo = res["memo"]
     summary = res["summary"]
+
+    version = res.get("version")
+    if version:
+        render_version(version)
     
     # Layout Tabs
     tab1, tab2, tab3, tab4 = st.tabs(["⚡ Executive Summary", "📊 Extracted Data", "🚩 Red Flags", "📝 Investment Memo"])
@@ -110,6 +208,20 @@ if st.session_state.analysis_result:
         c1, c2 = st.columns(2)
         c1.metric("Startup", data.startup_name)
         c2.metric("Stage / Ask", data.funding_ask_stage)
+
+        st.divider()
+        st.subheader("Similar Past Deals")
+        similar = [s for s in shared_index().similar_to(data, memo, k=5, exclude=res.get("content_hash")) if s["score"] > 0]
+        if similar:
+            st.dataframe(
+                [{"Startup": s["startup_name"],
+                  "Analyzed": time.strftime("%Y-%m-%d", time.localtime(s["created_at"])),
+                  "Similarity": s["score"]} for s in similar],
+                column_config={"Similarity": st.column_config.ProgressColumn(min_value=0.0, max_value=1.0, format="%.2f")},
+                use_container_width=True, hide_index=True
+            )
+        else:
+            st.caption("No similar deals among past analyses yet.")
         
     with tab2:
         st.header("Structured Data Extraction")
@@ -134,11 +246,10 @@ if st.session_state.analysis_result:
         with st.expander("Team", expanded=False):
             st.markdown(f"{data.team}")
             
-        # Excel Download
-        excel_data = Exporter.to_excel(data)
+        # Excel Download: built when clicked, then served from the export cache
         st.download_button(
             label="Download Data (.xlsx)",
-            data=excel_data,
+            data=traced_download("excel", lambda: export_cache.excel(data)),
             file_name=f"{data.startup_name}_hatchup_data.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
@@ -181,21 +292,177 @@ if st.session_state.analysis_result:
         
         st.divider()
         
-        # Exports
+        # Exports (generated on click, memoized by content)
         col1, col2 = st.columns(2)
         
-        text_memo = Exporter.to_text_memo(memo, data.startup_name)
         col1.download_button(
             label="Download Memo (TXT)",
-            data=text_memo,
+            data=traced_download("text_memo", lambda: export_cache.text_memo(memo, data.startup_name)),
             file_name=f"{data.startup_name}_memo.txt",
             mime="text/plain"
         )
         
-        pdf_memo = Exporter.to_pdf_memo(memo, data.startup_name)
         col2.download_button(
             label="Download Memo (PDF)",
-            data=pdf_memo,
+            data=traced_download("pdf_memo", lambda: export_cache.pdf_memo(memo, data.startup_name)),
             file_name=f"{data.startup_name}_memo.pdf",
             mime="application/pdf"
         )
+
+
+# --- Main Flow ---
+mode = st.radio("Mode", ["Single Deck", "Batch Triage"], horizontal=True, label_visibility="collapsed")
+
+# Analyses run in background worker processes, so reruns and reconnects don't abort them
+runner = get_job_runner()
+runner.ensure_running()
+
+
+def batch_row(job, result):
+    """
+    One line of the batch results table.
+    """
+    finished = job["finished_at"] or time.time()
+    row = {
+        "Deck": job["filename"],
+        "Status": job["status"] if job["status"] != RUNNING else job["stage"] or RUNNING,
+        "Time (s)": round(finished - job["created_at"], 1),
+        "Startup": "", "Stage": "", "Outlook": "", "Confidence": None
+    }
+    if result:
+        row.update({
+            "Startup": result["data"].startup_name,
+            "Stage": result["data"].funding_ask_stage,
+            "Outlook": result["summary"].decision_outlook,
+            "Confidence": result["summary"].confidence_score,
+        })
+    if job["error"]:
+        row["Status"] = f"error: {job['error']}"
+    return row
+
+
+if mode == "Single Deck":
+    # File Uploader
+    uploaded_file = st.file_uploader("Upload Pitch Deck", type=["pdf", "pptx", "ppt", "png", "jpg", "jpeg"])
+
+    if uploaded_file and missing_api_key():
+        st.error("GROQ_API_KEY not found. Please check your .env file.")
+
+    # Already analyzed? Load the saved result instead of paying for the pipeline again
+    saved = None
+    if uploaded_file:
+        digest = content_hash(uploaded_file.getvalue())
+        current = st.session_state.analysis_result or {}
+        if current.get("content_hash") == digest:
+            saved = current
+        else:
+            saved = store.get(digest)
+            if saved:
+                set_analysis_result(saved)
+        if saved:
+            st.info("Loaded the saved analysis for this deck.")
+
+    analyze_label = "Re-analyze Deck" if saved else "Analyze Deck"
+    if uploaded_file and st.button(analyze_label) and not missing_api_key():
+        st.session_state.active_job = runner.submit(
+            "reanalyze" if saved else "analyze", uploaded_file.getvalue(), uploaded_file.name
+        )
+
+    @st.fragment(run_every=1.0)
+    def job_progress(job_id):
+        job = runner.queue.get(job_id)
+        if job is not None:
+            st.session_state.trace_id = job_id
+        if job is None or job["status"] == FAILED:
+            # Shown by the full rerun; this fragment must not run again for the same job
+            st.session_state.job_error = job["error"] if job else "job not found"
+            st.session_state.pop("active_job", None)
+            st.rerun()
+        elif job["status"] == DONE:
+            # Store in session state
+            result = store.get(job["result_hash"])
+            set_analysis_result(result)
+            start_prefetch(result)
+            st.session_state.pop("active_job", None)
+            st.rerun()
+        else:
+            st.info(STAGE_LABELS.get(job["stage"], "Queued for analysis..."), icon="⏳")
+
+    if st.session_state.get("job_error"):
+        st.error(f"An error occurred during analysis: {st.session_state.pop('job_error')}")
+
+    if st.session_state.get("active_job"):
+        job_progress(st.session_state.active_job)
+    elif st.session_state.analysis_result:
+        render_analysis(st.session_state.analysis_result)
+
+else:
+    uploaded_files = st.file_uploader(
+        "Upload Pitch Decks",
+        type=["pdf", "pptx", "ppt", "png", "jpg", "jpeg"],
+        accept_multiple_files=True
+    )
+    st.caption(f"Decks are analyzed by {runner.size} background workers.")
+
+    if uploaded_files and missing_api_key():
+        st.error("GROQ_API_KEY not found. Please check your .env file.")
+
+    if uploaded_files and st.button(f"Analyze {len(uploaded_files)} Decks") and not missing_api_key():
+        st.session_state.batch_jobs = [runner.submit("analyze", f.getvalue(), f.name) for f in uploaded_files]
+        st.session_state.batch_results = {}
+
+    @st.fragment(run_every=1.0)
+    def batch_progress(job_ids):
+        jobs = runner.queue.get_many(job_ids)
+        results = st.session_state.batch_results
+        for job in jobs:
+            if job["status"] == DONE and job["id"] not in results:
+                results[job["id"]] = store.get(job["result_hash"])
+
+        done = sum(job["status"] == DONE for job in jobs)
+        failed = sum(job["status"] == FAILED for job in jobs)
+        running = sum(job["status"] == RUNNING for job in jobs)
+        started = min(job["created_at"] for job in jobs)
+        finished = max((job["finished_at"] or 0) for job in jobs) if done + failed == len(jobs) else time.time()
+        throughput = done / (finished - started) * 60 if finished > started else 0.0
+
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Done", f"{done}/{len(jobs)}")
+        c2.metric("Running", running)
+        c3.metric("Failed", failed)
+        c4.metric("Throughput", f"{throughput:.1f} decks/min")
+        st.progress((done + failed) / max(len(jobs), 1))
+        # st.dataframe columns are sortable by clicking the header
+        st.dataframe([batch_row(job, results.get(job["id"])) for job in jobs],
+                     use_container_width=True, hide_index=True)
+
+        # Redraw the whole page when decks finish so the drill-down picks them up
+        if done + failed == len(jobs) and len(results) != st.session_state.batch_rendered:
+            st.rerun()
+
+    job_ids = st.session_state.get("batch_jobs")
+    if job_ids:
+        st.session_state.batch_rendered = len(st.session_state.batch_results)
+        batch_progress(job_ids)
+
+        completed = [(job_id, res) for job_id, res in st.session_state.batch_results.items() if res]
+        if completed:
+            st.divider()
+            st.download_button(
+                label="Download All Memos (PDF)",
+                data=lambda: render_batch([(res["memo"], res["data"].startup_name) for _, res in completed]),
+                file_name="investment_memos.pdf",
+                mime="application/pdf",
+            )
+            choice = st.selectbox(
+                "Open deck",
+                range(len(completed)),
+                format_func=lambda i: f"{completed[i][1]['data'].startup_name} ({completed[i][1].get('filename')})"
+            )
+            # Drill-down: make the chosen deck the active analysis for the other pages too
+            set_analysis_result(completed[choice][1])
+            st.session_state.trace_id = completed[choice][0]
+            render_analysis(completed[choice][1])
+
+# Last, so it shows the trace chosen by this run
+render_trace_panel()
@@ -0,0 +1,120 @@
+"""
+Deal history benchmark: exports synthetic analyses spread over 24 months as
+Parquet and as CSV, then times loading them into pandas and a few typical
+aggregations (by month, stage, outlook; red flag counts; top red flags).
+
+    python benchmarks/deal_history.py
+    python benchmarks/deal_history.py --deals 100000 --json
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from portfolio_export import synthetic_results
+from src.deal_history import _has_pyarrow, export_deal_history, load_deal_history
+
+STAGES = ["Pre-Seed", "Seed round", "Raising $5M Series A", "Series B", "Bridge", "Not stated"]
+MONTH_SECONDS = 30 * 24 * 3600
+
+
+def spread_over_months(count: int, months: int = 24) -> Iterator[Dict[str, Any]]:
+    start = time.time() - months * MONTH_SECONDS
+    for i, result in enumerate(synthetic_results(count)):
+        result["created_at"] = start + (i / count) * months * MONTH_SECONDS
+        result["data"].funding_ask_stage = STAGES[i % len(STAGES)]
+        yield result
+
+
+def aggregate(df) -> Dict[str, float]:
+    timings = {}
+
+    def timed(name, fn):
+        started = time.perf_counter()
+        fn()
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    timed("by_month_ms", lambda: df.groupby("month", observed=True)
+          .agg(deals=("content_hash", "size"), confidence=("confidence_score", "mean")))
+    timed("stage_x_outlook_ms", lambda: df.pivot_table(index="stage", columns="decision_outlook",
+                                                       values="confidence_score", aggfunc="mean"))
+    timed("red_flag_counts_ms", lambda: df.groupby("red_flags_count")["confidence_score"].describe())
+    timed("top_red_flags_ms", lambda: df["red_flags"].explode().value_counts().head(20))
+    return timings
+
+
+def bench(deals: int, fmt: str) -> Dict[str, Any]:
+    columns = ["content_hash", "created_at", "stage", "decision_outlook", "confidence_score",
+               "red_flags", "red_flags_count"]
+    with tempfile.TemporaryDirectory() as tmp:
+        # Generating synthetic results is slower than exporting them, so its time is subtracted
+        generation = 0.0
+
+        def generated():
+            nonlocal generation
+            source = spread_over_months(deals)
+            while True:
+                started = time.perf_counter()
+                result = next(source, None)
+                generation += time.perf_counter() - started
+                if result is None:
+                    return
+                yield result
+
+        started = time.perf_counter()
+        summary = export_deal_history(generated(), Path(tmp), fmt)
+        export_s = time.perf_counter() - started - generation
+        size = sum(Path(f).stat().st_size for f in summary["files"])
+
+        started = time.perf_counter()
+        df = load_deal_history(Path(tmp), columns=columns)
+        load_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        last_quarter = load_deal_history(Path(tmp), months=sorted(df["month"].unique())[-3:], columns=columns)
+        pruned_s = time.perf_counter() - started
+
+        timings = aggregate(df)
+
+    return {
+        "format": fmt,
+        "deals": deals,
+        "files": len(summary["files"]),
+        "disk_mb": round(size / 1024 / 1024, 1),
+        "export_s": round(export_s, 2),
+        "export_deals_per_s": round(deals / export_s),
+        "load_s": round(load_s, 2),
+        "load_3_months_s": round(pruned_s, 2),
+        "rows_3_months": len(last_quarter),
+        **timings,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the deal history export and pandas aggregations.")
+    parser.add_argument("--deals", type=int, default=100000)
+    parser.add_argument("--formats", nargs="+", default=["parquet", "csv"], choices=["parquet", "csv"])
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    formats = [f for f in args.formats if f != "parquet" or _has_pyarrow()]
+    results = [bench(args.deals, fmt) for fmt in formats]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    for r in results:
+        print(f"{r['format']}: {r['deals']} deals, {r['files']} files, {r['disk_mb']} MB")
+        print(f"  export {r['export_s']}s ({r['export_deals_per_s']} deals/s), load {r['load_s']}s, "
+              f"last 3 months {r['load_3_months_s']}s ({r['rows_3_months']} rows)")
+        print(f"  aggregations (ms): by month {r['by_month_ms']}, stage x outlook {r['stage_x_outlook_ms']}, "
+              f"red flag counts {r['red_flag_counts_ms']}, top red flags {r['top_red_flags_ms']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
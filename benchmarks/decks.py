@@ -0,0 +1,136 @@
+"""
+Synthetic pitch deck fixtures for the benchmarks: PDF, PPTX and image
+decks of configurable page count, text density and image-only pages.
+Content is seeded, so the same arguments always give the same bytes.
+
+    from decks import make_deck
+    deck = make_deck("pdf", pages=20, words=150, image_pages=2)   # BytesIO with .name
+"""
+import io
+import os
+import random
+import tempfile
+from typing import Optional
+
+SLIDE_TITLES = ["Problem", "Solution", "Product", "Market Size", "Business Model", "Traction",
+                "Team", "Competition", "Go-To-Market", "Financials", "The Ask"]
+
+WORDS = ("market platform revenue growth customers enterprise churn pricing team founders pilot "
+         "retention margin regulatory moat distribution network data model seed ARR MRR CAC LTV "
+         "payback cohort logistics compliance onboarding marketplace workflow automation").split()
+
+FORMATS = ("pdf", "pptx", "image")
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _body(rng: random.Random, words: int) -> str:
+    sentences = []
+    while words > 0:
+        n = min(words, rng.randint(8, 16))
+        sentences.append(_sentence(rng, n))
+        words -= n
+    return " ".join(sentences)
+
+
+def _image_pages(pages: int, image_pages: int):
+    """
+    Indexes of the image-only pages, spread evenly through the deck.
+    """
+    if image_pages <= 0:
+        return set()
+    step = pages / image_pages
+    return {min(pages - 1, int(i * step + step / 2)) for i in range(image_pages)}
+
+
+def _png(rng: random.Random, text: Optional[str] = None, size=(1280, 720)) -> bytes:
+    """
+    A slide-sized PNG: a few coloured blocks (chart / photo stand-in) and optionally text.
+    """
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    for _ in range(6):
+        x, y = rng.randint(0, size[0] - 200), rng.randint(0, size[1] - 150)
+        draw.rectangle([x, y, x + rng.randint(60, 200), y + rng.randint(40, 150)],
+                       fill=tuple(rng.randint(0, 255) for _ in range(3)))
+    if text:
+        y = 40
+        line = ""
+        for word in text.split():
+            if len(line) + len(word) > 90:
+                draw.text((40, y), line, fill="black")
+                y, line = y + 18, ""
+            line += word + " "
+        draw.text((40, y), line, fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def make_pdf(pages: int = 12, words: int = 120, image_pages: int = 0, seed: int = 7) -> bytes:
+    from fpdf import FPDF
+
+    rng = random.Random(seed)
+    images = _image_pages(pages, image_pages)
+    pdf = FPDF(orientation="L")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(pages):
+            pdf.add_page()
+            if i in images:
+                # fpdf 1.x only places images from files
+                path = os.path.join(tmp, f"slide_{i}.png")
+                with open(path, "wb") as f:
+                    f.write(_png(rng))
+                pdf.image(path, x=0, y=0, w=297, h=167)
+                continue
+            pdf.set_font("Arial", "B", 24)
+            pdf.cell(0, 14, SLIDE_TITLES[i % len(SLIDE_TITLES)], ln=True)
+            pdf.set_font("Arial", "", 12)
+            pdf.multi_cell(0, 6, _body(rng, words))
+        return pdf.output(dest="S").encode("latin-1")
+
+
+def make_pptx(pages: int = 12, words: int = 120, image_pages: int = 0, seed: int = 7) -> bytes:
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    rng = random.Random(seed)
+    images = _image_pages(pages, image_pages)
+    prs = Presentation()
+    prs.slide_width, prs.slide_height = Inches(13.333), Inches(7.5)
+    for i in range(pages):
+        if i in images:
+            slide = prs.slides.add_slide(prs.slide_layouts[6])  # blank
+            slide.shapes.add_picture(io.BytesIO(_png(rng)), 0, 0, width=prs.slide_width)
+            continue
+        slide = prs.slides.add_slide(prs.slide_layouts[1])  # title and content
+        slide.shapes.title.text = SLIDE_TITLES[i % len(SLIDE_TITLES)]
+        slide.placeholders[1].text = _body(rng, words)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+def make_image(pages: int = 1, words: int = 120, image_pages: int = 0, seed: int = 7) -> bytes:
+    """
+    A single slide screenshot (the parser reads one image per file); pages is ignored.
+    """
+    rng = random.Random(seed)
+    return _png(rng, None if image_pages else _body(rng, words))
+
+
+MAKERS = {"pdf": (make_pdf, "pdf"), "pptx": (make_pptx, "pptx"), "image": (make_image, "png")}
+
+
+def make_deck(fmt: str, pages: int = 12, words: int = 120, image_pages: int = 0, seed: int = 7) -> io.BytesIO:
+    """
+    A deck as an in-memory file with a .name, the way Streamlit uploads look to the parser.
+    """
+    maker, extension = MAKERS[fmt]
+    deck = io.BytesIO(maker(pages, words, image_pages, seed))
+    deck.name = f"synthetic_{fmt}_{pages}p_{words}w_{image_pages}img.{extension}"
+    return deck
@@ -0,0 +1,132 @@
+"""
+Import-time benchmark: measures the cold import cost of each page's top-level
+imports and of the heavy modules behind them, each in a fresh interpreter
+(python -X importtime).
+
+    python benchmarks/import_time.py                      # table
+    python benchmarks/import_time.py --save baseline.json
+    python benchmarks/import_time.py --compare baseline.json   # exit 1 on regression
+"""
+import argparse
+import ast
+import json
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+PAGES = ["app.py", "pages/1_Create_Memo.py", "pages/2_Research_Engine.py", "pages/HatchUp_chat.py"]
+
+MODULES = [
+    "src.exporter", "src.document_parser", "src.store", "src.jobs", "src.pipeline",
+    "src.llm", "src.research", "src.memory", "src.context_builder", "src.mcp_tools",
+    "streamlit", "langchain_core", "langchain_groq", "pandas", "openpyxl", "fpdf",
+    "PyPDF2", "pptx", "PIL.Image", "pytesseract", "numpy", "tiktoken", "mcp_use",
+]
+
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def page_imports(page: str) -> str:
+    """
+    The page's top-level import statements, i.e. what it costs before any code runs.
+    """
+    tree = ast.parse((ROOT_DIR / page).read_text(encoding="utf-8"))
+    statements = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(node) for node in statements)
+
+
+def measure(code: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Runs code in a fresh interpreter. Returns total import ms and self ms per top-level package.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    total_us = 0
+    by_package: Dict[str, float] = defaultdict(float)
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match[1]), int(match[2]), match[3], match[4]
+        by_package[name.split(".")[0]] += self_us / 1000
+        # Outermost imports carry the cumulative cost of everything beneath them
+        if len(indent) <= 1:
+            total_us += cumulative_us
+    return total_us / 1000, dict(by_package)
+
+
+def run(targets: List[Tuple[str, str]], repeats: int) -> Dict[str, Dict]:
+    results = {}
+    for label, code in targets:
+        try:
+            runs = [measure(code) for _ in range(repeats)]
+        except RuntimeError as e:
+            results[label] = {"error": str(e)}
+            continue
+        # Best of N: the least noisy estimate of the real cost
+        total, packages = min(runs, key=lambda r: r[0])
+        top = sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:5]
+        results[label] = {"ms": round(total, 1), "top": [[name, round(ms, 1)] for name, ms in top]}
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure cold import cost of pages and heavy modules.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--only", choices=["pages", "modules"], help="Measure just one group")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--save", help="Write results to this file (baseline)")
+    parser.add_argument("--compare", help="Baseline file; exit 1 if any target got slower than allowed")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=50.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    targets = []
+    if args.only != "modules":
+        targets += [(f"page:{page}", page_imports(page)) for page in PAGES]
+    if args.only != "pages":
+        targets += [(module, f"import {module}") for module in MODULES]
+
+    results = run(targets, args.repeats)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'target':34} {'ms':>9}  heaviest packages (self ms)")
+        for label, result in results.items():
+            if "error" in result:
+                print(f"{label:34} {'error':>9}  {result['error']}")
+                continue
+            top = ", ".join(f"{name} {ms:.0f}" for name, ms in result["top"])
+            print(f"{label:34} {result['ms']:9.1f}  {top}")
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = []
+        for label, result in results.items():
+            before = baseline.get(label, {}).get("ms")
+            if before is None or "ms" not in result:
+                continue
+            delta = result["ms"] - before
+            if delta > args.min_delta_ms and delta > before * args.tolerance:
+                regressions.append(f"{label}: {before:.0f} ms -> {result['ms']:.0f} ms")
+        if regressions:
+            print("\nImport time regressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,372 @@
+"""
+Concurrent-user load test for the Streamlit pages, headless via AppTest,
+against the fake LLM and stand-in MCP servers (no network, no keys).
+
+Each simulated user is a thread with its own AppTest sessions, picking
+actions from a weighted mix until the step's duration is up:
+
+    upload    open the analyzer page, submit a fresh synthetic deck to the
+              job queue (what the upload button does) and rerun the page,
+              like the progress fragment, until the analysis is loaded
+    research  ask a question on the Research Engine page
+    chat      ask a question on the HatchUp Chat page (live MCP searches)
+
+A sampler records RSS (this process and its children), child process
+counts (MCP servers, job workers) and threads once a second.
+
+    python benchmarks/load_test.py --users 5 10 20 --duration 60
+    python benchmarks/load_test.py --mix upload=1,research=3,chat=2 --llm-latency 0.8 --out load.json
+
+Linux only (reads /proc).
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from decks import make_deck
+
+PAGES = {
+    "upload": "app.py",
+    "research": "pages/2_Research_Engine.py",
+    "chat": "pages/HatchUp_chat.py",
+}
+QUESTIONS = [
+    "Who are the main competitors?",
+    "Is the market size claim credible?",
+    "What should we ask the founders about retention?",
+    "Competitors to Airbnb",
+    "Fintech infrastructure trends",
+    "How big is the EV battery market?",
+]
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+# --- Process sampling (/proc) ---
+
+def _children(root: int) -> List[int]:
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # ppid is the 2nd field after the parenthesised command name
+                parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    found, frontier = [], [root]
+    while frontier:
+        pid = frontier.pop()
+        kids = [child for child, parent in parents.items() if parent == pid]
+        found += kids
+        frontier += kids
+    return found
+
+
+def _rss_mb(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / 1024 / 1024
+    except (OSError, IndexError, ValueError):
+        return 0.0
+
+
+def _cmdline(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode(errors="replace")
+    except OSError:
+        return ""
+
+
+def sample(started: float, active_users: int) -> Dict[str, Any]:
+    children = _children(os.getpid())
+    commands = {pid: _cmdline(pid) for pid in children}
+    return {
+        "t": round(time.monotonic() - started, 1),
+        "users": active_users,
+        "rss_mb": round(_rss_mb(os.getpid()), 1),
+        "children_rss_mb": round(sum(_rss_mb(pid) for pid in children), 1),
+        "children": len(children),
+        "mcp_servers": sum("mcp_" in cmd for cmd in commands.values()),
+        "job_workers": sum("src.jobs" in cmd for cmd in commands.values()),
+        "threads": threading.active_count(),
+    }
+
+
+# --- Simulated users ---
+
+class User:
+    """
+    One analyst: keeps an AppTest session per page, like one browser tab each.
+    """
+
+    def __init__(self, index: int, seed_result: Dict[str, Any], timeout: float):
+        self.index = index
+        self.rng = random.Random(index)
+        self.seed_result = seed_result
+        self.timeout = timeout
+        self.sessions: Dict[str, Any] = {}
+        self.loaded = set()
+        self.uploads = 0
+
+    def page(self, action: str):
+        from streamlit.testing.v1 import AppTest
+
+        at = self.sessions.get(action)
+        if at is None:
+            at = AppTest.from_file(str(ROOT_DIR / PAGES[action]), default_timeout=self.timeout)
+            if action == "research":
+                at.session_state["analysis_result"] = self.seed_result
+            self.sessions[action] = at
+        return at
+
+    @staticmethod
+    def _check(at) -> None:
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+
+    def upload(self) -> None:
+        from src.jobs import DONE, JobQueue
+
+        at = self.page("upload")
+        at.run()
+        self._check(at)
+        self.uploads += 1
+        deck = make_deck(self.rng.choice(["pdf", "pptx"]), pages=self.rng.randint(8, 20),
+                         seed=self.index * 100000 + self.uploads)
+        queue = JobQueue()
+        job_id = queue.submit("analyze", deck.getvalue(), deck.name)
+        at.session_state["active_job"] = job_id
+        deadline = time.monotonic() + self.timeout
+        while "active_job" in at.session_state:
+            if time.monotonic() > deadline:
+                raise TimeoutError("analysis did not finish")
+            time.sleep(1.0)  # the progress fragment's run_every
+            at.run()
+            self._check(at)
+        job = queue.get(job_id)
+        if job is None or job["status"] != DONE:
+            raise RuntimeError(f"job failed: {job['error'] if job else 'lost'}")
+
+    def _ask(self, action: str, messages_key: str) -> None:
+        at = self.page(action)
+        if action not in self.loaded:
+            at.run()
+            self._check(at)
+            self.loaded.add(action)
+        at.chat_input[0].set_value(self.rng.choice(QUESTIONS)).run()
+        self._check(at)
+        messages = at.session_state[messages_key]
+        last = messages[-1] if messages else {}
+        if last.get("role") != "assistant":
+            raise RuntimeError("no answer")
+        if str(last.get("content", "")).startswith("⚠️"):
+            raise RuntimeError(str(last["content"])[:200])
+
+    def research(self) -> None:
+        self._ask("research", "messages")
+
+    def chat(self) -> None:
+        self._ask("chat", "chat_messages")
+
+
+def run_step(users: int, duration: float, mix: Dict[str, float], think: float, timeout: float,
+             seed_result: Dict[str, Any], samples: List[Dict[str, Any]], started: float) -> Dict[str, Any]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, List[str]] = defaultdict(list)
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    actions, weights = list(mix), list(mix.values())
+    active = [0]
+    # user index -> (action, started) while an action is in flight
+    in_flight: Dict[int, Any] = {}
+
+    def user_loop(index: int):
+        user = User(index, seed_result, timeout)
+        with lock:
+            active[0] += 1
+        try:
+            while time.monotonic() < deadline:
+                action = user.rng.choices(actions, weights)[0]
+                began = time.perf_counter()
+                in_flight[index] = (action, began)
+                try:
+                    getattr(user, action)()
+                    with lock:
+                        latencies[action].append(time.perf_counter() - began)
+                except Exception as e:
+                    with lock:
+                        errors[action].append(f"{type(e).__name__}: {e}"[:200])
+                finally:
+                    del in_flight[index]
+                time.sleep(user.rng.uniform(0, 2 * think))
+        finally:
+            with lock:
+                active[0] -= 1
+
+    stop = threading.Event()
+
+    def sampler():
+        while not stop.wait(1.0):
+            samples.append(sample(started, active[0]))
+
+    sampler_thread = threading.Thread(target=sampler, daemon=True)
+    sampler_thread.start()
+    step_started = time.perf_counter()
+    step_t = time.monotonic() - started
+    threads = [threading.Thread(target=user_loop, args=(i,), daemon=True) for i in range(users)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)  # stagger logins a little
+    # AppTest's own timeout doesn't fire while a script is blocked, so users still
+    # inside an action after the step plus one timeout are reported as hung and abandoned
+    give_up = deadline + timeout
+    for thread in threads:
+        thread.join(max(0.0, give_up - time.monotonic()))
+    elapsed = time.perf_counter() - step_started
+    hung = defaultdict(list)
+    for action, began in list(in_flight.values()):
+        hung[action].append(round(time.perf_counter() - began, 1))
+    stop.set()
+    sampler_thread.join()
+
+    def stats(values: List[float]) -> Dict[str, Any]:
+        if not values:
+            return {}
+        ordered = sorted(values)
+        pick = lambda p: round(ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))], 3)
+        return {"p50_s": pick(0.50), "p95_s": pick(0.95), "p99_s": pick(0.99),
+                "mean_s": round(statistics.mean(values), 3), "max_s": round(ordered[-1], 3)}
+
+    completed = sum(len(v) for v in latencies.values())
+    step_samples = [s for s in samples if s["t"] >= step_t]
+    return {
+        "users": users,
+        "seconds": round(elapsed, 1),
+        "completed": completed,
+        "errors": sum(len(v) for v in errors.values()),
+        "hung_users": sum(len(v) for v in hung.values()),
+        "throughput_per_min": round(completed / elapsed * 60, 1),
+        "actions": {
+            action: {"completed": len(latencies[action]), "errors": len(errors[action]),
+                     "hung": len(hung[action]), "latency": stats(latencies[action]),
+                     "sample_errors": sorted(set(errors[action]))[:3]}
+            for action in actions
+        },
+        "peak": {key: max((s[key] for s in step_samples), default=0)
+                 for key in ("rss_mb", "children_rss_mb", "children", "mcp_servers", "job_workers", "threads")},
+    }
+
+
+def seed_analysis() -> Dict[str, Any]:
+    """
+    One stored analysis for the Research Engine users to ask about.
+    """
+    from src.pipeline import AnalysisPipeline
+    from src.store import AnalysisStore
+
+    return AnalysisPipeline(api_key="fake", store=AnalysisStore()).run(make_deck("pdf", pages=12, seed=1))
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in PAGES:
+            raise argparse.ArgumentTypeError(f"unknown action {name!r} (use {', '.join(PAGES)})")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Simulate concurrent analysts against the Streamlit pages.")
+    parser.add_argument("--users", type=int, nargs="+", default=[5, 10], help="Concurrent users per step")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per step")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("upload=1,research=2,chat=2"))
+    parser.add_argument("--think", type=float, default=1.0, help="Mean pause between a user's actions (s)")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-action timeout (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Fake LLM delay per call (s)")
+    parser.add_argument("--llm-tps", type=float, default=0.0, help="Fake LLM tokens per second (0 = instant)")
+    parser.add_argument("--mcp-latency", type=float, default=0.3, help="Stand-in MCP delay per tool call (s)")
+    parser.add_argument("--workers", type=int, default=4, help="Analysis job worker processes")
+    parser.add_argument("--out", help="Write the JSON report (steps and timeline) to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="hatchup-load-")
+    os.environ.update({
+        "HATCHUP_LLM_BACKEND": "fake",
+        "HATCHUP_MCP_BACKEND": "fake",
+        "HATCHUP_FAKE_LATENCY": str(args.llm_latency),
+        "HATCHUP_FAKE_TPS": str(args.llm_tps),
+        "MCP_FAKE_LATENCY": str(args.mcp_latency),
+        "MCP_USE_ANONYMIZED_TELEMETRY": "false",
+        "GROQ_API_KEY": os.getenv("GROQ_API_KEY") or "fake",
+        "HATCHUP_WORKERS": str(args.workers),
+        "HATCHUP_STORE_PATH": os.path.join(workdir, "hatchup.db"),
+        "HATCHUP_JOBS_PATH": os.path.join(workdir, "jobs.db"),
+        "HATCHUP_USAGE_PATH": os.path.join(workdir, "usage.db"),
+        "HATCHUP_TRACE_PATH": os.path.join(workdir, "spans.jsonl"),
+    })
+    os.chdir(ROOT_DIR)
+
+    print(f"Seeding one analysis in {workdir}...", file=sys.stderr)
+    seed_result = seed_analysis()
+
+    started = time.monotonic()
+    samples: List[Dict[str, Any]] = [sample(started, 0)]
+    steps = []
+    for users in args.users:
+        print(f"Step: {users} users for {args.duration:.0f}s...", file=sys.stderr)
+        steps.append(run_step(users, args.duration, args.mix, args.think, args.timeout,
+                              seed_result, samples, started))
+
+    report = {"config": {k: v for k, v in vars(args).items() if k != "out"}, "steps": steps, "timeline": samples}
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
+
+    print(f"\n{'users':>5} {'action':9} {'done':>5} {'err':>4} {'hung':>4} {'p50 s':>7} {'p95 s':>7} {'max s':>7}")
+    for step in steps:
+        for action, a in step["actions"].items():
+            lat = a["latency"]
+            print(f"{step['users']:>5} {action:9} {a['completed']:>5} {a['errors']:>4} {a['hung']:>4} "
+                  f"{lat.get('p50_s', '-'):>7} {lat.get('p95_s', '-'):>7} {lat.get('max_s', '-'):>7}")
+            for error in a["sample_errors"]:
+                print(f"{'':16}! {error}")
+        peak = step["peak"]
+        print(f"{'':5} {step['throughput_per_min']} actions/min; peak RSS {peak['rss_mb']} MB "
+              f"(+{peak['children_rss_mb']} MB in {peak['children']} children: "
+              f"{peak['mcp_servers']} MCP servers, {peak['job_workers']} job workers), {peak['threads']} threads\n")
+    return 0
+
+
+def shutdown(code: int) -> None:
+    """
+    Stops job workers and MCP servers, then exits without waiting for hung
+    script threads (which would otherwise keep the interpreter alive).
+    """
+    for pid in _children(os.getpid()):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
+
+
+if __name__ == "__main__":
+    shutdown(main())
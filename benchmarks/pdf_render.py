@@ -0,0 +1,84 @@
+"""
+Memo PDF benchmark: per-memo render time and output size for the Unicode
+font path and the latin-1 fallback, plus batch throughput (combined PDF and
+zip) with one process and with a process pool.
+
+    python benchmarks/pdf_render.py
+    python benchmarks/pdf_render.py --memos 200 --workers 4 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from portfolio_export import synthetic_results
+from src.pdf_renderer import MemoRenderer, find_unicode_font, render_batch
+
+
+def per_memo(items, unicode: bool) -> Dict[str, Any]:
+    renderer = MemoRenderer(unicode=unicode)
+    renderer.render(*items[0])  # warm-up: imports and font metrics cache
+    times: List[float] = []
+    sizes: List[int] = []
+    for memo, name in items:
+        started = time.perf_counter()
+        pdf = renderer.render(memo, name)
+        times.append((time.perf_counter() - started) * 1000)
+        sizes.append(len(pdf))
+    times.sort()
+    return {
+        "font": os.path.basename(renderer.font[0]) if renderer.font else "core Arial (latin-1)",
+        "p50_ms": round(statistics.median(times), 2),
+        "p95_ms": round(times[int(0.95 * (len(times) - 1))], 2),
+        "mean_kb": round(statistics.mean(sizes) / 1024, 1),
+    }
+
+
+def batch(items, output: str, workers: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    payload = render_batch(items, output=output, workers=workers)
+    elapsed = time.perf_counter() - started
+    return {
+        "output": output,
+        "workers": workers,
+        "seconds": round(elapsed, 2),
+        "memos_per_s": round(len(items) / elapsed, 1),
+        "size_kb": round(len(payload) / 1024, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark memo PDF rendering.")
+    parser.add_argument("--memos", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    items = [(r["memo"], r["data"].startup_name) for r in synthetic_results(args.memos)]
+    results = {
+        "per_memo": [per_memo(items, unicode=False)] + ([per_memo(items, unicode=True)] if find_unicode_font() else []),
+        "batch": [batch(items, output, workers)
+                  for output in ("pdf", "zip") for workers in sorted({1, args.workers})],
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'font':32} {'p50 ms':>8} {'p95 ms':>8} {'mean KB':>8}")
+    for r in results["per_memo"]:
+        print(f"{r['font']:32} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['mean_kb']:>8}")
+    print()
+    print(f"{'batch':8} {'workers':>8} {'seconds':>8} {'memos/s':>8} {'size KB':>9}")
+    for r in results["batch"]:
+        print(f"{r['output']:8} {r['workers']:>8} {r['seconds']:>8} {r['memos_per_s']:>8} {r['size_kb']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Portfolio workbook benchmark: streams synthetic analyses through
+Exporter.to_portfolio_excel and reports rows per second and peak Python
+memory for growing deal counts. Peak memory should stay roughly flat.
+
+    python benchmarks/portfolio_export.py
+    python benchmarks/portfolio_export.py --deals 100 1000 5000 --json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.exporter import Exporter, MEMO_SECTIONS
+from src.models import PitchDeckData, InvestmentMemo, ExecutiveSummary
+
+WORDS = ("market platform revenue growth customers enterprise churn pricing team founders "
+         "pilot retention margin regulatory moat distribution network data model seed").split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def synthetic_results(count: int, seed: int = 7) -> Iterator[Dict[str, Any]]:
+    """
+    Yields analysis results shaped like AnalysisStore.iter_results(), one at a time.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        data = PitchDeckData(
+            startup_name=f"Startup {i:05d}",
+            problem=_text(rng, 40), solution=_text(rng, 40), product=_text(rng, 30),
+            market_tam=_text(rng, 30), business_model=_text(rng, 25), traction_metrics=_text(rng, 25),
+            team=_text(rng, 30), competitive_landscape=_text(rng, 30), funding_ask_stage="Seed",
+            missing_sections=[_text(rng, 3) for _ in range(rng.randint(0, 3))],
+            weak_signals=[_text(rng, 12) for _ in range(rng.randint(1, 5))],
+            red_flags=[_text(rng, 12) for _ in range(rng.randint(1, 5))],
+        )
+        memo = InvestmentMemo(**{
+            field: [_text(rng, 15) for _ in range(5)] if field in ("risks_concerns", "open_questions")
+            else _text(rng, 120)
+            for _, field in MEMO_SECTIONS
+        })
+        summary = ExecutiveSummary(
+            summary_bullet_points=[_text(rng, 15) for _ in range(6)],
+            decision_outlook=rng.choice(["Positive", "Neutral", "Negative"]),
+            confidence_score=rng.randint(0, 100),
+            market_alignment_reasoning=_text(rng, 40),
+        )
+        yield {"data": data, "memo": memo, "summary": summary, "filename": f"deck_{i}.pdf",
+               "content_hash": f"{i:064x}", "created_at": time.time()}
+
+
+def bench(deals: int) -> Dict[str, Any]:
+    # Rows across all sheets: one deal row, its list items and the memo sections
+    rows = 0
+
+    def counted(results):
+        nonlocal rows
+        for result in results:
+            data = result["data"]
+            rows += 1 + len(data.red_flags) + len(data.weak_signals) + len(data.missing_sections) + len(MEMO_SECTIONS)
+            yield result
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "portfolio.xlsx")
+        # Timed pass; results are generated up front so only the export is measured
+        results = list(synthetic_results(deals))
+        started = time.perf_counter()
+        Exporter.to_portfolio_excel(counted(iter(results)), path)
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(path)
+        del results
+
+        # Memory pass (tracemalloc slows allocation, so it's kept out of the timing);
+        # results are generated lazily so the peak reflects the exporter alone
+        tracemalloc.start()
+        Exporter.to_portfolio_excel(synthetic_results(deals), path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "deals": deals,
+        "rows": rows,
+        "seconds": round(elapsed, 2),
+        "deals_per_s": round(deals / elapsed, 1),
+        "rows_per_s": round(rows / elapsed, 1),
+        "peak_mb": round(peak / 1024 / 1024, 1),
+        "file_mb": round(size / 1024 / 1024, 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the streaming portfolio workbook export.")
+    parser.add_argument("--deals", type=int, nargs="+", default=[100, 1000, 3000])
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    # Warm-up so import costs don't land in the first measurement
+    bench(5)
+    results = [bench(n) for n in args.deals]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'deals':>7} {'rows':>8} {'seconds':>8} {'deals/s':>9} {'rows/s':>9} {'peak MB':>8} {'file MB':>8}")
+    for r in results:
+        print(f"{r['deals']:>7} {r['rows']:>8} {r['seconds']:>8} {r['deals_per_s']:>9} {r['rows_per_s']:>9} "
+              f"{r['peak_mb']:>8} {r['file_mb']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Similar-deal search at portfolio scale: synthetic deals from a number of
+sectors (each with its own vocabulary on top of generic pitch deck words)
+are vectorized into a temporary store, then the benchmark times the
+initial index load, top-k queries, and an incremental add + refresh, and
+checks that neighbours come from the query's sector.
+
+    python benchmarks/similarity.py --deals 50000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from decks import WORDS
+
+
+def sector_vocabularies(sectors: int, rng: random.Random):
+    syllables = "ka lo mi ne ru sa ti vo ze pa qu fi ba do ge".split()
+    return [["".join(rng.choice(syllables) for _ in range(3)) for _ in range(40)] for _ in range(sectors)]
+
+
+def deal_text(rng: random.Random, vocabulary, words: int = 300, sector_share: float = 0.25) -> str:
+    return " ".join(rng.choice(vocabulary) if rng.random() < sector_share else rng.choice(WORDS)
+                    for _ in range(words))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the similar-deal index.")
+    parser.add_argument("--deals", type=int, default=50000)
+    parser.add_argument("--sectors", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    import numpy as np
+    from src.similarity import SimilarityIndex, hashed_vector
+    from src.store import AnalysisStore
+
+    rng = random.Random(11)
+    vocabularies = sector_vocabularies(args.sectors, rng)
+    results = {"deals": args.deals, "sectors": args.sectors}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AnalysisStore(os.path.join(tmp, "bench.db"))
+        started = time.perf_counter()
+        sectors = []
+        rows = []
+        for i in range(args.deals):
+            sector = rng.randrange(args.sectors)
+            sectors.append(sector)
+            rows.append((f"{i:064x}", f"Deal {i}", time.time(), hashed_vector(deal_text(rng, vocabularies[sector])).tobytes()))
+        results["vectorize_ms_per_deal"] = round((time.perf_counter() - started) * 1000 / args.deals, 3)
+        # Straight into the table: the benchmark is about the index, not about saving analyses
+        conn = store._conn()
+        with conn:
+            conn.executemany("INSERT INTO deal_vectors (content_hash, startup_name, created_at, vector) "
+                             "VALUES (?, ?, ?, ?)", rows)
+
+        index = SimilarityIndex(store)
+        started = time.perf_counter()
+        index.refresh()
+        results["load_s"] = round(time.perf_counter() - started, 3)
+        results["index_mb"] = round(index.vectors[:len(index)].nbytes / 1024 / 1024, 1)
+
+        times, precision = [], []
+        for _ in range(args.queries):
+            sector = rng.randrange(args.sectors)
+            query = hashed_vector(deal_text(rng, vocabularies[sector]))
+            started = time.perf_counter()
+            hits = index.search(query, args.k)
+            times.append((time.perf_counter() - started) * 1000)
+            precision.append(sum(sectors[int(h["content_hash"], 16)] == sector for h in hits) / args.k)
+        times.sort()
+        results["search_p50_ms"] = round(times[len(times) // 2], 2)
+        results["search_p95_ms"] = round(times[int(len(times) * 0.95)], 2)
+        results["precision_at_k"] = round(statistics.mean(precision), 3)
+
+        # One more analysis finishing: insert its vector, refresh, search again (recomputes the mean)
+        sector = rng.randrange(args.sectors)
+        vector = hashed_vector(deal_text(rng, vocabularies[sector]))
+        with conn:
+            conn.execute("INSERT INTO deal_vectors (content_hash, startup_name, created_at, vector) VALUES (?, ?, ?, ?)",
+                         ("f" * 64, "New Deal", time.time(), vector.tobytes()))
+        started = time.perf_counter()
+        index.refresh()
+        hits = index.search(vector, args.k)
+        results["incremental_add_and_search_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        assert hits[0]["content_hash"] == "f" * 64
+        results["numpy"] = np.__version__
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+End-to-end stage benchmark on synthetic decks (see decks.py), against the
+offline fake LLM (src.llm.FakeChatModel) so it runs anywhere.
+
+Times every stage per deck: DocumentParser.parse_file, text normalization,
+analyze_pitch_deck, generate_memo, generate_executive_summary and each
+Exporter method. Reports percentiles, the cold first call and the peak
+Python allocation of each stage as JSON, so runs can be diffed between
+commits.
+
+    python benchmarks/stages.py --out bench.json
+    python benchmarks/stages.py --formats pdf --pages 10 50 --words 300 --image-pages 3
+    python benchmarks/stages.py --compare baseline.json   # exit 1 on regression
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from decks import FORMATS, make_deck
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def measure(fn: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    """
+    Cold first call, then repeats timed calls, then one call under tracemalloc
+    (kept out of the timings because it slows allocation down).
+    """
+    started = time.perf_counter()
+    fn()
+    cold = (time.perf_counter() - started) * 1000
+
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "cold_ms": round(cold, 3),
+        "p50_ms": round(percentile(times, 50), 3),
+        "p95_ms": round(percentile(times, 95), 3),
+        "p99_ms": round(percentile(times, 99), 3),
+        "mean_ms": round(statistics.mean(times), 3),
+        "min_ms": round(min(times), 3),
+        "max_ms": round(max(times), 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def bench_deck(deck, repeats: int) -> Dict[str, Any]:
+    from src.analyzer import PitchDeckAnalyzer
+    from src.document_parser import DocumentParser
+    from src.exporter import Exporter
+    from src.memo_generator import MemoGenerator
+
+    analyzer = PitchDeckAnalyzer(api_key="benchmark")
+    generator = MemoGenerator(api_key="benchmark")
+    raw_parsers = {"pdf": DocumentParser._parse_pdf, "pptx": DocumentParser._parse_pptx,
+                   "png": DocumentParser._parse_image}
+
+    def parse():
+        deck.seek(0)
+        return DocumentParser.parse_file(deck)
+
+    deck.seek(0)
+    raw_pages = raw_parsers[deck.name.rsplit(".", 1)[-1]](deck)
+    text = parse()
+    data = analyzer.analyze_pitch_deck(text)
+    memo = generator.generate_memo(data)
+    summary = generator.generate_executive_summary(data, memo)
+    result = {"data": data, "memo": memo, "summary": summary, "content_hash": "0" * 64,
+              "filename": deck.name, "created_at": time.time()}
+    memo_text = Exporter.to_text_memo(memo, data.startup_name)
+
+    stages = {
+        "parse_file": parse,
+        "normalize_text": lambda: [DocumentParser.normalize_text(page) for page in raw_pages],
+        "analyze_pitch_deck": lambda: analyzer.analyze_pitch_deck(text),
+        "generate_memo": lambda: generator.generate_memo(data),
+        "generate_executive_summary": lambda: generator.generate_executive_summary(data, memo),
+        "Exporter.to_excel": lambda: Exporter.to_excel(data),
+        "Exporter.to_pdf_memo": lambda: Exporter.to_pdf_memo(memo, data.startup_name),
+        "Exporter.to_text_memo": lambda: Exporter.to_text_memo(memo, data.startup_name),
+        "Exporter.to_portfolio_excel": lambda: Exporter.to_portfolio_excel([result]),
+        "Exporter._sanitize_text": lambda: Exporter._sanitize_text(memo_text),
+    }
+    return {
+        "file_kb": round(len(deck.getvalue()) / 1024, 1),
+        "pages": len(raw_pages),
+        "text_chars": len(text),
+        "stages": {name: measure(fn, repeats) for name, fn in stages.items()},
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta_ms: float) -> List[str]:
+    regressions = []
+    for label, deck in results["decks"].items():
+        before_stages = baseline.get("decks", {}).get(label, {}).get("stages", {})
+        for stage, stats in deck["stages"].items():
+            before = before_stages.get(stage, {}).get("p50_ms")
+            if before is None:
+                continue
+            delta = stats["p50_ms"] - before
+            if delta > min_delta_ms and delta > before * tolerance:
+                regressions.append(f"{label} {stage}: p50 {before:.1f} ms -> {stats['p50_ms']:.1f} ms")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time every pipeline stage on synthetic decks.")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--pages", type=int, nargs="+", default=[12, 40], help="Page counts (PDF / PPTX)")
+    parser.add_argument("--words", type=int, default=120, help="Words per text page")
+    parser.add_argument("--image-pages", type=int, default=2, help="Image-only pages per PDF / PPTX deck")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Fake LLM delay per call (s)")
+    parser.add_argument("--llm-tps", type=float, default=0.0, help="Fake LLM tokens per second (0 = instant)")
+    parser.add_argument("--out", help="Write the JSON results to this file")
+    parser.add_argument("--compare", help="Baseline JSON; exit 1 if any stage's p50 regressed")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    # Must be set before src.llm builds its (cached) model
+    os.environ["HATCHUP_LLM_BACKEND"] = "fake"
+    os.environ["HATCHUP_FAKE_LATENCY"] = str(args.llm_latency)
+    os.environ["HATCHUP_FAKE_TPS"] = str(args.llm_tps)
+    # Keep the fake calls' usage rows and spans out of the real ledger and trace file
+    workdir = tempfile.mkdtemp(prefix="hatchup-stages-")
+    os.environ["HATCHUP_USAGE_PATH"] = os.path.join(workdir, "usage.db")
+    os.environ["HATCHUP_TRACE_PATH"] = os.path.join(workdir, "spans.jsonl")
+
+    decks = []
+    for fmt in args.formats:
+        for pages in ([1] if fmt == "image" else args.pages):
+            image_pages = 0 if fmt == "image" else min(args.image_pages, pages)
+            decks.append(make_deck(fmt, pages, args.words, image_pages))
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            # Without Tesseract image decks only measure the failed-OCR path
+            "tesseract": shutil.which("tesseract") is not None,
+            "args": vars(args),
+        },
+        "decks": {},
+    }
+    for deck in decks:
+        label = deck.name.rsplit(".", 1)[0].replace("synthetic_", "")
+        print(f"Benchmarking {label}...", file=sys.stderr)
+        results["decks"][label] = bench_deck(deck, args.repeats)
+    # ru_maxrss is KB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results["max_rss_mb"] = round(maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+    output = json.dumps(results, indent=2)
+    if args.out:
+        Path(args.out).write_text(output)
+    else:
+        print(output)
+
+    print(f"\n{'deck / stage':48} {'cold':>9} {'p50':>9} {'p95':>9} {'peak KB':>9}", file=sys.stderr)
+    for label, deck in results["decks"].items():
+        print(f"{label} ({deck['pages']} pages, {deck['file_kb']} KB)", file=sys.stderr)
+        for stage, s in deck["stages"].items():
+            print(f"  {stage:46} {s['cold_ms']:9.2f} {s['p50_ms']:9.2f} {s['p95_ms']:9.2f} {s['peak_kb']:9.1f}",
+                  file=sys.stderr)
+
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text()),
+                              args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("\nStage regressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Shared HTTP layer for the MCP servers.
+
+One pooled keep-alive session per server process with connect/read
+timeouts, bounded retries with exponential backoff, gzip, conditional
+GETs (ETag / Last-Modified) and per-host latency counters.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = (
+    float(os.getenv("MCP_HTTP_CONNECT_TIMEOUT", "3.05")),
+    float(os.getenv("MCP_HTTP_READ_TIMEOUT", "10")),
+)
+DEFAULT_HEADERS = {
+    "User-Agent": os.getenv("MCP_HTTP_USER_AGENT", "Mozilla/5.0 (compatible; HatchUp-MCP/1.0)"),
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+class HostStats:
+    __slots__ = ("requests", "errors", "not_modified", "bytes", "total_ms", "max_ms", "last_status")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0
+        self.bytes = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_status = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "not_modified": self.not_modified,
+            "bytes": self.bytes,
+            "avg_ms": round(self.total_ms / self.requests, 1) if self.requests else 0.0,
+            "max_ms": round(self.max_ms, 1),
+            "last_status": self.last_status,
+        }
+
+
+class HttpClient:
+    """
+    Thin wrapper around a pooled requests.Session.
+    Safe to share between threads; keep one per process.
+    """
+
+    def __init__(self, pool_size: int = 10, retries: int = 3, backoff: float = 0.5,
+                 timeout: Tuple[float, float] = DEFAULT_TIMEOUT, cache_entries: int = 256):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._cache: "OrderedDict[str, requests.Response]" = OrderedDict()
+        self._cache_entries = cache_entries
+        self._stats: Dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(url: str, params: Optional[Dict[str, Any]]) -> str:
+        return f"{url}?{urlencode(sorted(params.items()), doseq=True)}" if params else url
+
+    def _record(self, url: str, started: float, response: Optional[requests.Response],
+                stream: bool = False) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        host = urlsplit(url).netloc
+        with self._lock:
+            stats = self._stats.setdefault(host, HostStats())
+            stats.requests += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            if response is None:
+                stats.errors += 1
+                return
+            stats.last_status = response.status_code
+            if response.status_code == 304:
+                stats.not_modified += 1
+            elif response.status_code >= 400:
+                stats.errors += 1
+            # Compressed size on the wire when the server reports it; streamed
+            # bodies are not read here, so only a declared length is counted
+            length = response.headers.get("Content-Length")
+            if length:
+                stats.bytes += int(length)
+            elif not stream:
+                stats.bytes += len(response.content or b"")
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Dict[str, str]] = None, conditional: bool = True,
+            timeout: Optional[Tuple[float, float]] = None, stream: bool = False) -> requests.Response:
+        """
+        GET with pooling, retries and timeouts. When conditional is set, a
+        previously seen ETag / Last-Modified is revalidated and a 304 returns
+        the cached response. Streamed responses are never cached; the caller
+        must close them.
+        """
+        conditional = conditional and not stream
+        key = self._cache_key(url, params)
+        request_headers = dict(headers or {})
+        cached = None
+        if conditional:
+            with self._lock:
+                cached = self._cache.get(key)
+            if cached is not None:
+                if cached.headers.get("ETag"):
+                    request_headers["If-None-Match"] = cached.headers["ETag"]
+                if cached.headers.get("Last-Modified"):
+                    request_headers["If-Modified-Since"] = cached.headers["Last-Modified"]
+
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, params=params, headers=request_headers,
+                                        timeout=timeout or self.timeout, stream=stream)
+        except requests.RequestException:
+            self._record(url, started, None)
+            raise
+        self._record(url, started, response, stream=stream)
+
+        if response.status_code == 304 and cached is not None:
+            return cached
+
+        if conditional and response.status_code == 200 and (
+                response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            with self._lock:
+                self._cache[key] = response
+                self._cache.move_to_end(key)
+                while len(self._cache) > self._cache_entries:
+                    self._cache.popitem(last=False)
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-host request counts, errors, 304 hits, bytes and latency.
+        """
+        with self._lock:
+            return {host: s.as_dict() for host, s in self._stats.items()}
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Returns the process-wide HttpClient, creating it on first use.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
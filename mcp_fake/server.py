@@ -0,0 +1,193 @@
+"""
+Stand-in for the Reddit, Wikipedia, Google and Medium MCP servers.
+
+    python mcp_fake/server.py --as reddit|wikipedia|google|medium
+
+Speaks MCP over stdio like the real servers and registers the same tools
+with the same signatures and result shapes, but answers from deterministic
+local data: no credentials, no network. MCP_FAKE_LATENCY (seconds) delays
+every tool call to mimic the real round trips. src.mcp_tools launches
+these when HATCHUP_MCP_BACKEND=fake.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import zlib
+from pathlib import Path
+
+from mcp.server import FastMCP
+
+# Make the repo root importable when launched as `python mcp_fake/server.py`
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mcp_reddit.fake_backend import FakeReddit
+
+SOURCES = ["reddit", "wikipedia", "google", "medium"]
+
+_SITES = ["techcrunch.com", "crunchbase.com", "forbes.com", "sifted.eu", "bloomberg.com"]
+_ANGLES = ["raises", "market map", "competitors", "pricing", "funding round", "layoffs", "acquisition"]
+
+
+def _latency():
+    delay = float(os.getenv("MCP_FAKE_LATENCY", "0"))
+    if delay > 0:
+        time.sleep(delay)
+
+
+def _seed(*parts) -> int:
+    return zlib.crc32(":".join(str(p) for p in parts).encode("utf-8"))
+
+
+def _slug(text: str) -> str:
+    return "-".join(text.lower().split())[:60] or "startups"
+
+
+def register_reddit(mcp: FastMCP) -> None:
+    reddit = FakeReddit()
+
+    def comments(post, count, compact):
+        post.comment_limit = count
+        if compact:
+            return [{"body": c.body, "score": c.score} for c in post.comments]
+        return [{"id": c.id, "author": c.author, "body": c.body, "score": c.score} for c in post.comments]
+
+    @mcp.tool()
+    def search_reddit(query: str, subreddits: str = "", limit: int = 5, comments_per_post: int = 5,
+                      time_filter: str = "year", sort: str = "relevance"):
+        """
+        Search Reddit for posts matching a query across a set of subreddits, with their top comments.
+        """
+        _latency()
+        names = subreddits or "startups,venturecapital,Entrepreneur,SaaS"
+        posts = reddit.subreddit("+".join(n.strip() for n in names.split(",") if n.strip())).search(
+            query, limit=int(limit))
+        posts_data = [
+            {
+                "title": post.title,
+                "subreddit": str(post.subreddit),
+                "url": f"https://reddit.com{post.permalink}",
+                "score": post.score,
+                "num_comments": post.num_comments,
+                "selftext": post.selftext[:500],
+                "comments": comments(post, int(comments_per_post), compact=True),
+            }
+            for post in posts
+        ]
+        return json.dumps({"posts": posts_data}, separators=(",", ":"))
+
+    @mcp.tool()
+    def fetch_reddit_posts_with_comments(subreddit="all", limit="5", comments_per_post="15"):
+        """
+        Fetch hot posts and top comments from a subreddit.
+        """
+        _latency()
+        posts = reddit.subreddit(subreddit).hot(limit=int(limit))
+        return {"posts": [
+            {
+                "id": post.id,
+                "title": post.title,
+                "author": post.author,
+                "url": f"https://reddit.com{post.permalink}",
+                "score": post.score,
+                "num_comments": post.num_comments,
+                "created_utc": post.created_utc,
+                "comments": comments(post, int(comments_per_post), compact=False),
+            }
+            for post in posts
+        ]}
+
+
+def register_wikipedia(mcp: FastMCP) -> None:
+    def page(title):
+        return {
+            "title": title,
+            "summary": f"{title} is a topic covered by this offline stand-in for Wikipedia. "
+                       f"It is used to exercise the research pipeline without network access.",
+            "url": f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}",
+        }
+
+    @mcp.tool()
+    async def ping() -> str:
+        return "Wikipedia MCP is running!"
+
+    @mcp.tool()
+    async def search(query: str, limit: int = 5):
+        _latency()
+        words = query.title().split() or ["Startup"]
+        titles = [" ".join(words)] + [f"{w} (economics)" for w in words][:max(0, int(limit) - 1)]
+        return [page(title) for title in titles[:int(limit)]]
+
+    @mcp.tool()
+    async def get_page(title: str):
+        _latency()
+        return page(title)
+
+
+def register_google(mcp: FastMCP) -> None:
+    @mcp.tool()
+    def google_search(query: str, num_results: int = 5):
+        """Search Google using the Custom Search API."""
+        _latency()
+        results = []
+        for i in range(int(num_results)):
+            seed = _seed(query, i)
+            site, angle = _SITES[seed % len(_SITES)], _ANGLES[seed % len(_ANGLES)]
+            results.append({
+                "title": f"{query.title()} {angle} - {site}",
+                "snippet": f"Coverage of {query} and its {angle}, as reported by {site}.",
+                "link": f"https://{site}/{_slug(query)}-{angle.replace(' ', '-')}-{seed % 10000}",
+            })
+        return results
+
+    @mcp.tool()
+    def http_stats():
+        """Per-host HTTP latency and error counters for this server (diagnostics)."""
+        return {}
+
+
+def register_medium(mcp: FastMCP) -> None:
+    @mcp.tool()
+    def search_medium(query: str, num_results: int = 5):
+        """
+        Search Medium for articles related to a query.
+        """
+        _latency()
+        return [
+            {
+                "title": f"What founders get wrong about {query} (part {i + 1})",
+                "link": f"https://medium.com/tag/{_slug(query)}/{_seed(query, i) % 100000:05d}",
+                "snippet": f"Lessons on {query} from operators and investors: distribution, pricing and retention.",
+                "published": "Mon, 01 Jan 2024 00:00:00 GMT",
+            }
+            for i in range(int(num_results))
+        ]
+
+    @mcp.tool()
+    def http_stats():
+        """
+        Per-host HTTP latency and error counters for this server (diagnostics).
+        """
+        return {}
+
+
+REGISTER = {
+    "reddit": register_reddit,
+    "wikipedia": register_wikipedia,
+    "google": register_google,
+    "medium": register_medium,
+}
+
+
+def build_server(source: str) -> FastMCP:
+    mcp = FastMCP(f"{source} (fake)")
+    REGISTER[source](mcp)
+    return mcp
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline stand-in for one of the research MCP servers.")
+    parser.add_argument("--as", dest="source", choices=SOURCES, required=True)
+    args = parser.parse_args()
+    print(f"Running fake {args.source} MCP...", file=sys.stderr)
+    build_server(args.source).run(transport="stdio")
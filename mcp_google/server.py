@@ -11,6 +11,10 @@ import sys
 env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+# Make the repo root importable when launched as `python mcp_google/server.py`
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mcp_common.http_client import get_http_client
+
 mcp = FastMCP("Google Search MCP")
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
@@ -27,7 +31,10 @@ def google_search(query: str, num_results: int = 5):
         "num": num_results
     }
 
-    response = requests.get(url, params=params)
+    try:
+        response = get_http_client().get(url, params=params)
+    except requests.RequestException as e:
+        return {"error": f"Google search request failed: {e}"}
     if response.status_code != 200:
         return {"error": response.text}
 
@@ -42,6 +49,11 @@ def google_search(query: str, num_results: int = 5):
     ]
     return results
 
+@mcp.tool()
+def http_stats():
+    """Per-host HTTP latency and error counters for this server (diagnostics)."""
+    return get_http_client().stats()
+
 if __name__ == "__main__":
     print("Running Google Search MCP...", file=sys.stderr)
     mcp.run(transport="stdio")
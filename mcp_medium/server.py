@@ -1,20 +1,144 @@
 from mcp.server import FastMCP
+import os
+import re
 import requests
 import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from bs4 import BeautifulSoup
 
+# Make the repo root importable when launched as `python mcp_medium/server.py`
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mcp_common.http_client import get_http_client
+
 mcp = FastMCP("Medium MCP")
 
-@mcp.tool()
-def search_medium(query: str, num_results: int = 5):
+FEED_URL = "https://medium.com/feed/{path}"
+# Publication feeds searched alongside tag feeds, e.g. "swlh,startup-grind"
+PUBLICATIONS = [p.strip() for p in os.getenv("MEDIUM_PUBLICATIONS", "").split(",") if p.strip()]
+MAX_TAGS = int(os.getenv("MEDIUM_MAX_TAGS", "3"))
+CACHE_TTL = float(os.getenv("MEDIUM_CACHE_TTL", "900"))
+CACHE_ENTRIES = 256
+CHUNK_SIZE = 8192
+
+_feed_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="medium-feeds")
+_feed_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_STOPWORDS = {"a", "an", "and", "the", "of", "for", "to", "in", "on", "vs", "with", "how", "what", "is", "are"}
+
+
+def _query_tags(query):
     """
-    Search Medium for articles related to a query.
+    Medium tag slugs for a query: the whole phrase first, then its significant words.
     """
-    print(f"[Medium MCP] Searching Medium for: {query}", file=sys.stderr)
-    url = f"https://medium.com/search?q={query.replace(' ', '%20')}"
-    headers = {"User-Agent": "Mozilla/5.0"}
+    words = [w for w in re.findall(r"[a-z0-9]+", query.lower()) if w not in _STOPWORDS]
+    tags = ["-".join(words)] if words else []
+    tags += [w for w in words if len(w) > 2 and w not in tags]
+    return tags[:MAX_TAGS]
+
+
+# Medium puts the article body in <content:encoded>; <description> is often missing
+CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+
+
+def _clean(html_text, limit=300):
+    text = " ".join(_TAG_RE.sub(" ", html_text or "").split())
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _parse_feed(path, max_items):
+    """
+    Streams an RSS feed through an incremental XML parser and stops
+    downloading as soon as max_items <item> elements have been read.
+    Returns (items, complete) where complete means the feed was exhausted.
+    """
+    items = []
+    parser = ET.XMLPullParser(events=("end",))
+    response = get_http_client().get(FEED_URL.format(path=path), stream=True)
+    try:
+        if response.status_code != 200:
+            return [], False
+        for chunk in response.iter_content(CHUNK_SIZE):
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                if elem.tag != "item":
+                    continue
+                link = (elem.findtext("link") or "").split("?source")[0]
+                items.append({
+                    "title": elem.findtext("title") or "Untitled",
+                    "link": link,
+                    "snippet": _clean(elem.findtext("description")) or _clean(elem.findtext(CONTENT_ENCODED)),
+                    "published": elem.findtext("pubDate") or "",
+                })
+                # Drop the (often large) article body we already consumed
+                elem.clear()
+                if len(items) >= max_items:
+                    return items, False
+        return items, True
+    finally:
+        response.close()
+
+
+def _get_feed(path, max_items):
+    """
+    Returns up to max_items items of a feed, served from the per-feed cache when possible.
+    """
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _feed_cache.get(path)
+        if entry and now - entry[0] < CACHE_TTL and (entry[2] or len(entry[1]) >= max_items):
+            _feed_cache.move_to_end(path)
+            return entry[1][:max_items]
+
+    items, complete = _parse_feed(path, max_items)
+    with _cache_lock:
+        _feed_cache[path] = (now, items, complete)
+        while len(_feed_cache) > CACHE_ENTRIES:
+            _feed_cache.popitem(last=False)
+    return items
+
+
+def _search_feeds(query, num_results):
+    paths = [f"tag/{tag}" for tag in _query_tags(query)] + PUBLICATIONS
+    futures = [_feed_pool.submit(_get_feed, path, num_results) for path in paths]
+
+    terms = [w for w in re.findall(r"[a-z0-9]+", query.lower()) if w not in _STOPWORDS]
+    articles, seen = [], set()
+    for path, future in zip(paths, futures):
+        try:
+            items = future.result()
+        except Exception as e:
+            print(f"[Medium MCP] Feed {path} failed: {e}", file=sys.stderr)
+            continue
+        for item in items:
+            if item["link"] in seen:
+                continue
+            # Publication feeds are not topical, so keep only items that mention the query
+            if not path.startswith("tag/"):
+                text = f"{item['title']} {item['snippet']}".lower()
+                if not any(t in text for t in terms):
+                    continue
+            seen.add(item["link"])
+            articles.append(item)
+    return articles[:num_results]
 
-    response = requests.get(url, headers=headers)
+
+def _scrape_search(query, num_results):
+    """
+    Fallback: scrape the Medium search page.
+    """
+    url = "https://medium.com/search"
+
+    try:
+        response = get_http_client().get(url, params={"q": query})
+    except requests.RequestException as e:
+        return {"error": f"Failed to fetch Medium results. {e}"}
     if response.status_code != 200:
         return {"error": f"Failed to fetch Medium results. {response.status_code}"}
 
@@ -30,6 +154,25 @@ def search_medium(query: str, num_results: int = 5):
 
     return articles
 
+@mcp.tool()
+def search_medium(query: str, num_results: int = 5):
+    """
+    Search Medium for articles related to a query.
+    """
+    print(f"[Medium MCP] Searching Medium for: {query}", file=sys.stderr)
+    num_results = int(num_results)
+    articles = _search_feeds(query, num_results)
+    if articles:
+        return articles
+    return _scrape_search(query, num_results)
+
+@mcp.tool()
+def http_stats():
+    """
+    Per-host HTTP latency and error counters for this server (diagnostics).
+    """
+    return get_http_client().stats()
+
 if __name__ == "__main__":
     print("Running Medium MCP...", file=sys.stderr)
     mcp.run(transport="stdio")
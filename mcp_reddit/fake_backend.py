@@ -0,0 +1,116 @@
+"""
+Offline stand-in for the subset of praw used by the Reddit MCP server.
+
+Enable with REDDIT_BACKEND=fake. Content is deterministic so runs are
+comparable; REDDIT_FAKE_LATENCY (seconds) adds a delay to every listing
+and comment load to mimic network round trips.
+"""
+import os
+import time
+import zlib
+
+_TOPICS = [
+    ("AI agents", "Are AI agent startups just wrappers around foundation models?"),
+    ("fintech", "Fintech infrastructure is consolidating, is there room for new players?"),
+    ("EV batteries", "Solid-state EV batteries: when will they actually hit the market?"),
+    ("SaaS", "Seed-stage SaaS metrics investors looked at this year"),
+    ("marketplace", "How we bootstrapped the supply side of our marketplace"),
+    ("climate", "Climate tech fundraising is harder than the headlines suggest"),
+    ("healthtech", "Selling into hospitals as a healthtech startup: lessons learned"),
+    ("devtools", "Open-source devtools: monetization models that work"),
+]
+
+_COMMENTS = [
+    "We tried this at my last company. Distribution was the hard part, not the tech.",
+    "The unit economics only work once you cross a few thousand paying customers.",
+    "Investors asked us about defensibility in every single meeting.",
+    "Incumbents are moving faster here than most founders expect.",
+    "Regulation is the real moat in this space.",
+    "Churn killed us. Measure retention cohorts early.",
+    "Enterprise sales cycles were 9-12 months for us.",
+    "Pricing on usage instead of seats doubled our expansion revenue.",
+]
+
+
+def _latency():
+    delay = float(os.getenv("REDDIT_FAKE_LATENCY", "0"))
+    if delay > 0:
+        time.sleep(delay)
+
+
+class FakeComment:
+    def __init__(self, post_id: str, index: int):
+        seed = zlib.crc32(f"{post_id}:{index}".encode())
+        self.id = f"{post_id}c{index}"
+        self.author = f"user{seed % 997}"
+        self.body = _COMMENTS[seed % len(_COMMENTS)]
+        self.score = int(seed % 250)
+
+
+class FakeCommentForest(list):
+    def replace_more(self, limit=None):
+        return []
+
+
+_SUBMISSIONS = {}
+
+
+class FakeSubmission:
+    def __init__(self, subreddit: str, index: int):
+        topic, title = _TOPICS[index % len(_TOPICS)]
+        seed = zlib.crc32(f"{subreddit}:{index}".encode())
+        # Fixed-width hash of the full name, so e.g. r/startups and r/startupideas never share ids
+        self.id = f"{zlib.crc32(subreddit.lower().encode()):08x}{index}"
+        self.title = title
+        self.selftext = f"Discussion about {topic} in r/{subreddit}. " * 3
+        self.author = f"founder{seed % 311}"
+        self.subreddit = subreddit
+        self.permalink = f"/r/{subreddit}/comments/{self.id}/"
+        self.score = int(seed % 5000)
+        self.num_comments = 12
+        self.created_utc = 1700000000.0 + index * 3600
+        self.comment_sort = "confidence"
+        self.comment_limit = None
+        self._comments = None
+        _SUBMISSIONS[self.id] = (subreddit, index)
+
+    @property
+    def comments(self) -> FakeCommentForest:
+        if self._comments is None:
+            _latency()
+            count = self.num_comments if self.comment_limit is None else min(self.comment_limit, self.num_comments)
+            self._comments = FakeCommentForest(FakeComment(self.id, i) for i in range(count))
+        return self._comments
+
+
+class FakeSubreddit:
+    def __init__(self, name: str):
+        self.names = name.split("+")
+
+    def _posts(self):
+        for name in self.names:
+            for i in range(len(_TOPICS)):
+                yield FakeSubmission(name, i)
+
+    def hot(self, limit=10):
+        _latency()
+        return list(self._posts())[:limit]
+
+    def search(self, query, sort="relevance", time_filter="all", limit=10):
+        _latency()
+        terms = [t for t in query.lower().split() if len(t) > 2]
+        hits = [p for p in self._posts()
+                if not terms or any(t in f"{p.title} {p.selftext}".lower() for t in terms)]
+        return hits[:limit]
+
+
+class FakeReddit:
+    def __init__(self, **kwargs):
+        pass
+
+    def subreddit(self, name: str) -> FakeSubreddit:
+        return FakeSubreddit(name)
+
+    def submission(self, id: str) -> FakeSubmission:
+        subreddit, index = _SUBMISSIONS[id]
+        return FakeSubmission(subreddit, index)
@@ -8,6 +8,9 @@ try:
     from mcp.server import FastMCP
     import praw
     import os
+    import json
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
     from dotenv import load_dotenv
     from pathlib import Path
 except Exception:
@@ -19,37 +22,145 @@ except Exception:
 env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+# Make the repo root importable when launched as `python mcp_reddit/server.py`
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
 mcp=FastMCP("Reddit")
 
-@mcp.tool()
-def fetch_reddit_posts_with_comments(subreddit="all", limit="5", comments_per_post="15"):
-    """
-    Fetch hot posts and top comments from a subreddit.
-    """
-    try:
-        # Lazy initialization
+DEFAULT_SUBREDDITS = os.getenv(
+    "REDDIT_SUBREDDITS", "startups,venturecapital,Entrepreneur,SaaS"
+).split(",")
+COMMENT_WORKERS = int(os.getenv("REDDIT_COMMENT_WORKERS", "4"))
+MAX_BODY_CHARS = int(os.getenv("REDDIT_MAX_BODY_CHARS", "500"))
+
+# praw.Reddit is not thread-safe, so each thread keeps its own long-lived client
+# (and with it its OAuth token and HTTP keep-alive session).
+_local = threading.local()
+_comment_pool = ThreadPoolExecutor(max_workers=COMMENT_WORKERS, thread_name_prefix="reddit-comments")
+
+
+def get_client():
+    client = getattr(_local, "client", None)
+    if client is not None:
+        return client
+
+    if os.getenv("REDDIT_BACKEND") == "fake":
+        from mcp_reddit.fake_backend import FakeReddit
+        client = FakeReddit()
+    else:
         client_id = os.getenv("REDDIT_CLIENT_ID")
         client_secret = os.getenv("REDDIT_CLIENT_SECRET")
-        
         if not client_id or not client_secret:
-            return {"error": "Reddit API credentials (REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET) are missing.", "posts": []}
-
-        reddit_client = praw.Reddit(
+            raise RuntimeError("Reddit API credentials (REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET) are missing.")
+        client = praw.Reddit(
             client_id=client_id,
             client_secret=client_secret,
-            user_agent=os.getenv("USER_AGENT", "echolab-mcp-reddit/0.1")
+            user_agent=os.getenv("USER_AGENT", "echolab-mcp-reddit/0.1"),
+            check_for_async=False
         )
 
+    _local.client = client
+    return client
+
+
+def _clip(text, limit=MAX_BODY_CHARS):
+    text = " ".join((text or "").split())
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _load_comments(post_id, comments_per_post, compact):
+    """
+    Loads the top comments of one submission on a pool thread, using that thread's client.
+    """
+    post = get_client().submission(id=post_id)
+    post.comment_sort = "top"
+    post.comment_limit = comments_per_post
+    post.comments.replace_more(limit=0)
+
+    comments = []
+    for comment in post.comments[:comments_per_post]:
+        if compact:
+            comments.append({"body": _clip(comment.body), "score": int(comment.score)})
+        else:
+            comments.append({
+                "author": str(comment.author) if comment.author else "deleted",
+                "body": comment.body or "",
+                "score": int(comment.score)
+            })
+    return comments
+
+
+def _expand_comments(posts, comments_per_post, compact):
+    """
+    Fetches comments for all posts concurrently, bounded by the comment pool size.
+    """
+    if comments_per_post <= 0:
+        return [[] for _ in posts]
+    futures = [_comment_pool.submit(_load_comments, p.id, comments_per_post, compact) for p in posts]
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            print(f"[Reddit MCP] Comment fetch failed: {e}", file=sys.stderr)
+            results.append([])
+    return results
+
+
+@mcp.tool()
+def search_reddit(query: str, subreddits: str = "", limit: int = 5, comments_per_post: int = 5,
+                  time_filter: str = "year", sort: str = "relevance"):
+    """
+    Search Reddit for posts matching a query across a set of subreddits, with their top comments.
+    subreddits is a comma-separated list; defaults to REDDIT_SUBREDDITS.
+    """
+    try:
+        names = [s.strip() for s in (subreddits.split(",") if subreddits else DEFAULT_SUBREDDITS) if s.strip()]
+        limit = int(limit)
+        comments_per_post = int(comments_per_post)
+
+        # One multireddit search request instead of one listing per subreddit
+        sub = get_client().subreddit("+".join(names))
+        posts = list(sub.search(query, sort=sort, time_filter=time_filter, limit=limit))
+        comments = _expand_comments(posts, comments_per_post, compact=True)
+
+        posts_data = [
+            {
+                "title": post.title,
+                "subreddit": str(post.subreddit),
+                "url": f"https://reddit.com{post.permalink}",
+                "score": int(post.score),
+                "num_comments": int(post.num_comments),
+                "selftext": _clip(post.selftext),
+                "comments": post_comments
+            }
+            for post, post_comments in zip(posts, comments)
+        ]
+        # Compact JSON: FastMCP would otherwise pretty-print dicts with indentation
+        return json.dumps({"posts": posts_data}, separators=(",", ":"))
+
+    except Exception as e:
+        # Same compact JSON string as the success path
+        return json.dumps({"error": str(e), "posts": []}, separators=(",", ":"))
+
+
+@mcp.tool()
+def fetch_reddit_posts_with_comments(subreddit="all", limit="5", comments_per_post="15"):
+    """
+    Fetch hot posts and top comments from a subreddit.
+    """
+    try:
         # Convert string inputs to int
         limit = int(limit)
         comments_per_post = int(comments_per_post)
 
         posts_data = []
-        sub = reddit_client.subreddit(subreddit)
-        submissions = sub.hot(limit=limit)
+        sub = get_client().subreddit(subreddit)
+        posts = list(sub.hot(limit=limit))
+        comments = _expand_comments(posts, comments_per_post, compact=False)
 
-        for post in submissions:
-            post_info = {
+        for post, post_comments in zip(posts, comments):
+            posts_data.append({
                 "id": post.id,
                 "title": post.title,
                 "author": str(post.author) if post.author else "deleted",
@@ -57,18 +168,8 @@ def fetch_reddit_posts_with_comments(subreddit="all", limit="5", comments_per_po
                 "score": int(post.score),
                 "num_comments": int(post.num_comments),
                 "created_utc": float(post.created_utc),
-                "comments": []
-            }
-
-            post.comments.replace_more(limit=0)
-            for comment in post.comments[:comments_per_post]:
-                post_info["comments"].append({
-                    "author": str(comment.author) if comment.author else "deleted",
-                    "body": comment.body or "",
-                    "score": int(comment.score)
-                })
-
-            posts_data.append(post_info)
+                "comments": post_comments
+            })
 
         # Always return something structured
         return {"posts": posts_data}
@@ -84,4 +185,4 @@ if __name__ == "__main__":
         mcp.run(transport="stdio")
     except Exception:
         traceback.print_exc(file=sys.stderr)
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -1,9 +1,109 @@
 import asyncio
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
 from mcp.server import FastMCP
-import wikipedia
+
+# Make the repo root importable when launched as `python mcp_wiki/server.py`
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mcp_common.http_client import get_http_client
 
 mcp = FastMCP("wikipedia")
 
+API_URL = "https://en.wikipedia.org/w/api.php"
+# The extracts API only returns intro extracts for up to 20 pages per request
+MAX_TITLES_PER_REQUEST = 20
+CACHE_ENTRIES = 2048
+
+_summary_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _page_url(title):
+    return f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"
+
+
+def _search_titles(query, limit):
+    response = get_http_client().get(API_URL, params={
+        "action": "query",
+        "list": "search",
+        "srsearch": query,
+        "srlimit": limit,
+        "srprop": "",
+        "format": "json",
+    })
+    response.raise_for_status()
+    return [hit["title"] for hit in response.json().get("query", {}).get("search", [])]
+
+
+def _fetch_summaries(titles, sentences):
+    """
+    Returns {title: summary} for all titles, fetching the uncached ones
+    with one batched extracts request per 20 titles.
+    """
+    summaries = {}
+    missing = []
+    with _cache_lock:
+        for title in titles:
+            key = (title, sentences)
+            if key in _summary_cache:
+                _summary_cache.move_to_end(key)
+                summaries[title] = _summary_cache[key]
+            else:
+                missing.append(title)
+
+    for start in range(0, len(missing), MAX_TITLES_PER_REQUEST):
+        batch = missing[start:start + MAX_TITLES_PER_REQUEST]
+        params = {
+            "action": "query",
+            "prop": "extracts",
+            "exintro": 1,
+            "explaintext": 1,
+            "exlimit": "max",
+            "redirects": 1,
+            "titles": "|".join(batch),
+            "format": "json",
+        }
+        if sentences:
+            params["exsentences"] = sentences
+        response = get_http_client().get(API_URL, params=params)
+        response.raise_for_status()
+        query = response.json().get("query", {})
+
+        # Map normalized / redirected titles back to the titles we asked for
+        aliases = {t: t for t in batch}
+        for step in query.get("normalized", []) + query.get("redirects", []):
+            for original, alias in list(aliases.items()):
+                if alias == step["from"]:
+                    aliases[original] = step["to"]
+        extracts = {page.get("title"): page.get("extract") for page in query.get("pages", {}).values()}
+
+        with _cache_lock:
+            for title in batch:
+                extract = extracts.get(aliases[title])
+                if extract:
+                    summaries[title] = extract
+                    _summary_cache[(title, sentences)] = extract
+            while len(_summary_cache) > CACHE_ENTRIES:
+                _summary_cache.popitem(last=False)
+
+    return summaries
+
+
+def _search(query, limit):
+    titles = _search_titles(query, limit)
+    summaries = _fetch_summaries(titles, sentences=2)
+    return [
+        {
+            "title": title,
+            "summary": summaries.get(title, "Summary not available"),
+            "url": _page_url(title)
+        }
+        for title in titles
+    ]
+
+
 # Health check
 @mcp.tool()
 async def ping() -> str:
@@ -12,29 +112,23 @@ async def ping() -> str:
 # Search Wikipedia
 @mcp.tool()
 async def search(query: str, limit: int = 5):
-    results = wikipedia.search(query, results=limit)
-    data = []
-    for r in results:
-        try:
-            summary = wikipedia.summary(r, sentences=2, auto_suggest=False)
-        except Exception:
-            summary = "Summary not available"
-        data.append({
-            "title": r,
-            "summary": summary,
-            "url": f"https://en.wikipedia.org/wiki/{r.replace(' ', '_')}"
-        })
-    return data
+    # One search request plus one batched extracts request, off the event loop
+    try:
+        return await asyncio.to_thread(_search, query, int(limit))
+    except Exception as e:
+        return {"error": str(e)}
 
 # Get a page summary
 @mcp.tool()
 async def get_page(title: str):
     try:
-        summary = wikipedia.summary(title, auto_suggest=False)
+        summaries = await asyncio.to_thread(_fetch_summaries, [title], None)
+        if title not in summaries:
+            return {"error": f"Page '{title}' not found."}
         return {
             "title": title,
-            "summary": summary,
-            "url": f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"
+            "summary": summaries[title],
+            "url": _page_url(title)
         }
     except Exception as e:
         return {"error": str(e)}
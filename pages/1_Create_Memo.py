@@ -6,7 +6,6 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from src.models import PitchDeckData, InvestmentMemo
-from src.memo_generator import MemoGenerator
 from src.exporter import Exporter
 
 st.set_page_config(
@@ -46,7 +45,14 @@ with st.form("memo_form"):
     
     generate_btn = st.form_submit_button("Generate Memo")
 
-if generate_btn and os.environ.get("GROQ_API_KEY"):
+key_missing = False
+if generate_btn:
+    # Imported on demand: the LLM stack is only needed once a memo is requested
+    from src.llm import missing_api_key
+
+    key_missing = missing_api_key()
+
+if generate_btn and not key_missing:
     # Construct a temporary data object
     # We use the PitchDeckData model, filling missing fields with "N/A" for manual entry
     try:
@@ -67,9 +73,14 @@ if generate_btn and os.environ.get("GROQ_API_KEY"):
         )
         
         with st.spinner("Drafting Memo..."):
-            model_choice = "openai/gpt-oss-20b"
-            generator = MemoGenerator(api_key=os.environ["GROQ_API_KEY"], model_name=model_choice)
-            memo = generator.generate_memo(current_data)
+            from src.memo_generator import MemoGenerator
+
+            generator = MemoGenerator(api_key=os.environ.get("GROQ_API_KEY", ""))
+            from src.usage import usage_context
+
+            deal = (st.session_state.get("analysis_result") or {}).get("content_hash")
+            with usage_context(deal=deal):
+                memo = generator.generate_memo(current_data)
             
             # Update session state so the Research Engine can use this latest data
             if "analysis_result" not in st.session_state or st.session_state.analysis_result is None:
@@ -77,6 +88,11 @@ if generate_btn and os.environ.get("GROQ_API_KEY"):
             
             st.session_state.analysis_result["data"] = current_data
             st.session_state.analysis_result["memo"] = memo
+
+            # Prefetched Ready Query answers belong to the previous memo; recompute them
+            prefetcher = st.session_state.analysis_result.get("prefetch")
+            if prefetcher:
+                prefetcher.start(current_data, memo, st.session_state.analysis_result.get("deck_index"), deal=deal)
             
             st.subheader("Generated Memo")
             st.markdown(f"**Overview:** {memo.company_overview}")
@@ -98,5 +114,5 @@ if generate_btn and os.environ.get("GROQ_API_KEY"):
             
     except Exception as e:
         st.error(f"Error generating memo: {e}")
-elif generate_btn and not os.environ.get("GROQ_API_KEY"):
+elif generate_btn and key_missing:
     st.error("GROQ_API_KEY not found in .env")
@@ -1,8 +1,13 @@
 import streamlit as st
-import os
-from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
+import time
 from dotenv import load_dotenv
+from src.llm import get_llm
+from src.memory import ConversationMemory
+from src.research import READY_QUERIES, RESEARCH_PROMPT, build_context
+from src.similarity import shared_index
+from src.trace_panel import render_trace_panel
+from src.tracing import span, start_trace
+from src.usage import usage_context
 
 load_dotenv()
 
@@ -23,15 +28,33 @@ if "analysis_result" not in st.session_state or not st.session_state.analysis_re
 # Get Data
 data = st.session_state.analysis_result.get("data")
 memo = st.session_state.analysis_result.get("memo")
+deck_index = st.session_state.analysis_result.get("deck_index")
+prefetcher = st.session_state.analysis_result.get("prefetch")
 
 if not data or not memo:
     st.warning("Incomplete data. Ensure both Pitch Deck Data and Investment Memo are generated.")
     st.stop()
 
+# "Have we seen something like this before?"
+with st.sidebar.expander("🔁 Similar Past Deals", expanded=True):
+    similar = shared_index().similar_to(data, memo, k=5, exclude=st.session_state.analysis_result.get("content_hash"))
+    similar = [s for s in similar if s["score"] > 0]
+    for s in similar:
+        st.markdown(f"**{s['startup_name']}** · {s['score']:.2f}  \n"
+                    f"<small>{time.strftime('%Y-%m-%d', time.localtime(s['created_at']))}</small>",
+                    unsafe_allow_html=True)
+    if not similar:
+        st.caption("No similar deals among past analyses yet.")
+
 # Initialize Chat History
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+# Rolling memory of earlier questions and answers for follow-ups
+if "research_memory" not in st.session_state:
+    st.session_state.research_memory = ConversationMemory(get_llm(temperature=0))
+memory = st.session_state.research_memory
+
 # Display Chat History
 for message in st.session_state.messages:
     with st.chat_message(message["role"]):
@@ -41,25 +64,24 @@ for message in st.session_state.messages:
 st.sidebar.title("💡 Ready Queries")
 st.sidebar.markdown("Click to copy/ask:")
 
-queries = [
-    "What are the 3 biggest risks not mentioned in the deck?",
-    "Evaluate the team's ability to execute this specific solution.",
-    "Is the TAM calculated realistically? validate it.",
-    "Compare this to major competitors.",
-    "Draft a follow-up email asking about their unit economics.",
-    "Draft a polite pass (rejection) email.",
-    "What specific questions should I ask in the partner meeting?"
-]
+if prefetcher:
+    st.sidebar.caption(f"⚡ Prefetched answers: {prefetcher.progress()}")
 
 def set_query(q):
     st.session_state._input_query = q
 
-for q in queries:
+for q in READY_QUERIES:
     if st.sidebar.button(q, use_container_width=True):
         # We can either immediately send it or put it in the input
         # Putting it in session state to pre-fill or triggering directly is tricky in Streamlit.
         # Best way: Add to messages and trigger run.
         st.session_state.messages.append({"role": "user", "content": q})
+        # Serve a prefetched answer instantly when it matches the current data & memo
+        cached_answer = prefetcher.get(q, data, memo) if prefetcher else None
+        if cached_answer:
+            st.session_state.messages.append({"role": "assistant", "content": cached_answer})
+            with usage_context(component="research", deal=st.session_state.analysis_result.get("content_hash")):
+                memory.update(st.session_state.messages)
         st.rerun()
 
 # --- Chat Input ---
@@ -77,49 +99,33 @@ if st.session_state.messages and st.session_state.messages[-1]["role"] == "user"
         full_response = ""
         
         try:
-            llm = ChatGroq(
-                temperature=0.5,
-                model_name="openai/gpt-oss-20b", 
-                groq_api_key=os.environ.get("GROQ_API_KEY"),
-                streaming=True
-            )
-            
-            context_str = f"""
-            *** STARTUP ANALYZED DATA ***
-            {data.model_dump_json()}
-            
-            *** INVESTMENT MEMO ***
-            {memo.model_dump_json()}
-            """
-            
-            system_prompt = """You are a highly intelligent VC Research Associate. 
-            You have access to the parsed Pitch Deck Data and a generated Investment Memo for a startup.
-            
-            Your goal is to answer the User's (Partner's) questions deeply and critically.
-            
-            Guidelines:
-            1. Use the provided Context as your primary source.
-            2. If the user asks for validation (e.g. Market size, competitors), use your own internal knowledge to verify if the startup's claims are realistic.
-            3. Be concise but insightful. Start directly with the answer.
-            4. If drafting emails, use a professional VC tone.
-            """
-            
-            prompt_template = ChatPromptTemplate.from_messages([
-                ("system", system_prompt),
-                ("user", "Context:\n{context}\n\nQuestion: {question}")
-            ])
-            
-            chain = prompt_template | llm
+            llm = get_llm(temperature=0.5)
             
-            # Stream response
-            for chunk in chain.stream({"context": context_str, "question": user_query}):
-                if chunk.content:
-                    full_response += chunk.content
-                    message_placeholder.markdown(full_response + "▌")
-            
-            message_placeholder.markdown(full_response)
-            
-            st.session_state.messages.append({"role": "assistant", "content": full_response})
+            deal = st.session_state.analysis_result.get("content_hash")
+            with start_trace("research.question", question=user_query[:200]) as trace, \
+                    usage_context(component="research", deal=deal):
+                st.session_state.trace_id = trace.trace_id
+
+                # Compact digest + only the deck chunks relevant to this question
+                with span("research.build_context"):
+                    context_str = build_context(data, memo, deck_index, user_query)
+
+                chain = RESEARCH_PROMPT | llm
+
+                # Stream response
+                history_text = memory.render(st.session_state.messages[:-1]) or "(none)"
+                for chunk in chain.stream({"context": context_str, "history": history_text, "question": user_query}):
+                    if chunk.content:
+                        full_response += chunk.content
+                        message_placeholder.markdown(full_response + "▌")
+
+                message_placeholder.markdown(full_response)
+
+                st.session_state.messages.append({"role": "assistant", "content": full_response})
+                with span("research.memory_update"):
+                    memory.update(st.session_state.messages)
             
         except Exception as e:
             st.error(f"Error requesting reasoning: {e}")
+
+render_trace_panel()
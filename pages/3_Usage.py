@@ -0,0 +1,60 @@
+import time
+
+import streamlit as st
+
+from src.store import AnalysisStore
+from src.usage import get_ledger
+
+st.set_page_config(
+    page_title="Usage - HatchUp",
+    page_icon="📈",
+    layout="wide"
+)
+
+st.title("📈 LLM Usage")
+st.markdown("Where tokens and LLM time go, per deal, day, component and model.")
+
+ledger = get_ledger()
+
+period = st.selectbox("Period", ["Last 24 hours", "Last 7 days", "Last 30 days", "All time"], index=1)
+days = {"Last 24 hours": 1, "Last 7 days": 7, "Last 30 days": 30}.get(period)
+since = time.time() - days * 86400 if days else None
+
+totals = ledger.aggregate("model", since=since)
+if not totals:
+    st.info("No LLM calls recorded for this period yet.")
+    st.stop()
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("LLM Calls", sum(r["calls"] for r in totals))
+col2.metric("Prompt Tokens", f"{sum(r['prompt_tokens'] for r in totals):,}")
+col3.metric("Completion Tokens", f"{sum(r['completion_tokens'] for r in totals):,}")
+col4.metric("LLM Time", f"{sum(r['llm_time_s'] for r in totals):,.1f} s")
+
+estimated = sum(r["estimated_calls"] for r in totals)
+if estimated:
+    st.caption(f"{estimated} calls had no usage metadata; their token counts are tiktoken estimates.")
+
+# Deal hashes are shown as startup names where the analysis is in the store
+names = {r["content_hash"]: r["startup_name"] for r in AnalysisStore().list(limit=10000)}
+
+tabs = st.tabs(["Per Component", "Per Deal", "Per Day", "Per Model"])
+for tab, by in zip(tabs, ["component", "deal", "day", "model"]):
+    with tab:
+        rows = ledger.aggregate(by, since=since)
+        if by == "deal":
+            for row in rows:
+                row["deal"] = names.get(row["deal"], row["deal"][:12] if row["deal"] else "(no deal)")
+        if by == "day":
+            rows.sort(key=lambda r: r["day"])
+        chart_rows = [{by: r[by], "prompt_tokens": r["prompt_tokens"], "completion_tokens": r["completion_tokens"]}
+                      for r in rows[:30]]
+        st.bar_chart(chart_rows, x=by, y=["prompt_tokens", "completion_tokens"], stack=True)
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+
+with st.expander("Recent Calls"):
+    st.dataframe(
+        [{**r, "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r["created_at"]))}
+         for r in ledger.recent(200)],
+        use_container_width=True, hide_index=True
+    )
@@ -1,12 +1,15 @@
 import asyncio
 import os
 import streamlit as st
-from pathlib import Path
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
-from mcp_use import MCPClient
 from my_random import get_random_user_display
+from src.context_builder import ContextBuilder
+from src.llm import get_llm
+from src.memory import ConversationMemory
+from src.trace_panel import render_trace_panel
+from src.tracing import span, start_trace
+from src.usage import usage_context
 
 # Load .env first
 load_dotenv()
@@ -46,11 +49,7 @@ except Exception as e:
 # ---------------------------------------------------------
 
 # Initialize Chat Model
-llm = ChatGroq(
-    model="openai/gpt-oss-20b",
-    temperature=0.3, # Slightly higher for conversational flow
-    groq_api_key=os.environ.get("GROQ_API_KEY")
-)
+llm = get_llm(temperature=0.3) # Slightly higher for conversational flow
 
 # Flexible Prompt for Chat mode
 chat_prompt = ChatPromptTemplate.from_messages([
@@ -86,120 +85,31 @@ chat_prompt = ChatPromptTemplate.from_messages([
     )
 ])
 
-# Initialize MCP Client
-# Initialize MCP Client with Dynamic Config
-# We use sys.executable to ensure the sub-processes use the same python environment (with installed deps)
-# We use absolute paths to ensure the scripts are found regardless of CWD
-import sys
-
-base_dir = Path(__file__).parent.parent.resolve() # Start from pages/, go up to root
-reddit_script = base_dir / "mcp_reddit" / "server.py"
-wiki_script = base_dir / "mcp_wiki" / "server.py"
-google_script = base_dir / "mcp_google" / "server.py"
-medium_script = base_dir / "mcp_medium" / "server.py"
-
-server_config = {
-    "mcpServers": {
-        "@echolab/mcp-reddit": {
-            "command": sys.executable,
-            "args": [str(reddit_script)]
-        },
-        "@echolab/mcp-wikipedia": {
-            "command": sys.executable,
-            "args": [str(wiki_script)]
-        },
-        "@echolab/mcp-google": {
-            "command": sys.executable,
-            "args": [str(google_script)]
-        },
-        "@echolab/mcp-medium": {
-            "command": sys.executable,
-            "args": [str(medium_script)]
-        }
-    }
-}
-
-# Use the dynamic config directly
-# Note: MCPClient might need an update if it doesn't support dict init directly, 
-# but usually from_config_file just reads json. 
-# Looking at standard implementations, we can likely pass the dict or write a temp file.
-# Assuming MCPClient has a constructor that accepts the config dict or we monkeypatch.
-# Let's check imports. from mcp_use import MCPClient.
-# If MCPClient doesn't accept a dict, we'll write a temp config.
-# Safest bet: Write a temp absoluted config file.
-
-import json
-temp_config_path = base_dir / "config_dynamic.json"
-with open(temp_config_path, "w") as f:
-    json.dump(server_config, f, indent=2)
-
-client = MCPClient.from_config_file(str(temp_config_path))
+@st.cache_resource
+def get_research_tools():
+    """
+    One set of MCP server sessions for every browser session, on its own
+    event loop (config lives in src.mcp_tools). Built on the first search,
+    so opening the page doesn't import mcp_use.
+    """
+    from src.mcp_tools import ThreadedResearchTools
+    return ThreadedResearchTools()
 
 async def run_searches(query: str):
     """
     Runs live searches using MCP tools. Returns a dictionary of results.
     """
-    # Ensure session exists
-    if "mcp_sessions" not in st.session_state:
-        st.session_state.mcp_sessions = await client.create_all_sessions()
-
-    sessions = st.session_state.mcp_sessions
-
-    def fail(name, e):
-        return f"[{name} MCP Error: {str(e)}]"
+    return await get_research_tools().search(query)
 
-    # 1. Reddit (Community Sentiment) - Limit 1 to save tokens
-    try:
-        reddit = await sessions["@echolab/mcp-reddit"].call_tool(
-            "fetch_reddit_posts_with_comments", 
-            {"subreddit": "startups", "limit": 1} 
-        )
-    except Exception as e:
-        reddit = fail("Reddit", e)
 
-    # 2. Wikipedia (Definitions/Background)
-    try:
-        wiki = await sessions["@echolab/mcp-wikipedia"].call_tool(
-            "search", {"query": query}
-        )
-    except Exception as e:
-        wiki = fail("Wikipedia", e)
+context_builder = ContextBuilder(token_budget=1500)
 
-    # 3. Google (News & Competitors)
-    try:
-        google = await sessions["@echolab/mcp-google"].call_tool(
-            "google_search", {"query": query}
-        )
-    except Exception as e:
-        google = fail("Google", e)
-
-    # 4. Medium (Thought Leadership)
-    try:
-        medium = await sessions["@echolab/mcp-medium"].call_tool(
-            "search_medium", {"query": query}
-        )
-    except Exception as e:
-        medium = fail("Medium", e)
-
-    return {"reddit": reddit, "wiki": wiki, "google": google, "medium": medium}
-
-
-def build_context_string(results: dict) -> str:
+def build_context_string(results: dict, query: str) -> str:
     """
-    Formats the search results into a context string, truncating to avoid token overflow.
-    """
-    def truncate(content, limit=2000):
-        s = str(content)
-        return s[:limit] + "... [TRUNCATED]" if len(s) > limit else s
-
-    return f"""
-    --- SEARCH RESULTS ---
-    [Reddit]: {truncate(results.get("reddit"))}
-    [Wikipedia]: {truncate(results.get("wiki"))}
-    [Google]: {truncate(results.get("google"))}
-    [Medium]: {truncate(results.get("medium"))}
-    ----------------------
+    Formats the search results into a context string: parsed, deduplicated,
+    ranked against the query and packed into a fixed token budget.
     """
+    return context_builder.build(results, query)
 
 async def main():
     st.set_page_config(page_title="HatchUp Chat", page_icon="💬")
@@ -211,6 +121,11 @@ async def main():
             {"role": "assistant", "content": "Hello! I'm your research assistant. Ask me about a market, startup, or trend, and I'll find live data for you."}
         ]
 
+    # Rolling memory: summary of older turns + recent turns verbatim
+    if "chat_memory" not in st.session_state:
+        st.session_state.chat_memory = ConversationMemory(llm)
+    memory = st.session_state.chat_memory
+
     # Display History
     for msg in st.session_state.chat_messages:
         with st.chat_message(msg["role"]):
@@ -229,33 +144,39 @@ async def main():
             message_placeholder.markdown("🔎 *Researching live sources...*")
             
             try:
-                # A. Run Research (Always run to capture context if needed)
-                # If query is short greeting, we might skip, but LLM handles it best.
-                results = await run_searches(prompt)
-                context_str = build_context_string(results)
-                
-                # B. Prepare Prompt
-                history_text = "\n".join([f"{m['role'].upper()}: {m['content']}" for m in st.session_state.chat_messages[-5:]]) # Last 5 turns
-                
-                messages = chat_prompt.format_messages(
-                    context=context_str,
-                    history=history_text,
-                    question=prompt
-                )
-                
-                # C. Generate Answer
-                full_response = llm.invoke(messages).content
-                
-                # D. Display Final Answer
-                message_placeholder.markdown(full_response)
-                st.session_state.chat_messages.append({"role": "assistant", "content": full_response})
-                
+                with start_trace("chat.question", question=prompt[:200]) as trace, usage_context(component="chat"):
+                    st.session_state.trace_id = trace.trace_id
+
+                    # A. Run Research (Always run to capture context if needed)
+                    # If query is short greeting, we might skip, but LLM handles it best.
+                    async with span("chat.run_searches"):
+                        results = await run_searches(prompt)
+                    with span("chat.build_context"):
+                        context_str = build_context_string(results, prompt)
+
+                    # B. Prepare Prompt
+                    history_text = memory.render(st.session_state.chat_messages[:-1])
+
+                    messages = chat_prompt.format_messages(
+                        context=context_str,
+                        history=history_text,
+                        question=prompt
+                    )
+
+                    # C. Generate Answer
+                    full_response = llm.invoke(messages).content
+
+                    # D. Display Final Answer
+                    message_placeholder.markdown(full_response)
+                    st.session_state.chat_messages.append({"role": "assistant", "content": full_response})
+                    with span("chat.memory_update"):
+                        memory.update(st.session_state.chat_messages)
+
             except Exception as e:
-                error_msg = f"⚠️ An error occurred: {str(e)}"
-                message_placeholder.error(error_msg)
-                # Don't append error to history to avoid pollution, or append as system note?
-                # We'll validly append it so user knows.
-                st.session_state.chat_messages.append({"role": "assistant", "content": error_msg})
+                # Shown, but kept out of the history so it never reaches the memory summary
+                message_placeholder.error(f"⚠️ An error occurred: {str(e)}")
+
+    render_trace_panel()
 
 if __name__ == "__main__":
     asyncio.run(main())
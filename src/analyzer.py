@@ -1,17 +1,16 @@
-from typing import Optional
-from langchain_groq import ChatGroq
+from typing import List, Optional
+from pydantic import create_model
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from src.models import PitchDeckData
+from src.llm import get_llm
+from src.tracing import span
+from src.usage import usage_context
 import os
 
 class PitchDeckAnalyzer:
-    def __init__(self, api_key: str, model_name: str = "openai/gpt-oss-20b"):
-        self.llm = ChatGroq(
-            temperature=0,
-            model_name=model_name,
-            groq_api_key=api_key
-        )
+    def __init__(self, api_key: str, model_name: Optional[str] = None):
+        self.llm = get_llm(temperature=0, model_name=model_name, api_key=api_key)
 
     def analyze_pitch_deck(self, deck_text: str) -> PitchDeckData:
         """
@@ -36,12 +35,51 @@ Output must be valid JSON matching the schema provided."""
         chain = prompt | self.llm | parser
         
         try:
-            result = chain.invoke({
-                "text": deck_text,
-                "format_instructions": parser.get_format_instructions()
-            })
+            with span("chain.analyze_pitch_deck", input_chars=len(deck_text)), usage_context(component="analyzer"):
+                result = chain.invoke({
+                    "text": deck_text,
+                    "format_instructions": parser.get_format_instructions()
+                })
             return result
         except Exception as e:
             # Fallback or error handling
             print(f"Error extracting data: {e}")
             raise e
+
+    def update_fields(self, previous: PitchDeckData, fields: List[str], changed_slides: str) -> PitchDeckData:
+        """
+        Re-extracts only the given fields of a new deck version from its
+        changed slides, keeping every other field of the previous version.
+        """
+        if not fields:
+            return previous
+        # A schema with just the fields being re-extracted, so the model only writes those
+        partial_model = create_model(
+            "PitchDeckUpdate",
+            **{name: (PitchDeckData.model_fields[name].annotation, PitchDeckData.model_fields[name]) for name in fields}
+        )
+        parser = PydanticOutputParser(pydantic_object=partial_model)
+
+        system_prompt = """You are a cynical, analytical, and highly structured Junior VC Analyst.
+A founder sent a new version of a pitch deck you already analyzed. You get the previous
+values of some fields and the slides that changed (added, edited or removed).
+Update each field to reflect the new version: keep what still holds, change what the
+changed slides contradict or add, drop what only removed slides supported.
+For list fields, keep items that are still valid and add new ones.
+
+Output must be valid JSON matching the schema provided."""
+
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", system_prompt),
+            ("user", "Previous values:\n{previous}\n\nChanged slides:\n\n{slides}\n\n{format_instructions}")
+        ])
+
+        chain = prompt | self.llm | parser
+
+        with span("chain.update_fields", fields=",".join(fields)), usage_context(component="analyzer"):
+            update = chain.invoke({
+                "previous": previous.model_dump_json(include=set(fields)),
+                "slides": changed_slides,
+                "format_instructions": parser.get_format_instructions()
+            })
+        return previous.model_copy(update=update.model_dump())
@@ -0,0 +1,370 @@
+"""
+Local HTTP API for CRM / Slack integrations: python -m src.api
+
+    POST /analyses                  multipart deck upload (field "file", optional "force") -> job
+    GET  /analyses                  saved analyses (?name=&limit=)
+    GET  /analyses/{hash}           extracted data, memo and summary as JSON
+    GET  /analyses/{hash}/memo      the stored memo as plain text
+    GET  /analyses/{hash}/export/{xlsx|pdf|txt}
+    GET  /jobs/{id}                 job status
+    GET  /jobs/{id}/events          NDJSON stream of stage changes until the job finishes
+    GET  /jobs/{id}/memo            waits for the job, then returns its stored memo text
+    POST /research                  {"question", "content_hash"?, "live"?} -> streamed answer
+    GET  /health
+
+Analyses run on a bounded pool (HATCHUP_API_WORKERS) behind a bounded queue
+(HATCHUP_API_QUEUE); a full queue answers 429. The pipeline's LLM clients
+and the MCP sessions are created once and shared by all requests.
+Set HATCHUP_LLM_BACKEND=fake to run without an API key.
+"""
+import asyncio
+import io
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from src.context_builder import ContextBuilder
+from src.exporter import export_cache
+from src.llm import default_model, get_llm
+from src.pipeline import AnalysisPipeline
+from src.research import RESEARCH_PROMPT, build_context
+from src.store import AnalysisStore, content_hash
+
+load_dotenv()
+
+MAX_UPLOAD_BYTES = int(os.getenv("HATCHUP_API_MAX_UPLOAD_MB", "50")) * 1024 * 1024
+DECK_EXTENSIONS = (".pdf", ".pptx", ".ppt", ".png", ".jpg", ".jpeg")
+
+
+@dataclass
+class Job:
+    id: str
+    filename: str
+    status: str = "queued"
+    stage: Optional[str] = None
+    content_hash: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = 0.0
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+
+class AnalysisService:
+    """
+    Bounded in-process job queue in front of a shared AnalysisPipeline.
+    """
+
+    def __init__(self, workers: int = 4, queue_size: int = 32, max_jobs: int = 1000):
+        self.store = AnalysisStore()
+        self.pipeline = AnalysisPipeline(
+            api_key=os.environ.get("GROQ_API_KEY", ""),
+            model_name=default_model(),
+            store=self.store,
+        )
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.max_jobs = max_jobs
+        self._tasks = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _track(self, job: Job) -> Job:
+        self.jobs[job.id] = job
+        # Only finished jobs are forgotten; their results stay in the store
+        while len(self.jobs) > self.max_jobs:
+            oldest = next(iter(self.jobs.values()))
+            if not oldest.finished:
+                break
+            self.jobs.popitem(last=False)
+        return job
+
+    def submit(self, payload: bytes, filename: str, force: bool = False) -> Job:
+        """
+        Queues a deck. Raises asyncio.QueueFull when the queue is at capacity.
+        """
+        job = Job(id=uuid.uuid4().hex, filename=filename, content_hash=content_hash(payload), created_at=time.time())
+        if not force and job.content_hash in self.store:
+            job.status, job.finished_at = "done", job.created_at
+            return self._track(job)
+        self.queue.put_nowait((job, payload, force))
+        return self._track(job)
+
+    async def _worker(self) -> None:
+        while True:
+            job, payload, force = await self.queue.get()
+            job.status = "running"
+            uploaded = io.BytesIO(payload)
+            uploaded.name = job.filename
+
+            def on_stage(stage, job=job):
+                job.stage = stage
+
+            try:
+                await asyncio.to_thread(self.pipeline.run, uploaded, on_stage, force)
+                job.status = "done"
+            except Exception as e:
+                print(f"Error analyzing {job.filename}: {e}")
+                job.status, job.error = "failed", str(e)
+            finally:
+                job.finished_at = time.time()
+                self.queue.task_done()
+
+    async def wait(self, job: Job, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while not job.finished and time.monotonic() < deadline:
+            await asyncio.sleep(0.25)
+        return job.finished
+
+
+# --- Helpers ---
+
+def error(message: str, status: int) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status)
+
+
+def job_json(job: Job) -> Dict[str, Any]:
+    return asdict(job)
+
+
+def load_result(request: Request, digest: str) -> Optional[Dict[str, Any]]:
+    return request.app.state.service.store.get(digest)
+
+
+async def memo_response(result: Dict[str, Any]) -> Response:
+    """
+    The memo of a finished analysis as plain text. The memo is generated by
+    the pipeline before it is stored, so there is nothing left to stream;
+    clients that want progress follow /jobs/{id}/events.
+    """
+    text = await asyncio.to_thread(export_cache.text_memo, result["memo"], result["data"].startup_name)
+    return Response(text, media_type="text/plain; charset=utf-8")
+
+
+# --- Endpoints ---
+
+async def health(request: Request) -> JSONResponse:
+    service: AnalysisService = request.app.state.service
+    return JSONResponse({
+        "status": "ok",
+        "workers": service.workers,
+        "queued": service.queue.qsize(),
+        "running": sum(job.status == "running" for job in service.jobs.values()),
+        "stored_analyses": len(service.store),
+    })
+
+
+async def submit_analysis(request: Request) -> JSONResponse:
+    service: AnalysisService = request.app.state.service
+    form = await request.form(max_files=1, max_part_size=MAX_UPLOAD_BYTES)
+    upload = form.get("file")
+    if upload is None or not hasattr(upload, "read"):
+        return error("Expected a multipart file field named 'file'", 400)
+    if not upload.filename.lower().endswith(DECK_EXTENSIONS):
+        return error(f"Unsupported file format: {upload.filename}", 415)
+    payload = await upload.read()
+    force = str(form.get("force", "")).lower() in ("1", "true", "yes")
+    try:
+        job = service.submit(payload, upload.filename, force=force)
+    except asyncio.QueueFull:
+        return error("Analysis queue is full, retry later", 429)
+    return JSONResponse(job_json(job), status_code=200 if job.finished else 202)
+
+
+async def list_analyses(request: Request) -> JSONResponse:
+    service: AnalysisService = request.app.state.service
+    try:
+        limit = min(int(request.query_params.get("limit", 50)), 500)
+    except ValueError:
+        return error("'limit' must be an integer", 400)
+    return JSONResponse(service.store.list(name=request.query_params.get("name"), limit=limit))
+
+
+async def get_analysis(request: Request) -> JSONResponse:
+    result = load_result(request, request.path_params["digest"])
+    if result is None:
+        return error("Analysis not found", 404)
+    return JSONResponse({
+        "content_hash": result["content_hash"],
+        "filename": result.get("filename"),
+        "data": result["data"].model_dump(),
+        "memo": result["memo"].model_dump(),
+        "summary": result["summary"].model_dump(),
+        "timings": result.get("timings", {}),
+    })
+
+
+async def analysis_memo(request: Request) -> Response:
+    result = load_result(request, request.path_params["digest"])
+    if result is None:
+        return error("Analysis not found", 404)
+    return await memo_response(result)
+
+
+EXPORTS = {
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+             lambda r: export_cache.excel(r["data"])),
+    "pdf": ("application/pdf", lambda r: export_cache.pdf_memo(r["memo"], r["data"].startup_name)),
+    "txt": ("text/plain; charset=utf-8", lambda r: export_cache.text_memo(r["memo"], r["data"].startup_name)),
+}
+
+
+async def analysis_export(request: Request) -> Response:
+    fmt = request.path_params["fmt"]
+    if fmt not in EXPORTS:
+        return error(f"Unknown export format: {fmt}", 404)
+    result = load_result(request, request.path_params["digest"])
+    if result is None:
+        return error("Analysis not found", 404)
+    media_type, render = EXPORTS[fmt]
+    body = await asyncio.to_thread(render, result)
+    filename = f"{result['data'].startup_name}.{fmt}".replace('"', "")
+    return Response(body, media_type=media_type,
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+def get_job(request: Request) -> Optional[Job]:
+    return request.app.state.service.jobs.get(request.path_params["job_id"])
+
+
+async def job_status(request: Request) -> JSONResponse:
+    job = get_job(request)
+    return JSONResponse(job_json(job)) if job else error("Job not found", 404)
+
+
+async def job_events(request: Request) -> Response:
+    job = get_job(request)
+    if job is None:
+        return error("Job not found", 404)
+
+    async def events():
+        last = None
+        while True:
+            state = (job.status, job.stage)
+            if state != last:
+                last = state
+                yield json.dumps({"status": job.status, "stage": job.stage, "error": job.error, "at": time.time()}) + "\n"
+            if job.finished:
+                return
+            await asyncio.sleep(0.25)
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+async def job_memo(request: Request) -> Response:
+    service: AnalysisService = request.app.state.service
+    job = get_job(request)
+    if job is None:
+        return error("Job not found", 404)
+    try:
+        timeout = float(request.query_params.get("timeout", 600))
+    except ValueError:
+        return error("'timeout' must be a number of seconds", 400)
+    if not await service.wait(job, timeout):
+        return error("Job still running", 504)
+    if job.status == "failed":
+        return error(job.error or "Analysis failed", 500)
+    return await memo_response(service.store.get(job.content_hash))
+
+
+async def research(request: Request) -> Response:
+    """
+    Answers a question about a saved analysis and/or live sources, streaming tokens as they arrive.
+    """
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        return error("Request body must be valid JSON", 400)
+    if not isinstance(body, dict):
+        return error("Request body must be a JSON object", 400)
+    question = (body.get("question") or "").strip()
+    if not question:
+        return error("'question' is required", 400)
+
+    parts = []
+    if body.get("content_hash"):
+        result = load_result(request, body["content_hash"])
+        if result is None:
+            return error("Analysis not found", 404)
+        parts.append(build_context(result["data"], result["memo"], result.get("deck_index"), question))
+    if body.get("live"):
+        results = await request.app.state.research_tools.search(question)
+        parts.append("[Context from Live Tools]\n" + request.app.state.context_builder.build(results, question))
+
+    messages = RESEARCH_PROMPT.format_messages(
+        context="\n\n".join(parts) or "(none)",
+        history=body.get("history") or "(none)",
+        question=question,
+    )
+    llm = get_llm(temperature=0.5)
+    limiter: asyncio.Semaphore = request.app.state.research_limiter
+
+    async def tokens():
+        async with limiter:
+            usage = {"component": "research", "deal": body.get("content_hash")}
+            async for chunk in llm.astream(messages, config={"metadata": usage}):
+                if chunk.content:
+                    yield chunk.content
+
+    return StreamingResponse(tokens(), media_type="text/plain; charset=utf-8")
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    app.state.service = AnalysisService(
+        workers=int(os.getenv("HATCHUP_API_WORKERS", "4")),
+        queue_size=int(os.getenv("HATCHUP_API_QUEUE", "32")),
+    )
+    app.state.service.start()
+    app.state.research_limiter = asyncio.Semaphore(int(os.getenv("HATCHUP_API_RESEARCH_CONCURRENCY", "4")))
+    app.state.context_builder = ContextBuilder(token_budget=1500)
+    # MCP server processes start with the first live research request, then stay up
+    from src.mcp_tools import ResearchTools
+    app.state.research_tools = ResearchTools()
+    try:
+        yield
+    finally:
+        await app.state.service.stop()
+        await app.state.research_tools.close()
+
+
+routes = [
+    Route("/health", health),
+    Route("/analyses", submit_analysis, methods=["POST"]),
+    Route("/analyses", list_analyses, methods=["GET"]),
+    Route("/analyses/{digest}", get_analysis),
+    Route("/analyses/{digest}/memo", analysis_memo),
+    Route("/analyses/{digest}/export/{fmt}", analysis_export),
+    Route("/jobs/{job_id}", job_status),
+    Route("/jobs/{job_id}/events", job_events),
+    Route("/jobs/{job_id}/memo", job_memo),
+    Route("/research", research, methods=["POST"]),
+]
+
+app = Starlette(routes=routes, lifespan=lifespan)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.getenv("HATCHUP_API_HOST", "127.0.0.1"), port=int(os.getenv("HATCHUP_API_PORT", "8000")))
@@ -0,0 +1,150 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.pipeline import AnalysisPipeline
+
+
+@dataclass
+class DeckJob:
+    name: str
+    path: Optional[str] = None
+    status: str = "queued"
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "error")
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        if self.started is None:
+            return None
+        return (self.finished or time.time()) - self.started
+
+    def row(self) -> Dict[str, Any]:
+        """
+        One line of the batch results table.
+        """
+        row = {"Deck": self.name, "Status": self.status, "Time (s)": round(self.elapsed or 0, 1),
+               "Startup": "", "Stage": "", "Outlook": "", "Confidence": None}
+        if self.result:
+            data, summary = self.result["data"], self.result["summary"]
+            row.update({
+                "Startup": data.startup_name,
+                "Stage": data.funding_ask_stage,
+                "Outlook": summary.decision_outlook,
+                "Confidence": summary.confidence_score,
+            })
+        if self.error:
+            row["Status"] = f"error: {self.error}"
+        return row
+
+
+class BatchProcessor:
+    """
+    Analyzes many decks on a bounded worker pool, tracking per-deck progress.
+    """
+
+    def __init__(self, pipeline: AnalysisPipeline, max_workers: int = 4, force: bool = False,
+                 on_done: Optional[Callable[[DeckJob], None]] = None):
+        self.pipeline = pipeline
+        self.max_workers = max_workers
+        self.force = force
+        self.on_done = on_done
+        self.jobs: List[DeckJob] = []
+        self._futures = []
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="deck-batch")
+        self._lock = threading.Lock()
+
+    def submit(self, files) -> List[DeckJob]:
+        """
+        Queues all files (uploaded files or paths) and returns immediately.
+        Paths are opened by the worker, so large backlogs aren't held in memory.
+        """
+        self.started = self.started or time.time()
+        new_jobs = []
+        for f in files:
+            if isinstance(f, (str, Path)):
+                job = DeckJob(name=Path(f).name, path=str(f))
+            else:
+                job = DeckJob(name=f.name)
+            new_jobs.append(job)
+            self._futures.append(self._executor.submit(self._run, job, f))
+        with self._lock:
+            self.jobs.extend(new_jobs)
+        return new_jobs
+
+    def _run(self, job: DeckJob, uploaded_file) -> None:
+        job.started = time.time()
+
+        def on_stage(name):
+            job.status = name
+
+        try:
+            if isinstance(uploaded_file, (str, Path)):
+                with open(uploaded_file, "rb") as f:
+                    job.result = self.pipeline.run(f, on_stage=on_stage, force=self.force)
+            else:
+                job.result = self.pipeline.run(uploaded_file, on_stage=on_stage, force=self.force)
+            job.status = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "error"
+        finally:
+            job.finished = time.time()
+            if self.all_done:
+                self.finished = job.finished
+        if self.on_done:
+            self.on_done(job)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every queued deck (including its on_done callback) has finished.
+        Returns False if the timeout expired first.
+        """
+        _, not_done = wait(list(self._futures), timeout=timeout)
+        return not not_done
+
+    def cancel(self) -> None:
+        """
+        Drops decks that haven't started; running ones finish.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def all_done(self) -> bool:
+        with self._lock:
+            return all(job.done for job in self.jobs)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            jobs = list(self.jobs)
+        return {
+            "total": len(jobs),
+            "done": sum(j.status == "done" for j in jobs),
+            "failed": sum(j.status == "error" for j in jobs),
+            "running": sum(not j.done and j.status != "queued" for j in jobs),
+        }
+
+    def throughput(self) -> float:
+        """
+        Completed decks per minute since the batch started.
+        """
+        if not self.started:
+            return 0.0
+        elapsed = (self.finished or time.time()) - self.started
+        completed = self.counts()["done"]
+        return completed / elapsed * 60 if elapsed > 0 else 0.0
+
+    def rows(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [job.row() for job in self.jobs]
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_CASSETTE_DIR = Path(__file__).parent.parent / "data" / "cassettes"
+
+
+class CassetteMiss(KeyError):
+    """
+    Raised in replay mode when a request was never recorded.
+    """
+
+
+@lru_cache(maxsize=None)
+def _dir_lock(path: str) -> threading.Lock:
+    return threading.Lock()
+
+
+class Cassette:
+    """
+    Recorded request/response pairs for one backend (e.g. "llm", "mcp"),
+    one JSON file per request under HATCHUP_CASSETTE_DIR/<name>/.
+
+    Requests are keyed by the SHA-256 of their canonical JSON, so the same
+    prompt or tool call always maps to the same file and replays exactly.
+    Files keep the request next to the response so they can be reviewed
+    and committed as fixtures.
+    """
+
+    def __init__(self, name: str, root: Optional[str] = None):
+        self.dir = Path(root or os.getenv("HATCHUP_CASSETTE_DIR", DEFAULT_CASSETTE_DIR)) / name
+        # Shared by every instance for the same directory, so concurrent writers really serialize
+        self._lock = _dir_lock(str(self.dir.resolve()))
+
+    @staticmethod
+    def key(request: Dict[str, Any]) -> str:
+        canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}.json"
+
+    def get(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        path = self._path(self.key(request))
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))["response"]
+
+    def replay(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.get(request)
+        if response is None:
+            raise CassetteMiss(f"No recording in {self.dir} for request {self.key(request)[:12]} "
+                               f"(record it first with the matching *_BACKEND=record)")
+        return response
+
+    def put(self, request: Dict[str, Any], response: Dict[str, Any]) -> None:
+        key = self.key(request)
+        with self._lock:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._path(key).with_suffix(".tmp")
+            tmp.write_text(json.dumps({"request": request, "response": response}, indent=1, ensure_ascii=False,
+                                      default=str), encoding="utf-8")
+            tmp.replace(self._path(key))
+
+    def __len__(self) -> int:
+        return len(list(self.dir.glob("*.json"))) if self.dir.exists() else 0
+
+
+@lru_cache(maxsize=None)
+def _cached_cassette(name: str, root: str) -> Cassette:
+    return Cassette(name, root)
+
+
+def get_cassette(name: str, root: Optional[str] = None) -> Cassette:
+    """
+    The process-wide cassette for a backend name and directory.
+    """
+    return _cached_cassette(name, str(root or os.getenv("HATCHUP_CASSETTE_DIR", DEFAULT_CASSETTE_DIR)))
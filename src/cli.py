@@ -0,0 +1,213 @@
+"""
+Headless batch analysis: python -m src.cli <dirs | globs | files> [options]
+
+Runs parse -> extract -> memo -> summary for every deck with bounded
+concurrency, streams one JSON line per deck, writes the Excel / PDF / text
+exports next to each other in the output directory and prints a
+throughput and latency summary at the end.
+
+Decks already in the analysis store (same content hash) are skipped, so an
+interrupted backfill can simply be run again.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from src.batch import BatchProcessor, DeckJob
+from src.exporter import Exporter
+from src.llm import default_model, missing_api_key
+from src.pipeline import AnalysisPipeline, STAGES
+from src.store import AnalysisStore, content_hash
+
+DECK_EXTENSIONS = (".pdf", ".pptx", ".ppt", ".png", ".jpg", ".jpeg")
+
+
+def collect_decks(inputs: List[str]) -> List[Path]:
+    """
+    Expands directories (recursively), globs and plain paths into a sorted, de-duplicated list of decks.
+    """
+    found = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            candidates = path.rglob("*")
+        elif path.is_file():
+            candidates = [path]
+        else:
+            candidates = (Path(p) for p in glob.glob(item, recursive=True))
+        for candidate in candidates:
+            if candidate.is_file() and candidate.suffix.lower() in DECK_EXTENSIONS:
+                found.add(candidate.resolve())
+    return sorted(found)
+
+
+def artifact_paths(out_dir: Path, result: Dict[str, Any]) -> Dict[str, Path]:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", result["data"].startup_name).strip("_")[:60] or "deck"
+    stem = f"{slug}_{result['content_hash'][:8]}"
+    return {
+        "excel": out_dir / f"{stem}.xlsx",
+        "pdf": out_dir / f"{stem}_memo.pdf",
+        "text": out_dir / f"{stem}_memo.txt",
+    }
+
+
+def write_artifacts(out_dir: Path, result: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Writes the deck's exports, skipping files that already exist.
+    """
+    data, memo = result["data"], result["memo"]
+    paths = artifact_paths(out_dir, result)
+    writers = {
+        "excel": lambda: Exporter.to_excel(data),
+        "pdf": lambda: Exporter.to_pdf_memo(memo, data.startup_name),
+        "text": lambda: Exporter.to_text_memo(memo, data.startup_name).encode("utf-8"),
+    }
+    for kind, path in paths.items():
+        if not path.exists():
+            path.write_bytes(writers[kind]())
+    return {kind: str(path) for kind, path in paths.items()}
+
+
+def record(path: Path, status: str, result: Optional[Dict[str, Any]] = None, seconds: Optional[float] = None,
+           artifacts: Optional[Dict[str, str]] = None, error: Optional[str] = None) -> Dict[str, Any]:
+    """
+    One JSONL line of output.
+    """
+    line = {"file": str(path), "status": status, "seconds": round(seconds, 2) if seconds is not None else None}
+    if result:
+        line.update({
+            "content_hash": result["content_hash"],
+            "startup_name": result["data"].startup_name,
+            "funding_ask_stage": result["data"].funding_ask_stage,
+            "decision_outlook": result["summary"].decision_outlook,
+            "confidence_score": result["summary"].confidence_score,
+            "red_flags": result["data"].red_flags,
+            "timings": {k: round(v, 2) for k, v in result.get("timings", {}).items()},
+        })
+    if artifacts:
+        line["artifacts"] = artifacts
+    if error:
+        line["error"] = error
+    return line
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def print_summary(batch: BatchProcessor, skipped: int, elapsed: float) -> None:
+    counts = batch.counts()
+    latencies = [job.elapsed for job in batch.jobs if job.status == "done"]
+    stage_times = {stage: [job.result["timings"][stage] for job in batch.jobs
+                           if job.result and stage in job.result.get("timings", {})] for stage in STAGES}
+
+    print("", file=sys.stderr)
+    print(f"Decks: {counts['total'] + skipped} | analyzed {counts['done']} | skipped {skipped} | "
+          f"failed {counts['failed']}", file=sys.stderr)
+    print(f"Wall time: {elapsed:.1f}s | throughput {counts['done'] / elapsed * 60 if elapsed else 0:.1f} decks/min",
+          file=sys.stderr)
+    if latencies:
+        print(f"Latency per deck: p50 {percentile(latencies, 50):.1f}s | p95 {percentile(latencies, 95):.1f}s | "
+              f"max {max(latencies):.1f}s", file=sys.stderr)
+        print("Mean stage time: " + " | ".join(
+            f"{stage} {sum(times) / len(times):.1f}s" for stage, times in stage_times.items() if times
+        ), file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyze a directory or glob of pitch decks without the UI.")
+    parser.add_argument("inputs", nargs="+", help="Deck files, directories or glob patterns")
+    parser.add_argument("-o", "--out-dir", default="output", help="Where to write Excel / PDF / text exports")
+    parser.add_argument("--jsonl", help="Append results to this file instead of stdout")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Decks analyzed in parallel")
+    parser.add_argument("--model", default=default_model())
+    parser.add_argument("--force", action="store_true", help="Re-analyze decks that are already in the store")
+    parser.add_argument("--no-artifacts", action="store_true", help="Only emit JSONL")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    if missing_api_key():
+        print("GROQ_API_KEY not found. Please check your .env file.", file=sys.stderr)
+        return 2
+
+    decks = collect_decks(args.inputs)
+    if not decks:
+        print("No decks found.", file=sys.stderr)
+        return 1
+
+    out_dir = Path(args.out_dir)
+    if not args.no_artifacts:
+        out_dir.mkdir(parents=True, exist_ok=True)
+    output = open(args.jsonl, "a", encoding="utf-8") if args.jsonl else sys.stdout
+    output_lock = threading.Lock()
+
+    def emit(line: Dict[str, Any]) -> None:
+        with output_lock:
+            output.write(json.dumps(line) + "\n")
+            output.flush()
+
+    store = AnalysisStore()
+    started = time.perf_counter()
+
+    # Resume: decks already in the store only get their (cheap) exports refreshed
+    pending, skipped = [], 0
+    for path in decks:
+        digest = content_hash(path.read_bytes())
+        result = None if args.force else store.get(digest)
+        if result is None:
+            pending.append(path)
+            continue
+        skipped += 1
+        artifacts = None if args.no_artifacts else write_artifacts(out_dir, result)
+        emit(record(path, "skipped", result, artifacts=artifacts))
+
+    def on_done(job: DeckJob) -> None:
+        path = Path(job.path)
+        if job.result is None:
+            emit(record(path, "error", seconds=job.elapsed, error=job.error))
+            print(f"[failed] {path.name}: {job.error.splitlines()[0] if job.error else ''}", file=sys.stderr)
+            return
+        try:
+            artifacts = None if args.no_artifacts else write_artifacts(out_dir, job.result)
+        except Exception as e:
+            artifacts = None
+            print(f"Error writing exports for {path}: {e}", file=sys.stderr)
+        emit(record(path, "done", job.result, seconds=job.elapsed, artifacts=artifacts))
+        print(f"[done] {path.name} ({job.elapsed:.1f}s)", file=sys.stderr)
+
+    # Models come from get_llm, so HATCHUP_LLM_BACKEND=fake / replay runs without a key
+    pipeline = AnalysisPipeline(api_key=os.environ.get("GROQ_API_KEY", ""), model_name=args.model, store=store)
+    batch = BatchProcessor(pipeline, max_workers=args.workers, force=args.force, on_done=on_done)
+    print(f"Analyzing {len(pending)} decks ({skipped} already done) with {args.workers} workers...", file=sys.stderr)
+    batch.submit(pending)
+
+    try:
+        while not batch.wait(timeout=0.5):
+            pass
+    except KeyboardInterrupt:
+        batch.cancel()
+        print("Interrupted; finished decks are saved and will be skipped next run.", file=sys.stderr)
+        return 130
+    finally:
+        print_summary(batch, skipped, time.perf_counter() - started)
+        if output is not sys.stdout:
+            output.close()
+
+    return 1 if batch.counts()["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from src.ranking import BM25Index, tokenize
+from src.tokens import count_tokens
+
+SOURCE_LABELS = {
+    "reddit": "Reddit",
+    "wiki": "Wikipedia",
+    "google": "Google",
+    "medium": "Medium",
+}
+
+# Dropped by exact name; utm_* by prefix
+_TRACKING_PARAMS = frozenset({"source", "ref", "fbclid", "gclid"})
+_TRACKING_PREFIX = "utm_"
+
+
+@dataclass
+class Snippet:
+    source: str
+    title: str
+    text: str
+    url: str = ""
+    parent: str = ""
+    score: float = 0.0
+
+    def render(self) -> str:
+        label = SOURCE_LABELS.get(self.source, self.source.title())
+        title = f"Re: {self.parent}" if self.parent else self.title
+        line = f"[{label}] {title}"
+        if self.text:
+            line += f" - {self.text}"
+        if self.url:
+            line += f" ({self.url})"
+        return line
+
+
+def normalize_url(url: str) -> str:
+    """
+    Reduces a URL to a canonical key: no scheme, www, fragment, tracking params or trailing slash.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [(k, v) for k, v in parse_qsl(parts.query)
+             if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith(_TRACKING_PREFIX)]
+    key = host + parts.path.rstrip("/")
+    if query:
+        key += "?" + urlencode(sorted(query))
+    return key.lower()
+
+
+def _shingles(text: str, size: int = 3) -> set:
+    terms = tokenize(text)
+    if len(terms) < size:
+        return {" ".join(terms)} if terms else set()
+    return {" ".join(terms[i:i + size]) for i in range(len(terms) - size + 1)}
+
+
+class ContextBuilder:
+    """
+    Turns raw MCP search results into a compact, query-ranked context block.
+
+    Results are parsed into uniform Snippet records, near-duplicates (same
+    canonical URL or overlapping text) are dropped, the rest are ranked
+    against the query with BM25, and the best snippets are packed into a
+    token budget.
+    """
+
+    def __init__(self, token_budget: int = 1500, max_snippet_chars: int = 600,
+                 similarity_threshold: float = 0.8):
+        self.token_budget = token_budget
+        self.max_snippet_chars = max_snippet_chars
+        self.similarity_threshold = similarity_threshold
+
+    # --- Parsing ---
+
+    @staticmethod
+    def _payload(result: Any) -> List[Any]:
+        """
+        Unwraps a tool result (CallToolResult, JSON string, dict or list) into plain Python objects.
+        Error results and unparseable text are skipped.
+        """
+        if result is None or getattr(result, "isError", False):
+            return []
+
+        if hasattr(result, "structuredContent") and result.structuredContent:
+            structured = result.structuredContent
+            return [structured.get("result", structured)]
+
+        if hasattr(result, "content"):
+            items = []
+            for block in result.content or []:
+                text = getattr(block, "text", None)
+                if text:
+                    items.extend(ContextBuilder._payload(text))
+            return items
+
+        if isinstance(result, str):
+            try:
+                return [json.loads(result)]
+            except ValueError:
+                # "[Reddit MCP Error: ...]" strings and other free text carry no usable facts
+                return []
+
+        return [result]
+
+    @staticmethod
+    def _flatten(payload: List[Any]) -> List[Dict[str, Any]]:
+        records = []
+        for item in payload:
+            if isinstance(item, list):
+                records.extend(i for i in item if isinstance(i, dict))
+            elif isinstance(item, dict) and (item.get("posts") or "error" not in item):
+                records.append(item)
+        return records
+
+    def parse_results(self, results: Dict[str, Any]) -> List[Snippet]:
+        """
+        Converts the results of each live tool into Snippet records.
+        """
+        snippets: List[Snippet] = []
+        for source, raw in results.items():
+            for record in self._flatten(self._payload(raw)):
+                if source == "reddit":
+                    snippets.extend(self._reddit_snippets(record))
+                else:
+                    snippet = self._generic_snippet(source, record)
+                    if snippet:
+                        snippets.append(snippet)
+        return snippets
+
+    def _clip(self, text: str) -> str:
+        text = re.sub(r"\s+", " ", text or "").strip()
+        if len(text) > self.max_snippet_chars:
+            text = text[:self.max_snippet_chars].rsplit(" ", 1)[0] + "..."
+        return text
+
+    def _generic_snippet(self, source: str, record: Dict[str, Any]) -> Optional[Snippet]:
+        title = record.get("title") or ""
+        text = record.get("snippet") or record.get("summary") or record.get("text") or ""
+        url = record.get("link") or record.get("url") or ""
+        if not title and not text:
+            return None
+        return Snippet(source=source, title=self._clip(title), text=self._clip(text), url=url)
+
+    def _reddit_snippets(self, record: Dict[str, Any]) -> List[Snippet]:
+        posts = record.get("posts") if "posts" in record else [record]
+        snippets = []
+        for post in posts or []:
+            title = self._clip(post.get("title", ""))
+            url = post.get("url", "")
+            body = post.get("selftext") or post.get("body") or ""
+            snippets.append(Snippet(source="reddit", title=title, text=self._clip(body), url=url))
+            for comment in post.get("comments", []):
+                body = comment.get("body", "")
+                if body:
+                    # Comments are ranked on their own text; the post title is only shown for context
+                    snippets.append(Snippet(source="reddit", title="", text=self._clip(body), parent=title))
+        return snippets
+
+    # --- Deduplication & Ranking ---
+
+    def deduplicate(self, snippets: List[Snippet]) -> List[Snippet]:
+        """
+        Drops snippets whose canonical URL was already seen or whose text
+        overlaps an earlier snippet above the similarity threshold.
+        """
+        seen_urls = set()
+        kept: List[Snippet] = []
+        kept_shingles: List[set] = []
+        for snippet in snippets:
+            url_key = normalize_url(snippet.url)
+            if url_key and url_key in seen_urls:
+                continue
+
+            shingles = _shingles(f"{snippet.title} {snippet.text}")
+            if shingles and any(
+                len(shingles & other) / len(shingles | other) >= self.similarity_threshold
+                for other in kept_shingles
+            ):
+                continue
+
+            if url_key:
+                seen_urls.add(url_key)
+            kept.append(snippet)
+            kept_shingles.append(shingles)
+        return kept
+
+    def rank(self, snippets: List[Snippet], query: str) -> List[Snippet]:
+        """
+        Scores snippets against the query with BM25 and returns the relevant ones, best first.
+        """
+        if not snippets:
+            return []
+        index = BM25Index([tokenize(f"{s.title} {s.text}") for s in snippets])
+        scores = index.get_scores(tokenize(query))
+        for snippet, score in zip(snippets, scores):
+            snippet.score = float(score)
+        ranked = sorted(snippets, key=lambda s: s.score, reverse=True)
+        return [s for s in ranked if s.score > 0]
+
+    # --- Assembly ---
+
+    def select(self, results: Dict[str, Any], query: str) -> List[Snippet]:
+        """
+        Returns the ranked snippets that fit into the token budget.
+        """
+        ranked = self.rank(self.deduplicate(self.parse_results(results)), query)
+        selected, used = [], 0
+        for snippet in ranked:
+            cost = count_tokens(snippet.render())
+            if used + cost > self.token_budget:
+                continue
+            selected.append(snippet)
+            used += cost
+        return selected
+
+    def build(self, results: Dict[str, Any], query: str) -> str:
+        """
+        Formats the selected snippets as the context block for the prompt.
+        """
+        selected = self.select(results, query)
+        if not selected:
+            return "--- SEARCH RESULTS ---\n(No relevant live results found.)\n----------------------"
+        lines = "\n".join(f"{i}. {s.render()}" for i, s in enumerate(selected, 1))
+        return f"--- SEARCH RESULTS ---\n{lines}\n----------------------"
@@ -0,0 +1,308 @@
+"""
+Columnar export of deal history: python -m src.deal_history [out_dir] [options]
+
+Flattens PitchDeckData and ExecutiveSummary of every stored analysis into
+one row per deal and writes them as a month-partitioned dataset:
+
+    out_dir/month=2025-01/part-<run>-00000.parquet
+    out_dir/month=2025-02/part-<run>-00000.parquet
+    ...
+
+Parquet (via pyarrow) keeps list fields as list<string> columns; without
+pyarrow it falls back to chunked CSV with list fields as JSON strings.
+Rows are written in chunks, so memory stays bounded by chunk_rows, and
+each run only adds new part files. With incremental=True only analyses
+saved since the previous run are exported.
+
+Load it back with load_deal_history(), which prunes by month before reading.
+"""
+import argparse
+import datetime
+import json
+import re
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+DEFAULT_HISTORY_DIR = Path(__file__).parent.parent / "data" / "deal_history"
+WATERMARK_FILE = "_watermark.json"
+
+TEXT_FIELDS = [
+    "problem", "solution", "product", "market_tam", "business_model",
+    "traction_metrics", "team", "competitive_landscape", "funding_ask_stage",
+]
+LIST_FIELDS = ["red_flags", "weak_signals", "missing_sections", "summary_bullet_points"]
+
+# (stage, pattern), checked in order so "pre-seed" wins over "seed"
+STAGE_PATTERNS = [
+    ("Pre-Seed", re.compile(r"pre[\s-]?seed", re.I)),
+    ("Seed", re.compile(r"\bseed\b", re.I)),
+    ("Series A", re.compile(r"series\s*a\b", re.I)),
+    ("Series B", re.compile(r"series\s*b\b", re.I)),
+    ("Series C+", re.compile(r"series\s*[c-h]\b", re.I)),
+    ("Bridge", re.compile(r"\bbridge\b", re.I)),
+    ("Grant", re.compile(r"\bgrant\b", re.I)),
+]
+
+
+def normalize_stage(text: str) -> str:
+    """
+    Buckets the free-text funding ask into a stage for grouping.
+    """
+    for stage, pattern in STAGE_PATTERNS:
+        if pattern.search(text or ""):
+            return stage
+    return "Unknown"
+
+
+def deal_record(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    One flat row for an analysis result (as returned by AnalysisStore.iter_results()).
+    """
+    data, summary = result["data"], result.get("summary")
+    created = datetime.datetime.fromtimestamp(result.get("created_at") or time.time(), datetime.timezone.utc)
+    record = {
+        "content_hash": result.get("content_hash"),
+        "startup_name": data.startup_name,
+        "filename": result.get("filename"),
+        "created_at": created,
+        "month": created.strftime("%Y-%m"),
+        "stage": normalize_stage(data.funding_ask_stage),
+        "decision_outlook": summary.decision_outlook if summary else None,
+        "confidence_score": summary.confidence_score if summary else None,
+        "market_alignment_reasoning": summary.market_alignment_reasoning if summary else None,
+    }
+    for field in TEXT_FIELDS:
+        record[field] = getattr(data, field)
+    lists = {
+        "red_flags": data.red_flags,
+        "weak_signals": data.weak_signals,
+        "missing_sections": data.missing_sections,
+        "summary_bullet_points": summary.summary_bullet_points if summary else [],
+    }
+    for field, items in lists.items():
+        record[field] = list(items or [])
+        record[f"{field}_count"] = len(record[field])
+    return record
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    fields = [
+        ("content_hash", pa.string()),
+        ("startup_name", pa.string()),
+        ("filename", pa.string()),
+        ("created_at", pa.timestamp("ms", tz="UTC")),
+        ("stage", pa.string()),
+        ("decision_outlook", pa.string()),
+        ("confidence_score", pa.int32()),
+        ("market_alignment_reasoning", pa.string()),
+    ]
+    fields += [(field, pa.string()) for field in TEXT_FIELDS]
+    for field in LIST_FIELDS:
+        fields += [(field, pa.list_(pa.string())), (f"{field}_count", pa.int32())]
+    return pa.schema(fields)
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class DealHistoryWriter:
+    """
+    Buffers deal rows and flushes them every chunk_rows as one part file per month.
+    """
+
+    def __init__(self, out_dir: Path, fmt: str = "parquet", chunk_rows: int = 10000):
+        self.out_dir = Path(out_dir)
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self.run_id = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        self.rows: List[Dict[str, Any]] = []
+        self.files: List[Path] = []
+        self.written = 0
+        self.max_created_at = 0.0
+        self._seq = 0
+        self._schema = _arrow_schema() if fmt == "parquet" else None
+
+    def add(self, result: Dict[str, Any]) -> None:
+        self.rows.append(deal_record(result))
+        self.max_created_at = max(self.max_created_at, result.get("created_at") or 0.0)
+        if len(self.rows) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        by_month: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for row in self.rows:
+            by_month[row.pop("month")].append(row)
+        for month, rows in sorted(by_month.items()):
+            partition = self.out_dir / f"month={month}"
+            partition.mkdir(parents=True, exist_ok=True)
+            path = partition / f"part-{self.run_id}-{self._seq:05d}.{'parquet' if self.fmt == 'parquet' else 'csv'}"
+            self._write(path, rows)
+            self.files.append(path)
+        self.written += len(self.rows)
+        self.rows = []
+        self._seq += 1
+
+    def _write(self, path: Path, rows: List[Dict[str, Any]]) -> None:
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            # Written to a temp name first so readers never see half a file
+            tmp = path.with_suffix(".tmp")
+            pq.write_table(pa.Table.from_pylist(rows, schema=self._schema), tmp, compression="zstd")
+            tmp.replace(path)
+            return
+
+        import pandas as pd
+
+        df = pd.DataFrame(rows)
+        for field in LIST_FIELDS:
+            df[field] = df[field].map(lambda items: json.dumps(items, ensure_ascii=False))
+        df["created_at"] = df["created_at"].map(lambda value: value.isoformat())
+        tmp = path.with_suffix(".tmp")
+        df.to_csv(tmp, index=False)
+        tmp.replace(path)
+
+
+def _read_watermark(out_dir: Path) -> float:
+    path = Path(out_dir) / WATERMARK_FILE
+    if not path.exists():
+        return 0.0
+    try:
+        return float(json.loads(path.read_text()).get("created_at", 0.0))
+    except (ValueError, OSError):
+        return 0.0
+
+
+def export_deal_history(results: Iterable[Dict[str, Any]], out_dir: Optional[Path] = None,
+                        fmt: Optional[str] = None, chunk_rows: int = 10000) -> Dict[str, Any]:
+    """
+    Writes results to a month-partitioned dataset in out_dir. fmt is
+    "parquet" or "csv"; by default Parquet when pyarrow is installed.
+    Returns a summary (format, rows written, files, newest created_at).
+    """
+    out_dir = Path(out_dir or DEFAULT_HISTORY_DIR)
+    fmt = fmt or ("parquet" if _has_pyarrow() else "csv")
+    if fmt not in ("parquet", "csv"):
+        raise ValueError(f"Unsupported format: {fmt}")
+    if fmt == "parquet" and not _has_pyarrow():
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow), or use fmt='csv'")
+
+    writer = DealHistoryWriter(out_dir, fmt, chunk_rows)
+    for result in results:
+        writer.add(result)
+    writer.flush()
+    return {"format": fmt, "rows": writer.written, "files": [str(p) for p in writer.files],
+            "max_created_at": writer.max_created_at}
+
+
+def export_store(store=None, out_dir: Optional[Path] = None, fmt: Optional[str] = None,
+                 incremental: bool = True, chunk_rows: int = 10000) -> Dict[str, Any]:
+    """
+    Exports the analysis store. With incremental=True only analyses saved
+    after the last export's watermark are appended.
+    """
+    from src.store import AnalysisStore
+
+    store = store if store is not None else AnalysisStore()
+    out_dir = Path(out_dir or DEFAULT_HISTORY_DIR)
+    since = _read_watermark(out_dir) if incremental else None
+    summary = export_deal_history(store.iter_results(since=since), out_dir, fmt, chunk_rows)
+    if summary["rows"]:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        watermark = max(summary["max_created_at"], since or 0.0)
+        (out_dir / WATERMARK_FILE).write_text(json.dumps({"created_at": watermark, "format": summary["format"]}))
+    return summary
+
+
+def load_deal_history(path: Optional[Path] = None, months: Optional[Sequence[str]] = None,
+                      columns: Optional[Sequence[str]] = None, dedupe: bool = True):
+    """
+    Reads a deal history dataset into a pandas DataFrame. months ("YYYY-MM")
+    prunes partitions before any file is opened, columns limits what is read.
+
+    A deck analysed again shows up in a later export too; dedupe keeps only
+    its newest row. List columns hold Python lists, so e.g.
+    df.explode("red_flags") gives one row per red flag.
+    """
+    import pandas as pd
+
+    path = Path(path or DEFAULT_HISTORY_DIR)
+    partitions = sorted(p for p in path.glob("month=*") if p.is_dir())
+    if months is not None:
+        wanted = set(months)
+        partitions = [p for p in partitions if p.name.split("=", 1)[1] in wanted]
+    if columns is not None:
+        # month comes from the partition directory, not the files
+        columns = [c for c in columns if c != "month"]
+        if dedupe:
+            columns = list(dict.fromkeys([*columns, "content_hash", "created_at"]))
+
+    frames = []
+    for partition in partitions:
+        month = partition.name.split("=", 1)[1]
+        for file in sorted(partition.glob("part-*.parquet")):
+            frames.append(pd.read_parquet(file, columns=columns).assign(month=month))
+        for file in sorted(partition.glob("part-*.csv")):
+            frames.append(_read_csv_part(file, columns).assign(month=month))
+    if not frames:
+        return pd.DataFrame(columns=list(columns or []) + ["month"])
+
+    df = pd.concat(frames, ignore_index=True)
+    df["month"] = df["month"].astype("category")
+    if dedupe and "content_hash" in df:
+        df = (df.sort_values("created_at")
+                .drop_duplicates("content_hash", keep="last")
+                .reset_index(drop=True))
+    return df
+
+
+def _read_csv_part(file: Path, columns: Optional[Sequence[str]]):
+    import pandas as pd
+
+    df = pd.read_csv(file, usecols=columns, keep_default_na=False, na_values=[""])
+    for field in LIST_FIELDS:
+        if field in df:
+            df[field] = df[field].map(lambda value: json.loads(value) if isinstance(value, str) else [])
+    if "created_at" in df:
+        df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
+    if "confidence_score" in df:
+        df["confidence_score"] = df["confidence_score"].astype("Int32")
+    return df
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export stored analyses as a month-partitioned deal history.")
+    parser.add_argument("out_dir", nargs="?", default=str(DEFAULT_HISTORY_DIR))
+    parser.add_argument("--format", choices=["parquet", "csv"], help="Default: parquet if pyarrow is installed")
+    parser.add_argument("--full", action="store_true", help="Export everything, ignoring the last watermark")
+    parser.add_argument("--chunk-rows", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    try:
+        summary = export_store(out_dir=Path(args.out_dir), fmt=args.format,
+                               incremental=not args.full, chunk_rows=args.chunk_rows)
+    except (ImportError, ValueError) as e:
+        print(f"Export failed: {e}")
+        return 1
+    print(f"Wrote {summary['rows']} deals as {summary['format']} to {args.out_dir} "
+          f"({len(summary['files'])} files)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
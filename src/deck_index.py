@@ -0,0 +1,73 @@
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+from src.ranking import BM25Index, tokenize
+from src.tokens import count_tokens
+
+
+@dataclass
+class DeckChunk:
+    page: int
+    text: str
+
+
+class DeckIndex:
+    """
+    Local retrieval index over the raw deck text.
+
+    The deck is chunked by page / slide (long pages are split on paragraph
+    boundaries) and scored with BM25. Only the chunks are persisted; the
+    term matrix is rebuilt on first search, which takes milliseconds for a deck.
+    """
+
+    def __init__(self, chunks: List[DeckChunk]):
+        self.chunks = chunks
+        self._bm25: Optional[BM25Index] = None
+
+    @classmethod
+    def from_pages(cls, pages: List[str], max_chunk_tokens: int = 300) -> "DeckIndex":
+        chunks = []
+        for number, page in enumerate(pages, 1):
+            if not page.strip():
+                continue
+            current, used = [], 0
+            for paragraph in page.split("\n"):
+                cost = count_tokens(paragraph)
+                if current and used + cost > max_chunk_tokens:
+                    chunks.append(DeckChunk(page=number, text="\n".join(current)))
+                    current, used = [], 0
+                current.append(paragraph)
+                used += cost
+            if current:
+                chunks.append(DeckChunk(page=number, text="\n".join(current)))
+        return cls(chunks)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def pages(self) -> Dict[int, str]:
+        """
+        The normalized text of each non-empty page, rebuilt from its chunks.
+        """
+        pages: Dict[int, List[str]] = {}
+        for chunk in self.chunks:
+            pages.setdefault(chunk.page, []).append(chunk.text)
+        return {number: "\n".join(parts) for number, parts in pages.items()}
+
+    def search(self, query: str, k: int = 4) -> List[DeckChunk]:
+        """
+        Returns the k chunks most relevant to the query, in deck order.
+        """
+        if not self.chunks:
+            return []
+        if self._bm25 is None:
+            self._bm25 = BM25Index([tokenize(c.text) for c in self.chunks])
+        hits = self._bm25.top_k(query, k)
+        return [self.chunks[i] for i in sorted(hits)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"chunks": [asdict(c) for c in self.chunks]}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "DeckIndex":
+        return cls([DeckChunk(**c) for c in payload.get("chunks", [])])
@@ -1,68 +1,114 @@
 import os
+import re
 from typing import List, Dict, Union
-import PyPDF2
-from pptx import Presentation
-from PIL import Image
-import pytesseract
 import io
 
+from src.tracing import span, traced
+
 class DocumentParser:
     """
     Handles extracting text from PDF, PPTX, and Image files.
+    Each format's library is imported only when a file of that type is parsed.
     """
-    
+
     @staticmethod
     def parse_file(uploaded_file) -> str:
         """
         Detects file type and delegates to the appropriate parser.
         Returns the extracted text as a single string.
         """
+        return DocumentParser.join_pages(DocumentParser.parse_pages(uploaded_file))
+
+    @staticmethod
+    def parse_pages(uploaded_file) -> List[str]:
+        """
+        Detects file type and delegates to the appropriate parser.
+        Returns the normalized text of each page / slide.
+        """
         filename = uploaded_file.name.lower()
-        
-        if filename.endswith(".pdf"):
-            return DocumentParser._parse_pdf(uploaded_file)
-        elif filename.endswith(".pptx") or filename.endswith(".ppt"):
-            return DocumentParser._parse_pptx(uploaded_file)
-        elif filename.endswith((".png", ".jpg", ".jpeg")):
-            return DocumentParser._parse_image(uploaded_file)
-        else:
-            raise ValueError(f"Unsupported file format: {filename}")
+
+        with span("parser.parse_pages", filename=uploaded_file.name) as s:
+            if filename.endswith(".pdf"):
+                pages = DocumentParser._parse_pdf(uploaded_file)
+            elif filename.endswith(".pptx") or filename.endswith(".ppt"):
+                pages = DocumentParser._parse_pptx(uploaded_file)
+            elif filename.endswith((".png", ".jpg", ".jpeg")):
+                pages = DocumentParser._parse_image(uploaded_file)
+            else:
+                raise ValueError(f"Unsupported file format: {filename}")
+            with span("parser.normalize_text"):
+                pages = [DocumentParser.normalize_text(p) for p in pages]
+            s.set(pages=len(pages), chars=sum(len(p) for p in pages))
+            return pages
 
     @staticmethod
-    def _parse_pdf(file) -> str:
-        text = ""
+    def is_parse_error(text: str) -> bool:
+        """
+        True for the placeholder page a parser returns when extraction failed.
+        """
+        return text.startswith("Error parsing ")
+
+    @staticmethod
+    def join_pages(pages: List[str]) -> str:
+        return "\n".join(p for p in pages if p) + "\n"
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """
+        Collapses extraction noise: repeated spaces/tabs, trailing whitespace
+        and runs of blank lines. Cuts prompt tokens without losing content.
+        """
+        text = re.sub(r"[ \t\u00a0]+", " ", text or "")
+        text = re.sub(r" *\n *", "\n", text)
+        text = re.sub(r"\n{3,}", "\n\n", text)
+        return text.strip()
+
+    @staticmethod
+    @traced("parser.pdf")
+    def _parse_pdf(file) -> List[str]:
+        import PyPDF2
+
+        pages = []
         try:
             reader = PyPDF2.PdfReader(file)
             for page in reader.pages:
                 page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+                pages.append(page_text or "")
         except Exception as e:
-            return f"Error parsing PDF: {str(e)}"
-        return text
+            return [f"Error parsing PDF: {str(e)}"]
+        return pages
 
     @staticmethod
-    def _parse_pptx(file) -> str:
-        text = ""
+    @traced("parser.pptx")
+    def _parse_pptx(file) -> List[str]:
+        from pptx import Presentation
+
+        pages = []
         try:
             prs = Presentation(file)
             for slide in prs.slides:
+                text = ""
                 for shape in slide.shapes:
                     if hasattr(shape, "text"):
                         text += shape.text + "\n"
+                pages.append(text)
         except Exception as e:
-            return f"Error parsing PPTX: {str(e)}"
-        return text
+            return [f"Error parsing PPTX: {str(e)}"]
+        return pages
 
     @staticmethod
-    def _parse_image(file) -> str:
+    @traced("parser.image")
+    def _parse_image(file) -> List[str]:
         """
         Uses Tesseract OCR to extract text from images.
         Requires Tesseract to be installed on the system.
         """
+        from PIL import Image
+        import pytesseract
+
         try:
             image = Image.open(file)
             text = pytesseract.image_to_string(image)
-            return text
+            return [text]
         except Exception as e:
-            return f"Error parsing Image (OCR): {str(e)}. Ensure Tesseract is installed."
+            return [f"Error parsing Image (OCR): {str(e)}. Ensure Tesseract is installed."]
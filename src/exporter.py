@@ -1,10 +1,33 @@
-import pandas as pd
-from fpdf import FPDF
 from src.models import PitchDeckData, InvestmentMemo
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Optional, Union
+import datetime
+import hashlib
 import io
+import os
+import threading
+
+from src.tracing import traced
+
+# Memo section titles and the InvestmentMemo fields they come from
+MEMO_SECTIONS = [
+    ("Company Overview", "company_overview"),
+    ("Problem & Solution Clarity", "problem_solution_clarity"),
+    ("Market Opportunity", "market_opportunity"),
+    ("Product Differentiation", "product_differentiation"),
+    ("Traction & Metrics", "traction_metrics_analysis"),
+    ("Team Assessment", "team_assessment"),
+    ("Risks & Concerns", "risks_concerns"),
+    ("Open Questions", "open_questions"),
+    ("Neutral Assessment", "neutral_assessment"),
+]
+
+# Excel's per-cell character limit
+MAX_CELL_CHARS = 32767
 
 class Exporter:
     @staticmethod
+    @traced("exporter.to_excel")
     def to_excel(data: PitchDeckData) -> bytes:
         """
         Converts extracted PitchDeckData to an Excel file bytes object.
@@ -45,6 +68,9 @@ class Exporter:
             flat_data["Field"].append(k)
             flat_data["Value"].append(", ".join(v) if v else "None")
 
+        # pandas / openpyxl / fpdf are imported on first export, not with the page
+        import pandas as pd
+
         df = pd.DataFrame(flat_data)
         
         output = io.BytesIO()
@@ -73,71 +99,24 @@ class Exporter:
         return text.encode('latin-1', 'replace').decode('latin-1')
 
     @staticmethod
+    @traced("exporter.to_pdf_memo")
     def to_pdf_memo(memo: InvestmentMemo, startup_name: str) -> bytes:
         """
-        Creates a PDF Investment Memo.
+        Creates a PDF Investment Memo (Unicode font when available, see src.pdf_renderer).
         """
-        pdf = FPDF()
-        pdf.add_page()
-        
-        # Title
-        # Sanitize name
-        safe_name = Exporter._sanitize_text(startup_name)
-        pdf.set_font("Arial", 'B', 16)
-        pdf.cell(0, 10, f"Investment Memo: {safe_name}", ln=True, align='C')
-        pdf.ln(10)
-        
-        # Sections
-        sections = [
-            ("Company Overview", memo.company_overview),
-            ("Problem & Solution Clarity", memo.problem_solution_clarity),
-            ("Market Opportunity", memo.market_opportunity),
-            ("Product Differentiation", memo.product_differentiation),
-            ("Traction & Metrics", memo.traction_metrics_analysis),
-            ("Team Assessment", memo.team_assessment),
-            ("Risks & Concerns", memo.risks_concerns),
-            ("Open Questions", memo.open_questions),
-            ("Neutral Assessment", memo.neutral_assessment)
-        ]
-        
-        for title, content in sections:
-            pdf.set_font("Arial", 'B', 12)
-            safe_title = Exporter._sanitize_text(title)
-            pdf.cell(0, 10, safe_title, ln=True)
-            
-            pdf.set_font("Arial", '', 11)
-            # Handle List vs String
-            if isinstance(content, list):
-                # Convert list to bullet points
-                formatted_content = "\n".join([f"- {item}" for item in content])
-            else:
-                formatted_content = content or ""
-                
-            # Sanitize content
-            safe_content = Exporter._sanitize_text(formatted_content)
-            pdf.multi_cell(0, 6, safe_content)
-            pdf.ln(5)
-            
-        return pdf.output(dest='S').encode('latin-1')
+        from src.pdf_renderer import default_renderer
+
+        return default_renderer().render(memo, startup_name)
 
     @staticmethod
+    @traced("exporter.to_text_memo")
     def to_text_memo(memo: InvestmentMemo, startup_name: str) -> str:
         """
         Creates a plain text Investment Memo.
         """
         lines = [f"Investment Memo: {startup_name}", "="*40, ""]
         
-        sections = [
-            ("Company Overview", memo.company_overview),
-            ("Problem & Solution Clarity", memo.problem_solution_clarity),
-            ("Market Opportunity", memo.market_opportunity),
-            ("Product Differentiation", memo.product_differentiation),
-            ("Traction & Metrics", memo.traction_metrics_analysis),
-            ("Team Assessment", memo.team_assessment),
-            ("Risks & Concerns", memo.risks_concerns),
-            ("Open Questions", memo.open_questions),
-            ("Neutral Assessment", memo.neutral_assessment)
-        ]
+        sections = [(title, getattr(memo, field)) for title, field in MEMO_SECTIONS]
         
         for title, content in sections:
             lines.append(f"## {title}")
@@ -151,3 +130,150 @@ class Exporter:
             lines.append("")
             
         return "\n".join(lines)
+
+    @staticmethod
+    @traced("exporter.to_portfolio_excel")
+    def to_portfolio_excel(results: Iterable[Dict[str, Any]], output: Optional[Union[str, BinaryIO]] = None) -> Optional[bytes]:
+        """
+        Streams many analyses into one workbook: a Deals sheet with one row per
+        deal plus Red Flags, Weak Signals, Missing Sections and Memo Sections
+        sheets with one row per item.
+
+        Uses an openpyxl write-only workbook, whose rows go straight to temp
+        files, so memory stays flat however many results the iterator yields
+        (e.g. AnalysisStore.iter_results()). Writes to output (path or binary
+        file) if given, otherwise returns the workbook bytes.
+        """
+        from openpyxl import Workbook
+        from openpyxl.styles import Font
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+        def cell(value: Any) -> Any:
+            # Lists joined, control characters dropped, length capped
+            if isinstance(value, list):
+                value = "; ".join(value)
+            if isinstance(value, str):
+                value = ILLEGAL_CHARACTERS_RE.sub("", value)[:MAX_CELL_CHARS]
+            return value
+
+        wb = Workbook(write_only=True)
+        sheets = {
+            "deals": wb.create_sheet("Deals"),
+            "red_flags": wb.create_sheet("Red Flags"),
+            "weak_signals": wb.create_sheet("Weak Signals"),
+            "missing_sections": wb.create_sheet("Missing Sections"),
+            "memo": wb.create_sheet("Memo Sections"),
+        }
+        headers = {
+            "deals": ["Startup Name", "File", "Analyzed", "Funding Ask/Stage", "Outlook", "Confidence",
+                      "Problem", "Solution", "Product", "Market / TAM", "Business Model", "Traction", "Team",
+                      "Competition", "Red Flags", "Weak Signals", "Missing Sections", "Summary", "Content Hash"],
+            "red_flags": ["Startup Name", "Red Flag", "Content Hash"],
+            "weak_signals": ["Startup Name", "Weak Signal", "Content Hash"],
+            "missing_sections": ["Startup Name", "Missing Section", "Content Hash"],
+            "memo": ["Startup Name", "Section", "Text", "Content Hash"],
+        }
+        bold = Font(bold=True)
+        for key, sheet in sheets.items():
+            sheet.freeze_panes = "A2"
+            header_cells = []
+            for title in headers[key]:
+                header = WriteOnlyCell(sheet, value=title)
+                header.font = bold
+                header_cells.append(header)
+            sheet.append(header_cells)
+
+        for result in results:
+            data, memo, summary = result["data"], result["memo"], result.get("summary")
+            digest = result.get("content_hash", "")
+            analyzed = (datetime.datetime.fromtimestamp(result["created_at"])
+                        if result.get("created_at") else None)
+            sheets["deals"].append([
+                cell(data.startup_name), cell(result.get("filename")), analyzed, cell(data.funding_ask_stage),
+                cell(summary.decision_outlook if summary else None), summary.confidence_score if summary else None,
+                cell(data.problem), cell(data.solution), cell(data.product), cell(data.market_tam),
+                cell(data.business_model), cell(data.traction_metrics), cell(data.team),
+                cell(data.competitive_landscape), len(data.red_flags), len(data.weak_signals),
+                len(data.missing_sections), cell(summary.summary_bullet_points if summary else None), digest,
+            ])
+            for key in ("red_flags", "weak_signals", "missing_sections"):
+                for item in getattr(data, key):
+                    sheets[key].append([cell(data.startup_name), cell(item), digest])
+            for title, field in MEMO_SECTIONS:
+                sheets["memo"].append([cell(data.startup_name), title, cell(getattr(memo, field)), digest])
+
+        if output is not None:
+            wb.save(output)
+            return None
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        return buffer.getvalue()
+
+
+class ExportCache:
+    """
+    Bounded LRU of rendered export files, keyed by a hash of the content they
+    are rendered from. Files are built on first request (e.g. when a download
+    button is clicked) and reused until evicted; once max_bytes is exceeded
+    the least recently used files are dropped.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entries: int = 256):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Union[bytes, str]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(kind: str, *parts: str) -> str:
+        digest = hashlib.sha256(kind.encode("utf-8"))
+        for part in parts:
+            digest.update(b"\0" + part.encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _sizeof(value: Union[bytes, str]) -> int:
+        return len(value) if isinstance(value, bytes) else len(value.encode("utf-8"))
+
+    def get_or_render(self, key: str, render: Callable[[], Union[bytes, str]]) -> Union[bytes, str]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Rendered outside the lock; two concurrent misses just render twice
+        value = render()
+        size = self._sizeof(value)
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = value
+                self._size += size
+                while self._size > self.max_bytes or len(self._entries) > self.max_entries:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._size -= self._sizeof(evicted)
+        return value
+
+    def excel(self, data: PitchDeckData) -> bytes:
+        return self.get_or_render(self._key("xlsx", data.model_dump_json()), lambda: Exporter.to_excel(data))
+
+    def pdf_memo(self, memo: InvestmentMemo, startup_name: str) -> bytes:
+        return self.get_or_render(self._key("pdf", memo.model_dump_json(), startup_name),
+                                  lambda: Exporter.to_pdf_memo(memo, startup_name))
+
+    def text_memo(self, memo: InvestmentMemo, startup_name: str) -> str:
+        return self.get_or_render(self._key("txt", memo.model_dump_json(), startup_name),
+                                  lambda: Exporter.to_text_memo(memo, startup_name))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+
+# Shared by every session / request in the process
+export_cache = ExportCache(max_bytes=int(os.getenv("HATCHUP_EXPORT_CACHE_MB", "32")) * 1024 * 1024)
@@ -0,0 +1,327 @@
+"""
+Local background job subsystem.
+
+Jobs live in a durable SQLite queue; a pool of worker processes claims and
+runs them, recording progress events as they go. Pages submit a job and
+poll for its state, so a long analysis survives Streamlit reruns and
+browser reconnects, and the UI never blocks on LLM calls.
+
+Workers can also be started by hand: python -m src.jobs worker
+"""
+import argparse
+import atexit
+import io
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).parent.parent
+DEFAULT_JOBS_PATH = ROOT_DIR / "data" / "jobs.db"
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    filename TEXT,
+    input_path TEXT,
+    result_hash TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    heartbeat_at REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    at REAL NOT NULL,
+    stage TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events (job_id, id);
+"""
+
+_COLUMNS = ("id", "kind", "status", "stage", "filename", "input_path", "result_hash", "error",
+            "attempts", "worker", "heartbeat_at", "created_at", "started_at", "finished_at")
+
+# A running job whose worker has not reported for this long is considered orphaned
+HEARTBEAT_TIMEOUT = 60.0
+
+
+class JobQueue:
+    """
+    Durable job queue and event log in SQLite. Safe to use from several
+    processes at once; claiming a job is a single IMMEDIATE transaction.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_attempts: int = 2):
+        self.path = Path(path or os.getenv("HATCHUP_JOBS_PATH", DEFAULT_JOBS_PATH))
+        self.spool_dir = self.path.parent / "spool"
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def submit(self, kind: str, payload: bytes, filename: str) -> str:
+        """
+        Spools the input file and queues a job. Returns the job id.
+        """
+        job_id = uuid.uuid4().hex
+        input_path = self.spool_dir / f"{job_id}{Path(filename).suffix.lower()}"
+        input_path.write_bytes(payload)
+        self._conn().execute(
+            "INSERT INTO jobs (id, kind, status, filename, input_path, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, QUEUED, filename, str(input_path), time.time()),
+        )
+        self.event(job_id, QUEUED, "Job submitted")
+        return job_id
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically takes the oldest queued job and marks it running.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            now = time.time()
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, started_at = ?, heartbeat_at = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (RUNNING, worker, now, now, row[0]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return dict(zip(_COLUMNS, row))
+
+    def event(self, job_id: str, stage: str, message: str = "") -> None:
+        conn = self._conn()
+        conn.execute("INSERT INTO job_events (job_id, at, stage, message) VALUES (?, ?, ?, ?)",
+                     (job_id, time.time(), stage, message))
+        if stage not in (QUEUED, DONE, FAILED):
+            conn.execute("UPDATE jobs SET stage = ? WHERE id = ?", (stage, job_id))
+
+    def complete(self, job_id: str, result_hash: str) -> None:
+        self._conn().execute(
+            "UPDATE jobs SET status = ?, stage = ?, result_hash = ?, finished_at = ? WHERE id = ?",
+            (DONE, DONE, result_hash, time.time(), job_id),
+        )
+        self.event(job_id, DONE, "Analysis complete")
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._conn().execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+            (FAILED, error, time.time(), job_id),
+        )
+        self.event(job_id, FAILED, error)
+
+    def heartbeat(self, job_id: str) -> None:
+        self._conn().execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id))
+
+    def requeue_orphans(self, dead_workers: List[str] = ()) -> int:
+        """
+        Puts running jobs whose worker exited or stopped sending heartbeats
+        back in the queue, or fails them after max_attempts.
+        """
+        conn = self._conn()
+        placeholders = ",".join("?" for _ in dead_workers) or "''"
+        rows = conn.execute(
+            f"SELECT id, attempts FROM jobs WHERE status = ? AND (heartbeat_at < ? OR worker IN ({placeholders}))",
+            (RUNNING, time.time() - HEARTBEAT_TIMEOUT, *dead_workers),
+        ).fetchall()
+        for job_id, attempts in rows:
+            if attempts >= self.max_attempts:
+                self.fail(job_id, "Worker died while running this job")
+            else:
+                conn.execute("UPDATE jobs SET status = ?, worker = NULL WHERE id = ?", (QUEUED, job_id))
+                self.event(job_id, QUEUED, "Requeued after worker exit")
+        return len(rows)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(zip(_COLUMNS, row)) if row else None
+
+    def get_many(self, job_ids: List[str]) -> List[Dict[str, Any]]:
+        jobs = {job_id: self.get(job_id) for job_id in job_ids}
+        return [jobs[job_id] for job_id in job_ids if jobs[job_id]]
+
+    def events(self, job_id: str, after_id: int = 0) -> List[Dict[str, Any]]:
+        """
+        Progress events for a job newer than after_id, oldest first.
+        """
+        rows = self._conn().execute(
+            "SELECT id, at, stage, message FROM job_events WHERE job_id = ? AND id > ? ORDER BY id",
+            (job_id, after_id),
+        ).fetchall()
+        return [dict(zip(("id", "at", "stage", "message"), row)) for row in rows]
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, poll: float = 0.5) -> Dict[str, Any]:
+        """
+        Blocks until the job is done or failed (for scripts; pages should poll instead).
+        """
+        deadline = time.time() + timeout if timeout else None
+        while True:
+            job = self.get(job_id)
+            if job["status"] in (DONE, FAILED) or (deadline and time.time() > deadline):
+                return job
+            time.sleep(poll)
+
+
+# --- Workers ---
+
+def _run_analysis(queue: JobQueue, job: Dict[str, Any], pipeline, force: bool = False) -> str:
+    uploaded = io.BytesIO(Path(job["input_path"]).read_bytes())
+    uploaded.name = job["filename"]
+    result = pipeline.run(uploaded, on_stage=lambda stage: queue.event(job["id"], stage), force=force)
+    return result["content_hash"]
+
+
+def _run_reanalysis(queue: JobQueue, job: Dict[str, Any], pipeline) -> str:
+    return _run_analysis(queue, job, pipeline, force=True)
+
+
+HANDLERS = {
+    "analyze": _run_analysis,
+    "reanalyze": _run_reanalysis,
+}
+
+
+def _heartbeat(job_id: str, done: threading.Event) -> None:
+    queue = JobQueue()
+    while not done.wait(HEARTBEAT_TIMEOUT / 4):
+        queue.heartbeat(job_id)
+
+
+def worker_loop(worker_id: str, poll_interval: float = 0.5) -> None:
+    """
+    Claims and runs jobs until terminated.
+    """
+    # Imported here so the job queue itself stays cheap to import for pages
+    from src.llm import default_model
+    from src.pipeline import AnalysisPipeline
+    from src.store import AnalysisStore
+    from src.tracing import start_trace
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+
+    queue = JobQueue()
+    pipeline = AnalysisPipeline(
+        api_key=os.environ.get("GROQ_API_KEY", ""),
+        model_name=default_model(),
+        store=AnalysisStore(),
+    )
+
+    while not stopping:
+        job = queue.claim(worker_id)
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+        # Heartbeats keep long LLM calls from looking like a dead worker
+        done = threading.Event()
+        beat = threading.Thread(target=_heartbeat, args=(job["id"], done), daemon=True)
+        beat.start()
+        try:
+            # The job id doubles as the trace id, so the app can show this job's waterfall
+            with start_trace(f"job.{job['kind']}", trace_id=job["id"], filename=job["filename"], worker=worker_id):
+                result_hash = HANDLERS[job["kind"]](queue, job, pipeline)
+            queue.complete(job["id"], result_hash)
+        except Exception as e:
+            queue.fail(job["id"], str(e))
+        finally:
+            done.set()
+            beat.join()
+            Path(job["input_path"]).unlink(missing_ok=True)
+
+
+class JobRunner:
+    """
+    Keeps a pool of worker processes alive. Create one per server process
+    (e.g. via st.cache_resource); workers are stopped when it exits.
+    """
+
+    def __init__(self, workers: Optional[int] = None, queue: Optional[JobQueue] = None):
+        self.size = workers or int(os.getenv("HATCHUP_WORKERS", "4"))
+        self.queue = queue or JobQueue()
+        self.processes: Dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.stop)
+        self.ensure_running()
+
+    def ensure_running(self) -> None:
+        """
+        Starts missing workers and requeues jobs orphaned by dead ones. Cheap to call on every rerun.
+        """
+        with self._lock:
+            dead = []
+            for worker_id, process in list(self.processes.items()):
+                if process.poll() is not None:
+                    dead.append(worker_id)
+                    del self.processes[worker_id]
+            while len(self.processes) < self.size:
+                worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+                self.processes[worker_id] = subprocess.Popen(
+                    [sys.executable, "-m", "src.jobs", "worker", "--id", worker_id],
+                    cwd=str(ROOT_DIR),
+                )
+            self.queue.requeue_orphans(dead)
+
+    def submit(self, kind: str, payload: bytes, filename: str) -> str:
+        self.ensure_running()
+        return self.queue.submit(kind, payload, filename)
+
+    def stop(self) -> None:
+        with self._lock:
+            for process in self.processes.values():
+                process.terminate()
+            for process in self.processes.values():
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            self.processes.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HatchUp background job worker")
+    parser.add_argument("command", choices=["worker"])
+    parser.add_argument("--id", default=f"{os.getpid()}-manual")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+    worker_loop(args.id)
@@ -0,0 +1,290 @@
+import asyncio
+import json
+import os
+import re
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+DEFAULT_MODEL = "openai/gpt-oss-20b"
+
+# Plausible values for fields whose schema only says "string"
+FAKE_CHOICES = {
+    "decision_outlook": ["Positive", "Neutral", "Negative"],
+    "funding_ask_stage": ["Pre-Seed", "Seed", "Series A"],
+}
+
+_TOKEN = re.compile(r"\s*\S+")
+
+
+def _tokens(text: str) -> List[str]:
+    """
+    Word-sized pieces that concatenate back to text, used to fake token streaming.
+    """
+    pieces = _TOKEN.findall(text)
+    rest = text[sum(len(p) for p in pieces):]
+    return pieces + [rest] if rest else pieces
+
+
+def _usage(prompt: str, completion: str) -> Dict[str, int]:
+    # Roughly 4 characters per token, like the tiktoken fallback in src.tokens
+    input_tokens, output_tokens = max(1, len(prompt) // 4), max(1, len(completion) // 4)
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens}
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Offline stand-in for ChatGroq (HATCHUP_LLM_BACKEND=fake).
+
+    When the prompt carries PydanticOutputParser format instructions it
+    answers with JSON that satisfies the embedded schema; otherwise it
+    returns a short canned answer. No network, no API key. Answers are
+    seeded by the prompt, so the same prompt always gets the same answer.
+
+    latency (HATCHUP_FAKE_LATENCY, seconds) is added before the first token
+    and tokens_per_second (HATCHUP_FAKE_TPS, 0 = instant) paces the rest,
+    in both invoke and stream, to mimic Groq's timing.
+    """
+
+    model_name: str = "fake"
+    latency: float = 0.0
+    tokens_per_second: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "hatchup-fake"
+
+    @staticmethod
+    def _fake_value(name: str, spec: Dict[str, Any], defs: Dict[str, Any], seed: int) -> Any:
+        if "$ref" in spec:
+            spec = defs.get(spec["$ref"].split("/")[-1], {})
+        if "anyOf" in spec:
+            spec = next((s for s in spec["anyOf"] if s.get("type") != "null"), {})
+        seed = zlib.crc32(name.encode(), seed)
+        kind = spec.get("type", "string")
+        if kind == "array":
+            return [FakeChatModel._fake_value(f"{name} {i + 1}", spec.get("items", {}), defs, seed)
+                    for i in range(2 + seed % 3)]
+        if kind == "object":
+            return FakeChatModel._fake_object(spec, defs, seed)
+        if kind == "integer":
+            return seed % 101
+        if kind == "number":
+            return round((seed % 1000) / 1000, 3)
+        if kind == "boolean":
+            return bool(seed % 2)
+        if "enum" in spec:
+            return spec["enum"][seed % len(spec["enum"])]
+        if name in FAKE_CHOICES:
+            return FAKE_CHOICES[name][seed % len(FAKE_CHOICES[name])]
+        return f"Fake {name.replace('_', ' ')}."
+
+    @staticmethod
+    def _fake_object(schema: Dict[str, Any], defs: Dict[str, Any], seed: int = 0) -> Dict[str, Any]:
+        return {name: FakeChatModel._fake_value(name, spec, defs, seed)
+                for name, spec in schema.get("properties", {}).items()}
+
+    def respond(self, messages: List[BaseMessage]) -> str:
+        text = "\n".join(str(m.content) for m in messages)
+        seed = zlib.crc32(text.encode("utf-8"))
+        # PydanticOutputParser embeds the JSON schema in the last ``` block
+        for block in reversed(re.findall(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.S)):
+            try:
+                schema = json.loads(block)
+            except ValueError:
+                continue
+            if "properties" in schema:
+                return json.dumps(self._fake_object(schema, schema.get("$defs", {}), seed))
+        question = str(messages[-1].content).strip().splitlines()[-1] if messages else ""
+        return f"Fake answer to: {question[:200]}"
+
+    def _token_delay(self) -> float:
+        return 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _message(self, messages: List[BaseMessage], content: str) -> AIMessage:
+        prompt = "\n".join(str(m.content) for m in messages)
+        return AIMessage(content=content, usage_metadata=_usage(prompt, content),
+                         response_metadata={"model_name": self.model_name})
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        content = self.respond(messages)
+        time.sleep(self.latency + self._token_delay() * len(_tokens(content)))
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, content))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        content = self.respond(messages)
+        await asyncio.sleep(self.latency + self._token_delay() * len(_tokens(content)))
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, content))])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        for token in _tokens(self.respond(messages)):
+            time.sleep(self._token_delay())
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        for token in _tokens(self.respond(messages)):
+            await asyncio.sleep(self._token_delay())
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+class RecordReplayChatModel(BaseChatModel):
+    """
+    Record/replay wrapper (HATCHUP_LLM_BACKEND=record / replay).
+
+    In record mode every call goes to the wrapped model and its answer
+    (whole, or as the streamed chunks) is written to the "llm" cassette,
+    keyed by model name and messages. In replay mode answers come from the
+    cassette only, chunk for chunk, and an unrecorded prompt raises
+    CassetteMiss.
+    """
+
+    model_name: str = DEFAULT_MODEL
+    mode: str = "replay"
+    inner: Optional[BaseChatModel] = None
+    cassette_dir: Optional[str] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return f"hatchup-{self.mode}"
+
+    def _cassette(self):
+        from src.cassette import get_cassette
+        return get_cassette("llm", self.cassette_dir)
+
+    def _request(self, messages: List[BaseMessage], stop: Optional[List[str]]) -> Dict[str, Any]:
+        return {"model": self.model_name, "stop": stop,
+                "messages": [{"type": m.type, "content": m.content} for m in messages]}
+
+    @staticmethod
+    def _result(recorded: Dict[str, Any]) -> ChatResult:
+        content = recorded["content"] if "content" in recorded else "".join(recorded["chunks"])
+        message = AIMessage(content=content, usage_metadata=recorded.get("usage_metadata"),
+                            response_metadata=recorded.get("response_metadata", {}))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @staticmethod
+    def _recording(result: ChatResult) -> Dict[str, Any]:
+        message = result.generations[0].message
+        return {"content": message.content, "usage_metadata": getattr(message, "usage_metadata", None),
+                "response_metadata": message.response_metadata}
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        request, cassette = self._request(messages, stop), self._cassette()
+        if self.mode == "replay":
+            return self._result(cassette.replay(request))
+        result = self.inner._generate(messages, stop=stop, **kwargs)
+        cassette.put(request, self._recording(result))
+        return result
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        request, cassette = self._request(messages, stop), self._cassette()
+        if self.mode == "replay":
+            return self._result(cassette.replay(request))
+        result = await self.inner._agenerate(messages, stop=stop, **kwargs)
+        cassette.put(request, self._recording(result))
+        return result
+
+    def _replay_chunks(self, messages: List[BaseMessage], stop: Optional[List[str]]) -> List[str]:
+        recorded = self._cassette().replay(self._request(messages, stop))
+        return recorded.get("chunks") or [recorded["content"]]
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        if self.mode == "replay":
+            for token in self._replay_chunks(messages, stop):
+                yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+            return
+        chunks = []
+        for chunk in self.inner._stream(messages, stop=stop, **kwargs):
+            chunks.append(chunk.message.content)
+            yield chunk
+        self._cassette().put(self._request(messages, stop), {"chunks": chunks})
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        if self.mode == "replay":
+            for token in self._replay_chunks(messages, stop):
+                yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+            return
+        chunks = []
+        async for chunk in self.inner._astream(messages, stop=stop, **kwargs):
+            chunks.append(chunk.message.content)
+            yield chunk
+        self._cassette().put(self._request(messages, stop), {"chunks": chunks})
+
+
+def _build_llm(backend: str, model_name: str, temperature: float, api_key: Optional[str]) -> BaseChatModel:
+    if backend == "fake":
+        return FakeChatModel(latency=float(os.getenv("HATCHUP_FAKE_LATENCY", "0")),
+                             tokens_per_second=float(os.getenv("HATCHUP_FAKE_TPS", "0")))
+    if backend == "replay":
+        return RecordReplayChatModel(model_name=model_name, mode="replay")
+    from langchain_groq import ChatGroq
+    llm = ChatGroq(temperature=temperature, model_name=model_name, groq_api_key=api_key)
+    if backend == "record":
+        return RecordReplayChatModel(model_name=model_name, mode="record", inner=llm)
+    return llm
+
+
+@lru_cache(maxsize=None)
+def _cached_llm(backend: str, model_name: str, temperature: float, api_key: Optional[str]) -> BaseChatModel:
+    from src.tracing import llm_tracing_callback
+    from src.usage import usage_callback
+
+    llm = _build_llm(backend, model_name, temperature, api_key)
+    # Every call becomes an llm.chat span under the caller's current span and a usage ledger row
+    llm.callbacks = [llm_tracing_callback, usage_callback]
+    return llm
+
+
+def default_model() -> str:
+    """
+    The model every component uses unless told otherwise: HATCHUP_MODEL, or DEFAULT_MODEL.
+    """
+    return os.getenv("HATCHUP_MODEL", DEFAULT_MODEL)
+
+
+def missing_api_key() -> bool:
+    """
+    True when the configured backend calls Groq (groq, record) and GROQ_API_KEY is unset.
+    The fake and replay backends run offline without a key.
+    """
+    backend = os.getenv("HATCHUP_LLM_BACKEND", "groq").lower()
+    return backend not in ("fake", "replay") and not os.environ.get("GROQ_API_KEY")
+
+
+def get_llm(temperature: float = 0, model_name: Optional[str] = None, api_key: Optional[str] = None) -> BaseChatModel:
+    """
+    Shared chat model for the given settings. Instances (and their HTTP
+    connection pools) are reused by every caller in the process.
+
+    HATCHUP_LLM_BACKEND picks the backend: groq (default), fake
+    (FakeChatModel, offline), record (Groq, answers saved to the cassette)
+    or replay (answers from the cassette only, offline).
+    """
+    return _cached_llm(
+        os.getenv("HATCHUP_LLM_BACKEND", "groq").lower(),
+        model_name or default_model(),
+        temperature,
+        api_key or os.environ.get("GROQ_API_KEY"),
+    )
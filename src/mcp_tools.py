@@ -0,0 +1,222 @@
+import asyncio
+import atexit
+import contextvars
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+from mcp_use import MCPClient
+
+from src.tracing import span
+
+ROOT_DIR = Path(__file__).parent.parent.resolve()
+
+# sys.executable so the servers run in the same environment (with installed deps);
+# absolute paths so they are found regardless of the working directory
+SERVER_CONFIG = {
+    "mcpServers": {
+        "@echolab/mcp-reddit": {
+            "command": sys.executable,
+            "args": [str(ROOT_DIR / "mcp_reddit" / "server.py")]
+        },
+        "@echolab/mcp-wikipedia": {
+            "command": sys.executable,
+            "args": [str(ROOT_DIR / "mcp_wiki" / "server.py")]
+        },
+        "@echolab/mcp-google": {
+            "command": sys.executable,
+            "args": [str(ROOT_DIR / "mcp_google" / "server.py")]
+        },
+        "@echolab/mcp-medium": {
+            "command": sys.executable,
+            "args": [str(ROOT_DIR / "mcp_medium" / "server.py")]
+        }
+    }
+}
+
+def fake_server_config() -> Dict[str, Any]:
+    """
+    The same servers, answered by the offline stand-ins in mcp_fake/. MCP
+    starts servers with a minimal environment, so MCP_FAKE_LATENCY is passed on.
+    """
+    env = {"MCP_FAKE_LATENCY": os.getenv("MCP_FAKE_LATENCY", "0")}
+    return {
+        "mcpServers": {
+            server: {
+                "command": sys.executable,
+                "args": [str(ROOT_DIR / "mcp_fake" / "server.py"), "--as", server.rsplit("-", 1)[-1]],
+                "env": env,
+            }
+            for server in SERVER_CONFIG["mcpServers"]
+        }
+    }
+
+
+def mcp_backend() -> str:
+    """
+    HATCHUP_MCP_BACKEND: live (default), fake (stand-in servers), record
+    (live servers, tool results saved to the "mcp" cassette) or replay
+    (results from the cassette only; no servers are started).
+    """
+    return os.getenv("HATCHUP_MCP_BACKEND", "live").lower()
+
+
+class RecordingSession:
+    """
+    Wraps a live MCP session and saves every tool result to the cassette.
+    """
+
+    def __init__(self, server: str, session, cassette):
+        self.server = server
+        self.session = session
+        self.cassette = cassette
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any], *args, **kwargs):
+        result = await self.session.call_tool(name, arguments, *args, **kwargs)
+        self.cassette.put({"server": self.server, "tool": name, "arguments": arguments},
+                          result.model_dump(mode="json"))
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+
+class ReplaySession:
+    """
+    Answers tool calls from the cassette as the recorded CallToolResult.
+    """
+
+    def __init__(self, server: str, cassette):
+        self.server = server
+        self.cassette = cassette
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any], *args, **kwargs):
+        from mcp.types import CallToolResult
+
+        recorded = self.cassette.replay({"server": self.server, "tool": name, "arguments": arguments})
+        return CallToolResult.model_validate(recorded)
+
+
+class RecordReplayClient:
+    """
+    Drop-in for MCPClient's session API in record and replay mode.
+    """
+
+    def __init__(self, mode: str):
+        from src.cassette import get_cassette
+
+        self.mode = mode
+        self.cassette = get_cassette("mcp")
+        self.client = MCPClient.from_dict(SERVER_CONFIG) if mode == "record" else None
+
+    async def create_all_sessions(self, auto_initialize: bool = True) -> Dict[str, Any]:
+        if self.mode == "replay":
+            return {server: ReplaySession(server, self.cassette) for server in SERVER_CONFIG["mcpServers"]}
+        sessions = await self.client.create_all_sessions(auto_initialize)
+        return {server: RecordingSession(server, session, self.cassette) for server, session in sessions.items()}
+
+    async def close_all_sessions(self) -> None:
+        if self.client is not None:
+            await self.client.close_all_sessions()
+
+
+def create_client():
+    backend = mcp_backend()
+    if backend in ("record", "replay"):
+        return RecordReplayClient(backend)
+    return MCPClient.from_dict(fake_server_config() if backend == "fake" else SERVER_CONFIG)
+
+
+async def run_searches(sessions: Dict[str, Any], query: str) -> Dict[str, Any]:
+    """
+    Runs live searches on all MCP servers concurrently. Returns a dictionary of results;
+    a failing source yields an error string instead of raising.
+    """
+    calls = {
+        # Reddit (Community Sentiment) - query-aware search across startup subreddits
+        "reddit": ("@echolab/mcp-reddit", "Reddit", "search_reddit",
+                   {"query": query, "limit": 3, "comments_per_post": 5}),
+        # Wikipedia (Definitions/Background)
+        "wiki": ("@echolab/mcp-wikipedia", "Wikipedia", "search", {"query": query}),
+        # Google (News & Competitors)
+        "google": ("@echolab/mcp-google", "Google", "google_search", {"query": query}),
+        # Medium (Thought Leadership)
+        "medium": ("@echolab/mcp-medium", "Medium", "search_medium", {"query": query}),
+    }
+
+    async def call(server, name, tool, arguments):
+        async with span("mcp.call_tool", server=server, tool=tool) as s:
+            try:
+                result = await sessions[server].call_tool(tool, arguments)
+            except Exception as e:
+                s.set(error=str(e)[:200])
+                return f"[{name} MCP Error: {str(e)}]"
+            s.set(is_error=bool(getattr(result, "isError", False)))
+            return result
+
+    results = await asyncio.gather(*(call(*spec) for spec in calls.values()))
+    return dict(zip(calls, results))
+
+
+class ResearchTools:
+    """
+    One MCP client and its server sessions, shared by every request of a long-running
+    process. Sessions are created on first use and reused afterwards.
+    """
+
+    def __init__(self):
+        self.client = create_client()
+        self._sessions = None
+        self._lock = asyncio.Lock()
+
+    async def sessions(self) -> Dict[str, Any]:
+        async with self._lock:
+            if self._sessions is None:
+                self._sessions = await self.client.create_all_sessions()
+        return self._sessions
+
+    async def search(self, query: str) -> Dict[str, Any]:
+        return await run_searches(await self.sessions(), query)
+
+    async def close(self) -> None:
+        if self._sessions is not None:
+            await self.client.close_all_sessions()
+            self._sessions = None
+
+
+class ThreadedResearchTools:
+    """
+    ResearchTools on one long-lived event loop in a background thread, for
+    callers that each run their own short-lived loop (Streamlit pages use
+    asyncio.run per rerun). MCP sessions are bound to the loop that created
+    them, so they are only ever used from this one; callers submit searches
+    with asyncio.run_coroutine_threadsafe and await the result.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="mcp-loop", daemon=True)
+        self._thread.start()
+        self.tools = ResearchTools()
+        # Stop the server processes with the app instead of orphaning them
+        atexit.register(self.close)
+
+    async def _search(self, query: str, context: contextvars.Context) -> Dict[str, Any]:
+        # Run in the caller's context, so MCP spans nest under the caller's span
+        return await self.loop.create_task(self.tools.search(query), context=context)
+
+    async def search(self, query: str) -> Dict[str, Any]:
+        future = asyncio.run_coroutine_threadsafe(self._search(query, contextvars.copy_context()), self.loop)
+        return await asyncio.wrap_future(future)
+
+    def close(self, timeout: float = 10.0) -> None:
+        if self.loop.is_closed() or not self.loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.tools.close(), self.loop).result(timeout)
+        except Exception as e:
+            print(f"Error closing MCP sessions: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
@@ -1,15 +1,16 @@
-from langchain_groq import ChatGroq
+from typing import List, Optional
+from pydantic import create_model
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from src.models import PitchDeckData, InvestmentMemo, ExecutiveSummary
+from src.llm import get_llm
+from src.tracing import span
+from src.usage import usage_context
 
 class MemoGenerator:
-    def __init__(self, api_key: str, model_name: str = "openai/gpt-oss-20b"):
-        self.llm = ChatGroq(
-            temperature=0.3, # Slightly creative for writing but still grounded
-            model_name=model_name,
-            groq_api_key=api_key
-        )
+    def __init__(self, api_key: str, model_name: Optional[str] = None):
+        # Slightly creative for writing but still grounded
+        self.llm = get_llm(temperature=0.3, model_name=model_name, api_key=api_key)
     
     def generate_memo(self, data: PitchDeckData) -> InvestmentMemo:
         """
@@ -39,10 +40,11 @@ Constraint: Do NOT generate repetitive lists. Keep it concise."""
 
         chain = prompt | self.llm | parser
         
-        return chain.invoke({
-            "data": data.model_dump_json(),
-            "format_instructions": parser.get_format_instructions()
-        })
+        with span("chain.generate_memo"), usage_context(component="memo"):
+            return chain.invoke({
+                "data": data.model_dump_json(),
+                "format_instructions": parser.get_format_instructions()
+            })
 
     def generate_executive_summary(self, data: PitchDeckData, memo: InvestmentMemo) -> ExecutiveSummary:
         """
@@ -66,8 +68,45 @@ Avoid fluff."""
 
         chain = prompt | self.llm | parser
         
-        return chain.invoke({
-            "data": data.model_dump_json(),
-            "memo": memo.model_dump_json(),
-            "format_instructions": parser.get_format_instructions()
-        })
+        with span("chain.generate_executive_summary"), usage_context(component="summary"):
+            return chain.invoke({
+                "data": data.model_dump_json(),
+                "memo": memo.model_dump_json(),
+                "format_instructions": parser.get_format_instructions()
+            })
+
+    def update_memo(self, data: PitchDeckData, previous: InvestmentMemo, sections: List[str]) -> InvestmentMemo:
+        """
+        Rewrites only the given memo sections for updated deck data, keeping
+        the rest of the previous memo.
+        """
+        if not sections:
+            return previous
+        partial_model = create_model(
+            "InvestmentMemoUpdate",
+            **{name: (InvestmentMemo.model_fields[name].annotation, InvestmentMemo.model_fields[name]) for name in sections}
+        )
+        parser = PydanticOutputParser(pydantic_object=partial_model)
+
+        system_prompt = """You are a professional VC Partner updating an internal investment memo
+for a new version of the startup's pitch deck.
+Tone: Professional, objective, analytical, non-hyped.
+Rewrite only the requested sections so they match the updated data; stay consistent
+with the rest of the memo, which is kept as is.
+Constraint: Do NOT generate repetitive lists (Max 5-7 distinct items). Keep it concise."""
+
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", system_prompt),
+            ("user", "Updated startup data:\n{data}\n\nCurrent memo:\n{memo}\n\nRewrite these sections: {sections}\n{format_instructions}")
+        ])
+
+        chain = prompt | self.llm | parser
+
+        with span("chain.update_memo", sections=",".join(sections)), usage_context(component="memo"):
+            update = chain.invoke({
+                "data": data.model_dump_json(),
+                "memo": previous.model_dump_json(),
+                "sections": ", ".join(sections),
+                "format_instructions": parser.get_format_instructions()
+            })
+        return previous.model_copy(update=update.model_dump())
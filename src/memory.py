@@ -0,0 +1,135 @@
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.tokens import count_tokens, truncate_to_tokens
+
+# One small pool per process: summaries are cheap, infrequent and never block a page run
+_SUMMARY_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory-summarizer")
+
+SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You maintain the running memory of a conversation between a VC partner and a research assistant.
+Merge the new turns into the existing summary. Keep names, numbers, companies, decisions and open questions.
+Drop greetings, filler and formatting. Write compact prose, at most {max_words} words."""),
+    ("user", "Existing summary:\n{summary}\n\nNew turns:\n{turns}\n\nUpdated summary:")
+])
+
+
+def format_turns(messages: List[Dict[str, str]], max_tokens_per_turn: Optional[int] = None) -> str:
+    lines = []
+    for m in messages:
+        content = m["content"]
+        if max_tokens_per_turn:
+            clipped = truncate_to_tokens(content, max_tokens_per_turn)
+            content = clipped if clipped == content else clipped + " [...]"
+        lines.append(f"{m['role'].upper()}: {content}")
+    return "\n".join(lines)
+
+
+class ConversationMemory:
+    """
+    Rolling conversation memory: a compressed summary of older turns plus
+    the most recent turns verbatim, rendered within a token budget.
+
+    The summary is refreshed in a background thread only once enough older
+    turns have accumulated, so most turns cost no extra LLM call. When the
+    history is cleared a new generation starts; summaries still in flight
+    from an older generation are dropped when they finish.
+    """
+
+    def __init__(self, llm, token_budget: int = 1500, recent_turns: int = 4,
+                 max_tokens_per_turn: int = 400, summarize_every: int = 4,
+                 summary_words: int = 200):
+        self.llm = llm
+        self.token_budget = token_budget
+        self.recent_turns = recent_turns
+        self.max_tokens_per_turn = max_tokens_per_turn
+        self.summarize_every = summarize_every
+        self.summary_words = summary_words
+
+        self.summary = ""
+        self.summarized_upto = 0
+        self._generation = 0
+        self._seen = 0
+        self._pending: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    def _clear(self) -> None:
+        self.summary, self.summarized_upto, self._seen = "", 0, 0
+        self._generation += 1
+        self._pending = None
+
+    def render(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Returns the history text for the prompt: summary first, then as many
+        of the newest unsummarized turns as fit in the budget.
+        """
+        with self._lock:
+            summary = self.summary
+            start = self.summarized_upto if self.summarized_upto <= len(messages) else 0
+
+        parts = []
+        budget = self.token_budget
+        if summary:
+            parts.append(f"[Summary of earlier conversation]\n{summary}")
+            budget -= count_tokens(parts[0])
+
+        recent = []
+        for message in reversed(messages[start:]):
+            turn = format_turns([message], self.max_tokens_per_turn)
+            cost = count_tokens(turn)
+            if cost > budget:
+                break
+            recent.append(turn)
+            budget -= cost
+
+        if recent:
+            parts.append("\n".join(reversed(recent)))
+        return "\n\n".join(parts)
+
+    def update(self, messages: List[Dict[str, str]]) -> None:
+        """
+        Schedules a background summary refresh when enough turns have
+        fallen out of the verbatim window. Returns immediately.
+        """
+        with self._lock:
+            if len(messages) < self._seen:
+                # History only grows, so it was cleared; start over
+                self._clear()
+            self._seen = len(messages)
+            if self._pending is not None and not self._pending.done():
+                return
+
+            end = len(messages) - self.recent_turns
+            if end - self.summarized_upto < self.summarize_every:
+                return
+
+            turns = list(messages[self.summarized_upto:end])
+            previous = self.summary
+            # Run in the caller's context so the summary call is billed to its usage_context
+            context = contextvars.copy_context()
+            self._pending = _SUMMARY_EXECUTOR.submit(context.run, self._summarize, previous, turns, end,
+                                                     self._generation)
+
+    def _summarize(self, previous: str, turns: List[Dict[str, str]], end: int, generation: int) -> None:
+        try:
+            messages = SUMMARY_PROMPT.format_messages(
+                summary=previous or "(none)",
+                turns=format_turns(turns, self.max_tokens_per_turn),
+                max_words=self.summary_words,
+            )
+            summary = self.llm.invoke(messages).content.strip()
+        except Exception as e:
+            # Keep the old summary; the turns stay unsummarized and are retried on the next update
+            print(f"Error updating conversation summary: {e}")
+            return
+
+        with self._lock:
+            if generation != self._generation:
+                # The conversation was cleared while this summary was being written
+                return
+            self.summary = summary
+            self.summarized_upto = end
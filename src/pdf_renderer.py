@@ -0,0 +1,252 @@
+import io
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from src.models import InvestmentMemo
+
+DEFAULT_FONT_CACHE_DIR = Path(__file__).parent.parent / "data" / "font_cache"
+
+# Checked in order when HATCHUP_PDF_FONT is not set: (regular, bold)
+FONT_CANDIDATES = [
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/dejavu/DejaVuSans.ttf", "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/TTF/DejaVuSans.ttf", "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf"),
+    ("/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf", "/usr/share/fonts/truetype/noto/NotoSans-Bold.ttf"),
+    ("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+     "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf"),
+    ("/Library/Fonts/Arial Unicode.ttf", "/Library/Fonts/Arial Unicode.ttf"),
+    ("C:\\Windows\\Fonts\\arial.ttf", "C:\\Windows\\Fonts\\arialbd.ttf"),
+]
+
+MemoItem = Tuple[InvestmentMemo, str]
+
+# Batches up to this size render in the calling thread; a process pool only pays off above it
+IN_THREAD_BATCH = 8
+
+
+@lru_cache(maxsize=1)
+def find_unicode_font() -> Optional[Tuple[str, str]]:
+    """
+    (regular, bold) TTF paths from HATCHUP_PDF_FONT / HATCHUP_PDF_FONT_BOLD or
+    the first installed candidate; None if no Unicode font is available.
+    """
+    regular = os.getenv("HATCHUP_PDF_FONT")
+    if regular and os.path.exists(regular):
+        bold = os.getenv("HATCHUP_PDF_FONT_BOLD")
+        return regular, bold if bold and os.path.exists(bold) else regular
+    for regular, bold in FONT_CANDIDATES:
+        if os.path.exists(regular):
+            return regular, bold if os.path.exists(bold) else regular
+    return None
+
+
+@lru_cache(maxsize=1)
+def _configure_font_cache() -> None:
+    """
+    Makes PyFPDF keep parsed TTF metrics as pickles in one writable directory,
+    so each font file is parsed once per machine instead of once per memo.
+    """
+    from fpdf import set_global
+
+    cache_dir = Path(os.getenv("HATCHUP_FONT_CACHE_DIR", DEFAULT_FONT_CACHE_DIR))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    set_global("FPDF_CACHE_MODE", 2)
+    set_global("FPDF_CACHE_DIR", str(cache_dir))
+
+
+@dataclass(frozen=True)
+class MemoLayout:
+    """
+    Precompiled memo layout: styles, spacing and the section list,
+    resolved once instead of per memo.
+    """
+    title_size: int = 16
+    heading_size: int = 12
+    body_size: int = 11
+    title_height: float = 10
+    heading_height: float = 10
+    line_height: float = 6
+    after_title: float = 10
+    after_section: float = 5
+    sections: Tuple[Tuple[str, str], ...] = ()
+
+    @classmethod
+    def default(cls) -> "MemoLayout":
+        from src.exporter import MEMO_SECTIONS
+        return cls(sections=tuple(MEMO_SECTIONS))
+
+
+@dataclass
+class _Document:
+    """
+    An FPDF document being rendered and its active (style, size), so set_font
+    is only called when the style changes.
+    """
+    pdf: Any
+    style: Optional[Tuple[str, int]] = None
+
+
+class MemoRenderer:
+    """
+    Renders investment memos to PDF.
+
+    With a Unicode TTF font (see find_unicode_font) any script renders as-is
+    and PyFPDF embeds only the glyphs used. Without one it falls back to the
+    core Arial font and Exporter's latin-1 sanitizer.
+    """
+
+    def __init__(self, layout: Optional[MemoLayout] = None, font: Optional[Tuple[str, str]] = None,
+                 unicode: bool = True):
+        self.layout = layout or MemoLayout.default()
+        self.font = (font or find_unicode_font()) if unicode else None
+        self.family = "memo" if self.font else "Arial"
+        if self.font:
+            _configure_font_cache()
+
+    # --- Document plumbing ---
+
+    def _new_document(self) -> _Document:
+        from fpdf import FPDF
+
+        pdf = FPDF()
+        if self.font:
+            pdf.add_font(self.family, "", self.font[0], uni=True)
+            pdf.add_font(self.family, "B", self.font[1], uni=True)
+        return _Document(pdf)
+
+    def _style(self, doc: _Document, bold: bool, size: int) -> None:
+        style = ("B" if bold else "", size)
+        if doc.style != style:
+            doc.pdf.set_font(self.family, *style)
+            doc.style = style
+
+    def _text(self, text: str) -> str:
+        if self.font:
+            return text
+        from src.exporter import Exporter
+        return Exporter._sanitize_text(text)
+
+    @staticmethod
+    def _output(doc: _Document) -> bytes:
+        return doc.pdf.output(dest="S").encode("latin-1")
+
+    # --- Rendering ---
+
+    def _draw(self, doc: _Document, memo: InvestmentMemo, startup_name: str) -> None:
+        layout, pdf = self.layout, doc.pdf
+        pdf.add_page()
+
+        self._style(doc, True, layout.title_size)
+        pdf.cell(0, layout.title_height, self._text(f"Investment Memo: {startup_name}"), ln=True, align="C")
+        pdf.ln(layout.after_title)
+
+        for title, field in layout.sections:
+            content = getattr(memo, field)
+            self._style(doc, True, layout.heading_size)
+            pdf.cell(0, layout.heading_height, self._text(title), ln=True)
+
+            self._style(doc, False, layout.body_size)
+            if isinstance(content, list):
+                content = "\n".join(f"- {item}" for item in content)
+            pdf.multi_cell(0, layout.line_height, self._text(content or ""))
+            pdf.ln(layout.after_section)
+
+    def render(self, memo: InvestmentMemo, startup_name: str) -> bytes:
+        doc = self._new_document()
+        self._draw(doc, memo, startup_name)
+        return self._output(doc)
+
+    def render_combined(self, items: Iterable[MemoItem]) -> bytes:
+        """
+        All memos in one PDF, each starting on a new page; fonts are embedded once.
+        """
+        doc = self._new_document()
+        for memo, startup_name in items:
+            self._draw(doc, memo, startup_name)
+        return self._output(doc)
+
+    def render_each(self, items: Iterable[MemoItem]) -> List[bytes]:
+        return [self.render(memo, startup_name) for memo, startup_name in items]
+
+
+@lru_cache(maxsize=1)
+def default_renderer() -> MemoRenderer:
+    return MemoRenderer()
+
+
+# --- Batch rendering across processes ---
+
+def _render_chunk(items: Sequence[MemoItem], combined: bool, unicode: bool):
+    renderer = MemoRenderer(unicode=unicode)
+    return renderer.render_combined(items) if combined else renderer.render_each(items)
+
+
+def _chunks(items: Sequence[MemoItem], count: int) -> List[Sequence[MemoItem]]:
+    size = max(1, -(-len(items) // count))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _safe_filename(name: str) -> str:
+    cleaned = "".join(c if c.isalnum() or c in " -_." else "_" for c in name).strip()
+    return cleaned or "memo"
+
+
+def render_batch(items: Sequence[MemoItem], output: str = "pdf", workers: Optional[int] = None,
+                 unicode: bool = True) -> bytes:
+    """
+    Renders many memos on a process pool. output="pdf" returns one combined
+    PDF (chunks rendered in parallel, then concatenated in order);
+    output="zip" returns a zip with one PDF per memo. Batches of up to
+    IN_THREAD_BATCH memos render in the calling thread.
+
+    Worker processes are spawned, not forked: this runs inside the
+    multithreaded Streamlit server, and a forked child can inherit locks
+    held by other threads and deadlock.
+    """
+    items = list(items)
+    if not items:
+        raise ValueError("No memos to render")
+    workers = max(1, min(workers or os.cpu_count() or 1, len(items)))
+    if len(items) <= IN_THREAD_BATCH:
+        workers = 1
+    combined = output == "pdf"
+    chunks = _chunks(items, workers)
+
+    if workers == 1:
+        rendered = [_render_chunk(chunk, combined, unicode) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            rendered = list(pool.map(_render_chunk, chunks, [combined] * len(chunks), [unicode] * len(chunks)))
+
+    if combined:
+        if len(rendered) == 1:
+            return rendered[0]
+        from PyPDF2 import PdfReader, PdfWriter
+
+        writer = PdfWriter()
+        for part in rendered:
+            for page in PdfReader(io.BytesIO(part)).pages:
+                writer.add_page(page)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+
+    buffer = io.BytesIO()
+    used = set()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        pdfs = [pdf for chunk in rendered for pdf in chunk]
+        for (_, startup_name), pdf in zip(items, pdfs):
+            name = _safe_filename(startup_name)
+            filename, n = f"{name}_memo.pdf", 1
+            while filename in used:
+                n += 1
+                filename = f"{name}_memo_{n}.pdf"
+            used.add(filename)
+            archive.writestr(filename, pdf)
+    return buffer.getvalue()
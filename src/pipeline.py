@@ -0,0 +1,147 @@
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.analyzer import PitchDeckAnalyzer
+from src.deck_index import DeckIndex
+from src.document_parser import DocumentParser
+from src.memo_generator import MemoGenerator
+from src.store import AnalysisStore, content_hash, read_file_bytes
+from src.tracing import current_span, traced
+from src.usage import usage_context
+from src.versioning import deck_signature, diff_pages, plan_update
+
+STAGES = ("parse", "extract", "memo", "summary")
+
+
+class AnalysisPipeline:
+    """
+    Runs parse -> extract -> memo -> summary for one deck.
+    One instance can be shared between threads; the LLM clients are reused.
+    With a store, decks already analyzed (same content hash) are loaded
+    instead of re-run, and new results are saved.
+
+    A new version of a stored deck (near-duplicate by MinHash, see
+    src.versioning) is re-analyzed incrementally: only the fields and memo
+    sections its changed slides touch are regenerated, the rest is reused.
+    """
+
+    def __init__(self, api_key: str, model_name: Optional[str] = None,
+                 store: Optional[AnalysisStore] = None, incremental: bool = True):
+        self.analyzer = PitchDeckAnalyzer(api_key=api_key, model_name=model_name)
+        self.generator = MemoGenerator(api_key=api_key, model_name=model_name)
+        self.store = store
+        self.incremental = incremental
+
+    def _previous_version(self, digest: str, deck_index: DeckIndex) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        The most similar stored deck that is an earlier version of this one, with its estimated similarity.
+        """
+        signature = deck_signature(list(deck_index.pages().values()))
+        if signature is None:
+            return None, 0.0
+        for candidate, similarity in self.store.find_versions(signature, exclude=digest):
+            previous = self.store.get(candidate)
+            # Page-level diffs need the previous version's pages
+            if previous and previous.get("deck_index") is not None:
+                return previous, similarity
+        return None, 0.0
+
+    @traced("pipeline.run")
+    def run(self, uploaded_file, on_stage: Optional[Callable[[str], None]] = None,
+            force: bool = False) -> Dict[str, Any]:
+        """
+        Analyzes one uploaded file and returns the analysis result dict
+        (data, memo, summary, raw_text, deck_index, timings, content_hash,
+        version). on_stage is called with each stage name as it starts.
+        force re-runs the full pipeline even when the store has the deck
+        or an earlier version of it.
+        """
+        digest = content_hash(read_file_bytes(uploaded_file))
+        current_span().set(content_hash=digest)
+        if self.store is not None and not force:
+            cached = self.store.get(digest)
+            if cached:
+                cached["cached"] = True
+                current_span().set(cached=True)
+                return cached
+
+        # Labels every LLM call below with this deal in the usage ledger
+        with usage_context(deal=digest):
+            timings = {}
+
+            def stage(name):
+                if on_stage:
+                    on_stage(name)
+                return time.perf_counter()
+
+            # 1. Parse Document
+            started = stage("parse")
+            pages = DocumentParser.parse_pages(uploaded_file)
+            raw_text = DocumentParser.join_pages(pages)
+            deck_index = DeckIndex.from_pages(pages)
+            timings["parse"] = time.perf_counter() - started
+
+            # Earlier version of this deck? Diff the slides and plan what to regenerate
+            previous, plan, version = None, None, None
+            if self.store is not None and self.incremental and not force:
+                previous, similarity = self._previous_version(digest, deck_index)
+            if previous is not None:
+                old_pages, new_pages = previous["deck_index"].pages(), deck_index.pages()
+                diff = diff_pages(old_pages, new_pages)
+                plan = plan_update(diff, old_pages, new_pages, previous["data"])
+                version = {
+                    "previous": previous["content_hash"],
+                    "previous_filename": previous.get("filename"),
+                    "similarity": round(similarity, 3),
+                    "diff": diff.to_dict(),
+                    "mode": "incremental" if plan.incremental else "full",
+                    "reason": plan.reason,
+                    "fields": plan.fields if plan.incremental else [],
+                    "sections": plan.sections if plan.incremental else [],
+                }
+                current_span().set(version_mode=version["mode"], previous_version=previous["content_hash"])
+
+            if plan is not None and plan.incremental:
+                # 2-3. Re-extract the touched fields and sections, reuse the rest
+                started = stage("extract")
+                deck_data = self.analyzer.update_fields(previous["data"], plan.fields, plan.context)
+                timings["extract"] = time.perf_counter() - started
+
+                started = stage("memo")
+                memo = self.generator.update_memo(deck_data, previous["memo"], plan.sections)
+                timings["memo"] = time.perf_counter() - started
+
+                started = stage("summary")
+                summary = (self.generator.generate_executive_summary(deck_data, memo) if plan.fields
+                           else previous["summary"])
+                timings["summary"] = time.perf_counter() - started
+            else:
+                # 2. Extract Data
+                started = stage("extract")
+                deck_data = self.analyzer.analyze_pitch_deck(raw_text)
+                timings["extract"] = time.perf_counter() - started
+
+                # 3. Generate Memo & Summary
+                started = stage("memo")
+                memo = self.generator.generate_memo(deck_data)
+                timings["memo"] = time.perf_counter() - started
+
+                started = stage("summary")
+                summary = self.generator.generate_executive_summary(deck_data, memo)
+                timings["summary"] = time.perf_counter() - started
+
+            result = {
+                "data": deck_data,
+                "memo": memo,
+                "summary": summary,
+                "raw_text": raw_text,
+                "deck_index": deck_index,
+                "timings": timings,
+                "content_hash": digest,
+                "filename": Path(uploaded_file.name).name if hasattr(uploaded_file, "name") else None,
+                "version": version,
+            }
+            if self.store is not None:
+                self.store.put(digest, result)
+            return result
@@ -0,0 +1,119 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from src.deck_index import DeckIndex
+from src.models import PitchDeckData, InvestmentMemo
+from src.research import READY_QUERIES, RESEARCH_PROMPT, analysis_fingerprint, build_context
+from src.tokens import count_tokens
+from src.usage import usage_context
+
+
+def _lower_thread_priority():
+    """
+    Runs prefetch workers at a lower CPU priority than page reruns (Linux: per-thread nice).
+    """
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (AttributeError, OSError):
+        pass
+
+
+class ReadyQueryPrefetcher:
+    """
+    Speculatively answers the Research Engine's Ready Queries in the
+    background after an analysis completes, so a click can show the
+    answer instantly.
+
+    Work is bounded by max_concurrency and a total token budget; each call
+    reserves its prompt tokens before it starts, so concurrent calls can't
+    overshoot the budget together. Answers are tagged with the analysis
+    fingerprint and ignored once the data or memo changes.
+    """
+
+    def __init__(self, llm, queries: Optional[List[str]] = None, max_concurrency: int = 2,
+                 token_budget: int = 20000):
+        self.llm = llm
+        self.queries = list(queries or READY_QUERIES)
+        self.max_concurrency = max_concurrency
+        self.token_budget = token_budget
+
+        self.fingerprint: Optional[str] = None
+        self.answers: Dict[str, str] = {}
+        self.tokens_used = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def start(self, data: PitchDeckData, memo: InvestmentMemo, deck_index: Optional[DeckIndex] = None,
+              deal: Optional[str] = None) -> None:
+        """
+        Discards previous answers and starts prefetching for this data and memo. Returns immediately.
+        deal (the content hash) labels the calls in the usage ledger.
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self.fingerprint = analysis_fingerprint(data, memo)
+            self.answers = {}
+            self.tokens_used = 0
+
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="ready-query-prefetch",
+            initializer=_lower_thread_priority,
+        )
+        for query in self.queries:
+            executor.submit(self._answer, generation, data, memo, deck_index, query, deal)
+        # Workers exit once the queue drains; nothing waits on them
+        executor.shutdown(wait=False)
+
+    def cancel(self) -> None:
+        """
+        Stops pending work; queries already in flight finish but their answers are dropped.
+        """
+        with self._lock:
+            self._generation += 1
+            self.fingerprint = None
+            self.answers = {}
+
+    def _answer(self, generation: int, data: PitchDeckData, memo: InvestmentMemo,
+                deck_index: Optional[DeckIndex], query: str, deal: Optional[str] = None) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+
+        messages = RESEARCH_PROMPT.format_messages(
+            context=build_context(data, memo, deck_index, query),
+            history="(none)",
+            question=query,
+        )
+        prompt_tokens = sum(count_tokens(m.content) for m in messages)
+        with self._lock:
+            if generation != self._generation or self.tokens_used + prompt_tokens > self.token_budget:
+                return
+            self.tokens_used += prompt_tokens
+        try:
+            with usage_context(component="prefetch", deal=deal):
+                answer = self.llm.invoke(messages).content
+        except Exception as e:
+            print(f"Error prefetching ready query: {e}")
+            return
+
+        with self._lock:
+            if generation == self._generation:
+                self.tokens_used += count_tokens(answer)
+                self.answers[query] = answer
+
+    def get(self, query: str, data: PitchDeckData, memo: InvestmentMemo) -> Optional[str]:
+        """
+        Returns the prefetched answer if it was computed for this exact data and memo.
+        """
+        with self._lock:
+            if self.fingerprint != analysis_fingerprint(data, memo):
+                return None
+            return self.answers.get(query)
+
+    def progress(self) -> str:
+        with self._lock:
+            return f"{len(self.answers)}/{len(self.queries)} ready"
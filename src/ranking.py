@@ -0,0 +1,73 @@
+import re
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have how i if in
+into is it its me my no not of on or our so than that the their them then there these they
+this to was we were what when where which who why will with would you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercases text and splits it into alphanumeric terms, dropping stopwords.
+    """
+    if not text:
+        return []
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a small document collection, backed by a dense
+    document-term frequency matrix in NumPy.
+    """
+
+    def __init__(self, documents: Sequence[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab: Dict[str, int] = {}
+        for doc in documents:
+            for term in doc:
+                if term not in self.vocab:
+                    self.vocab[term] = len(self.vocab)
+
+        self.tf = np.zeros((len(documents), len(self.vocab)), dtype=np.float32)
+        for row, doc in enumerate(documents):
+            for term in doc:
+                self.tf[row, self.vocab[term]] += 1
+
+        self.doc_len = self.tf.sum(axis=1)
+        self.avgdl = float(self.doc_len.mean()) if len(documents) else 0.0
+        n_docs = len(documents)
+        df = (self.tf > 0).sum(axis=0)
+        self.idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+    def __len__(self) -> int:
+        return self.tf.shape[0]
+
+    def get_scores(self, query_terms: List[str]) -> np.ndarray:
+        """
+        Returns one BM25 score per document for the given query terms.
+        """
+        scores = np.zeros(len(self), dtype=np.float32)
+        cols = [self.vocab[t] for t in set(query_terms) if t in self.vocab]
+        if not cols or not len(self):
+            return scores
+
+        tf = self.tf[:, cols]
+        norm = self.k1 * (1.0 - self.b + self.b * self.doc_len / max(self.avgdl, 1e-9))
+        weights = tf * (self.k1 + 1.0) / (tf + norm[:, None])
+        return (weights * self.idf[cols]).sum(axis=1)
+
+    def top_k(self, query: str, k: int) -> List[int]:
+        """
+        Returns indices of the k best matching documents with a positive score.
+        """
+        scores = self.get_scores(tokenize(query))
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [int(i) for i in order if scores[i] > 0]
@@ -0,0 +1,115 @@
+import hashlib
+from typing import List, Optional
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.deck_index import DeckIndex
+from src.models import PitchDeckData, InvestmentMemo
+from src.tokens import truncate_to_tokens
+
+READY_QUERIES = [
+    "What are the 3 biggest risks not mentioned in the deck?",
+    "Evaluate the team's ability to execute this specific solution.",
+    "Is the TAM calculated realistically? validate it.",
+    "Compare this to major competitors.",
+    "Draft a follow-up email asking about their unit economics.",
+    "Draft a polite pass (rejection) email.",
+    "What specific questions should I ask in the partner meeting?"
+]
+
+RESEARCH_SYSTEM_PROMPT = """You are a highly intelligent VC Research Associate.
+You have access to a digest of the parsed Pitch Deck Data and the generated Investment Memo for a startup,
+plus the deck excerpts most relevant to the question, labelled [Slide N].
+
+Your goal is to answer the User's (Partner's) questions deeply and critically.
+
+Guidelines:
+1. Use the provided Context as your primary source. When you rely on a deck excerpt, cite it as [Slide N].
+2. If the user asks for validation (e.g. Market size, competitors), use your own internal knowledge to verify if the startup's claims are realistic.
+3. Be concise but insightful. Start directly with the answer.
+4. If drafting emails, use a professional VC tone.
+"""
+
+RESEARCH_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", RESEARCH_SYSTEM_PROMPT),
+    ("user", "Context:\n{context}\n\nConversation so far:\n{history}\n\nQuestion: {question}")
+])
+
+
+# Without a deck index there are no excerpts, so the digest gets this budget unclipped per field
+FULL_CONTEXT_TOKENS = 3000
+
+
+def _clip(text: Optional[str], max_tokens: Optional[int]) -> str:
+    text = " ".join((text or "").split())
+    if max_tokens is None:
+        return text
+    clipped = truncate_to_tokens(text, max_tokens)
+    return clipped if clipped == text else clipped + "..."
+
+
+def _join(items: List[str], max_tokens: Optional[int]) -> str:
+    return _clip("; ".join(items), max_tokens) if items else "None"
+
+
+def build_digest(data: PitchDeckData, memo: InvestmentMemo, field_tokens: Optional[int] = 80) -> str:
+    """
+    Compact plain-text digest of the extracted data and memo,
+    used instead of their full JSON dumps in research prompts.
+    field_tokens=None keeps every field whole.
+    """
+    short_tokens = 40 if field_tokens is not None else None
+    lines = [
+        f"Startup: {data.startup_name} | Stage/Ask: {_clip(data.funding_ask_stage, short_tokens)}",
+        f"Problem: {_clip(data.problem, field_tokens)}",
+        f"Solution: {_clip(data.solution, field_tokens)}",
+        f"Product: {_clip(data.product, field_tokens)}",
+        f"Market/TAM: {_clip(data.market_tam, field_tokens)}",
+        f"Business Model: {_clip(data.business_model, field_tokens)}",
+        f"Traction: {_clip(data.traction_metrics, field_tokens)}",
+        f"Team: {_clip(data.team, field_tokens)}",
+        f"Competition: {_clip(data.competitive_landscape, field_tokens)}",
+        f"Red Flags: {_join(data.red_flags, field_tokens)}",
+        f"Weak Signals: {_join(data.weak_signals, field_tokens)}",
+        f"Missing Sections: {_join(data.missing_sections, short_tokens)}",
+        "",
+        "Memo:",
+        f"Overview: {_clip(memo.company_overview, field_tokens)}",
+        f"Problem/Solution: {_clip(memo.problem_solution_clarity, field_tokens)}",
+        f"Market: {_clip(memo.market_opportunity, field_tokens)}",
+        f"Differentiation: {_clip(memo.product_differentiation, field_tokens)}",
+        f"Traction: {_clip(memo.traction_metrics_analysis, field_tokens)}",
+        f"Team: {_clip(memo.team_assessment, field_tokens)}",
+        f"Risks: {_join(memo.risks_concerns, field_tokens)}",
+        f"Open Questions: {_join(memo.open_questions, field_tokens)}",
+        f"Assessment: {_clip(memo.neutral_assessment, field_tokens)}",
+    ]
+    return "\n".join(lines)
+
+
+def build_context(data: PitchDeckData, memo: InvestmentMemo, deck_index: Optional[DeckIndex],
+                  question: str, k: int = 4) -> str:
+    """
+    Digest plus the top-k deck chunks for the question. Without a deck
+    index (e.g. a memo built from pasted text) the digest is the only
+    source, so it keeps whole fields up to FULL_CONTEXT_TOKENS.
+    """
+    if deck_index is None:
+        digest = truncate_to_tokens(build_digest(data, memo, field_tokens=None), FULL_CONTEXT_TOKENS)
+        return f"*** STARTUP DIGEST ***\n{digest}"
+    context = f"*** STARTUP DIGEST ***\n{build_digest(data, memo)}"
+    chunks = deck_index.search(question, k)
+    if chunks:
+        excerpts = "\n\n".join(f"[Slide {c.page}]\n{c.text}" for c in chunks)
+        context += f"\n\n*** RELEVANT DECK EXCERPTS ***\n{excerpts}"
+    return context
+
+
+def analysis_fingerprint(data: PitchDeckData, memo: InvestmentMemo) -> str:
+    """
+    Content hash of the data and memo; answers derived from them are only valid for the same hash.
+    """
+    digest = hashlib.sha256()
+    digest.update(data.model_dump_json().encode("utf-8"))
+    digest.update(memo.model_dump_json().encode("utf-8"))
+    return digest.hexdigest()
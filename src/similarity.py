@@ -0,0 +1,198 @@
+"""
+"Have we seen something like this before?" — a similarity index over every
+analyzed deal.
+
+Each deal's PitchDeckData and memo text becomes a hashed n-gram vector
+(unigrams and bigrams, signed feature hashing, sublinear term frequency,
+L2-normalized) of VECTOR_DIM float32s. Vectors are written by
+AnalysisStore.put, so the index grows as analyses finish. SimilarityIndex
+keeps them in one NumPy matrix and answers top-k queries with a single
+brute-force matrix-vector product, a few milliseconds for 50k deals
+(~100 MB of vectors).
+
+Scores are cosine similarities after subtracting the corpus mean vector
+(shrunk toward zero while the index is small), so the vocabulary every
+pitch deck shares ("market", "revenue", "team") doesn't make all deals
+look alike.
+"""
+import math
+import threading
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.models import InvestmentMemo, PitchDeckData
+from src.ranking import tokenize
+
+VECTOR_DIM = 512
+# Pseudo-count shrinking the corpus mean toward zero, so a handful of deals aren't centered into noise
+MEAN_PRIOR = 50
+
+# What a deal is about; the name, ask and diligence notes are left out on purpose
+DEAL_FIELDS = ("problem", "solution", "product", "market_tam", "business_model",
+               "traction_metrics", "competitive_landscape")
+MEMO_FIELDS = ("company_overview", "market_opportunity", "product_differentiation")
+
+
+def deal_text(data: PitchDeckData, memo: Optional[InvestmentMemo] = None) -> str:
+    parts = [getattr(data, field) or "" for field in DEAL_FIELDS]
+    if memo is not None:
+        parts += [getattr(memo, field) or "" for field in MEMO_FIELDS]
+    return "\n".join(parts)
+
+
+def hashed_vector(text: str, dim: int = VECTOR_DIM) -> np.ndarray:
+    """
+    Signed feature hashing of unigram and bigram counts into dim buckets,
+    with 1 + log(count) weighting, L2-normalized.
+    """
+    terms = tokenize(text)
+    counts = Counter(terms)
+    counts.update(f"{a} {b}" for a, b in zip(terms, terms[1:]))
+    vector = np.zeros(dim, dtype=np.float32)
+    if not counts:
+        return vector
+    hashes = np.fromiter((zlib.crc32(term.encode("utf-8")) for term in counts), dtype=np.uint32, count=len(counts))
+    weights = np.fromiter((1.0 + math.log(c) for c in counts.values()), dtype=np.float32, count=len(counts))
+    # Low bits pick the bucket, the top bit the sign, so collisions cancel out on average
+    signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+    np.add.at(vector, hashes % dim, signs * weights)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def deal_vector(data: PitchDeckData, memo: Optional[InvestmentMemo] = None) -> np.ndarray:
+    return hashed_vector(deal_text(data, memo))
+
+
+class SimilarityIndex:
+    """
+    In-memory matrix of deal vectors, synced incrementally from the store's
+    deal_vectors table (rows after the last rowid seen). Rows live in a
+    preallocated array that doubles when full, so appends are cheap.
+    """
+
+    def __init__(self, store, dim: int = VECTOR_DIM):
+        self.store = store
+        self.dim = dim
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.size = 0
+        self.hashes: List[str] = []
+        self.names: List[str] = []
+        self.created: List[float] = []
+        self._rows: Dict[str, int] = {}
+        self._last_rowid = 0
+        self._sum = np.zeros(dim, dtype=np.float64)
+        self._centered = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self, needed: int) -> None:
+        if needed <= len(self.vectors):
+            return
+        grown = np.zeros((max(needed, 2 * len(self.vectors), 1024), self.dim), dtype=np.float32)
+        grown[:self.size] = self.vectors[:self.size]
+        self.vectors = grown
+
+    def add(self, digest: str, name: str, created_at: float, vector: np.ndarray) -> None:
+        """
+        Adds a deal, or replaces its vector when it is already indexed.
+        """
+        with self._lock:
+            row = self._rows.get(digest)
+            if row is None:
+                row = self.size
+                self._grow(row + 1)
+                self._rows[digest] = row
+                self.hashes.append(digest)
+                self.names.append(name)
+                self.created.append(created_at)
+                self.size += 1
+            else:
+                self._sum -= self.vectors[row]
+                self.names[row] = name
+            self.vectors[row] = vector
+            self._sum += vector
+            self._centered = None
+
+    def refresh(self) -> int:
+        """
+        Picks up vectors stored since the last refresh. Returns how many.
+        """
+        added = 0
+        with self._refresh_lock:
+            for rowid, digest, name, created_at, blob in self.store.vectors_since(self._last_rowid):
+                vector = np.frombuffer(blob, dtype=np.float32)
+                if len(vector) == self.dim:
+                    self.add(digest, name, created_at, vector)
+                    added += 1
+                self._last_rowid = rowid
+        return added
+
+    def _centering(self):
+        """
+        Corpus mean, each row's dot product with it and each centered row's
+        norm; recomputed (one matrix-vector product) only after the index changed.
+        """
+        if self._centered is None:
+            mean = (self._sum / (self.size + MEAN_PRIOR)).astype(np.float32)
+            matrix = self.vectors[:self.size]
+            row_dot_mean = matrix @ mean
+            mean_sq = float(mean @ mean)
+            # Rows are unit vectors: |x - m|^2 = 1 - 2 x.m + m.m
+            norms = np.sqrt(np.maximum(1.0 - 2.0 * row_dot_mean + mean_sq, 1e-12))
+            self._centered = (mean, row_dot_mean, mean_sq, norms)
+        return self._centered
+
+    def search(self, vector: np.ndarray, k: int = 5, exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        The k most similar deals (content_hash, startup_name, created_at, score), best first.
+        """
+        with self._lock:
+            if self.size == 0:
+                return []
+            mean, row_dot_mean, mean_sq, norms = self._centering()
+            query = vector.astype(np.float32) - mean
+            query_norm = float(np.linalg.norm(query)) or 1.0
+            # (x - m).(q - m) = x.q - x.m - m.q + m.m, computed on the uncentered matrix
+            scores = (self.vectors[:self.size] @ vector - row_dot_mean - float(mean @ vector) + mean_sq)
+            scores /= norms * query_norm
+            if exclude is not None and exclude in self._rows:
+                scores[self._rows[exclude]] = -np.inf
+            k = min(k, self.size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [{"content_hash": self.hashes[i], "startup_name": self.names[i],
+                     "created_at": self.created[i], "score": round(float(scores[i]), 3)}
+                    for i in top if np.isfinite(scores[i])]
+
+    def similar_to(self, data: PitchDeckData, memo: Optional[InvestmentMemo] = None, k: int = 5,
+                   exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.search(deal_vector(data, memo), k, exclude)
+
+
+_index: Optional[SimilarityIndex] = None
+_index_lock = threading.Lock()
+
+
+def shared_index() -> SimilarityIndex:
+    """
+    The process-wide index over the default store, shared by every page.
+    Loads (and backfills vectors for older analyses) on first use, then
+    refreshes incrementally on each call.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            from src.store import AnalysisStore
+
+            store = AnalysisStore()
+            store.backfill()
+            _index = SimilarityIndex(store)
+    _index.refresh()
+    return _index
@@ -0,0 +1,274 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.deck_index import DeckIndex
+from src.similarity import deal_vector
+from src.versioning import VERSION_THRESHOLD, deck_signature, estimated_similarity, lsh_bands
+from src.models import PitchDeckData, InvestmentMemo, ExecutiveSummary
+
+DEFAULT_STORE_PATH = Path(__file__).parent.parent / "data" / "hatchup.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    content_hash TEXT PRIMARY KEY,
+    startup_name TEXT NOT NULL,
+    filename TEXT,
+    created_at REAL NOT NULL,
+    decision_outlook TEXT,
+    confidence_score INTEGER,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_startup ON analyses (startup_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses (created_at);
+CREATE TABLE IF NOT EXISTS deal_vectors (
+    content_hash TEXT PRIMARY KEY,
+    startup_name TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    vector BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deck_signatures (
+    content_hash TEXT PRIMARY KEY,
+    minhash BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deck_lsh (
+    band TEXT NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deck_lsh_band ON deck_lsh (band);
+"""
+
+
+def content_hash(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()
+
+
+def read_file_bytes(uploaded_file) -> bytes:
+    """
+    Reads an uploaded / opened file without consuming it for the parser.
+    """
+    if hasattr(uploaded_file, "getvalue"):
+        return uploaded_file.getvalue()
+    position = uploaded_file.tell()
+    payload = uploaded_file.read()
+    uploaded_file.seek(position)
+    return payload
+
+
+class AnalysisStore:
+    """
+    Persistent SQLite store of finished analyses, keyed by the deck's content hash.
+
+    Each row keeps the listing columns (name, date, outlook, score) in the
+    clear and the full result (data, memo, summary, raw text, deck index,
+    timings) as zlib-compressed JSON, so listings never touch the payload.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or os.getenv("HATCHUP_STORE_PATH", DEFAULT_STORE_PATH))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections are per-thread; WAL lets readers run alongside a writer
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --- Serialization ---
+
+    @staticmethod
+    def _encode(result: Dict[str, Any]) -> bytes:
+        payload = {
+            "data": result["data"].model_dump(),
+            "memo": result["memo"].model_dump(),
+            "summary": result["summary"].model_dump(),
+            "raw_text": result.get("raw_text", ""),
+            "deck_index": result["deck_index"].to_dict() if result.get("deck_index") is not None else None,
+            "timings": result.get("timings", {}),
+            "filename": result.get("filename"),
+            "version": result.get("version"),
+        }
+        return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 6)
+
+    @staticmethod
+    def _decode(blob: bytes, digest: str) -> Dict[str, Any]:
+        payload = json.loads(zlib.decompress(blob))
+        return {
+            "data": PitchDeckData(**payload["data"]),
+            "memo": InvestmentMemo(**payload["memo"]),
+            "summary": ExecutiveSummary(**payload["summary"]),
+            "raw_text": payload.get("raw_text", ""),
+            "deck_index": DeckIndex.from_dict(payload["deck_index"]) if payload.get("deck_index") is not None else None,
+            "timings": payload.get("timings", {}),
+            "filename": payload.get("filename"),
+            "version": payload.get("version"),
+            "content_hash": digest,
+        }
+
+    # --- Access ---
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT payload FROM analyses WHERE content_hash = ?", (digest,)
+        ).fetchone()
+        return self._decode(row[0], digest) if row else None
+
+    def __contains__(self, digest: str) -> bool:
+        return self._conn().execute(
+            "SELECT 1 FROM analyses WHERE content_hash = ?", (digest,)
+        ).fetchone() is not None
+
+    def put(self, digest: str, result: Dict[str, Any], filename: Optional[str] = None) -> None:
+        if filename:
+            result = {**result, "filename": filename}
+        created_at = time.time()
+        conn = self._conn()
+        with conn:
+            # Similarity vector and deck signature in the same transaction, so the indexes never miss a stored deal
+            self._put_derived(conn, digest, result, created_at)
+            conn.execute(
+                "INSERT OR REPLACE INTO analyses "
+                "(content_hash, startup_name, filename, created_at, decision_outlook, confidence_score, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    digest,
+                    result["data"].startup_name,
+                    result.get("filename"),
+                    created_at,
+                    result["summary"].decision_outlook,
+                    result["summary"].confidence_score,
+                    self._encode(result),
+                ),
+            )
+
+    @staticmethod
+    def _put_derived(conn: sqlite3.Connection, digest: str, result: Dict[str, Any], created_at: float) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO deal_vectors (content_hash, startup_name, created_at, vector) VALUES (?, ?, ?, ?)",
+            (digest, result["data"].startup_name, created_at,
+             deal_vector(result["data"], result.get("memo")).tobytes()),
+        )
+        # Results saved without a deck index only have the joined text
+        deck_index = result.get("deck_index")
+        pages = list(deck_index.pages().values()) if deck_index is not None else [result.get("raw_text", "")]
+        signature = deck_signature(pages)
+        # Decks too thin to link (empty, parser errors) get an empty signature and no bands:
+        # backfill skips them and find_versions never returns them
+        conn.execute("INSERT OR REPLACE INTO deck_signatures (content_hash, minhash) VALUES (?, ?)",
+                     (digest, signature.tobytes() if signature is not None else b""))
+        conn.execute("DELETE FROM deck_lsh WHERE content_hash = ?", (digest,))
+        if signature is not None:
+            conn.executemany("INSERT INTO deck_lsh (band, content_hash) VALUES (?, ?)",
+                             [(band, digest) for band in lsh_bands(signature)])
+
+    def find_versions(self, signature, exclude: Optional[str] = None, threshold: float = VERSION_THRESHOLD,
+                      limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Stored decks whose MinHash signature is estimated at least threshold
+        similar to this one, most similar first: (content_hash, similarity).
+        """
+        bands = lsh_bands(signature)
+        placeholders = ",".join("?" * len(bands))
+        rows = self._conn().execute(
+            f"SELECT s.content_hash, s.minhash FROM deck_signatures s WHERE s.content_hash IN "
+            f"(SELECT DISTINCT content_hash FROM deck_lsh WHERE band IN ({placeholders}))",
+            bands,
+        ).fetchall()
+        matches = []
+        for digest, blob in rows:
+            if digest == exclude or not blob:
+                continue
+            similarity = estimated_similarity(signature, np.frombuffer(blob, dtype=np.uint64))
+            if similarity >= threshold:
+                matches.append((digest, similarity))
+        return sorted(matches, key=lambda m: -m[1])[:limit]
+
+    def vectors_since(self, rowid: int = 0, batch_size: int = 5000) -> Iterator[Tuple[int, str, str, float, bytes]]:
+        """
+        Streams (rowid, content_hash, startup_name, created_at, vector bytes) of
+        similarity vectors written after rowid. A re-saved deal gets a new rowid.
+        """
+        while True:
+            rows = self._conn().execute(
+                "SELECT rowid, content_hash, startup_name, created_at, vector FROM deal_vectors "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (rowid, batch_size),
+            ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            rowid = rows[-1][0]
+
+    def backfill(self) -> int:
+        """
+        Adds similarity vectors and deck signatures for analyses saved before
+        those indexes existed. Returns how many analyses were updated.
+        """
+        missing = [row[0] for row in self._conn().execute(
+            "SELECT content_hash FROM analyses WHERE content_hash NOT IN (SELECT content_hash FROM deal_vectors) "
+            "OR content_hash NOT IN (SELECT content_hash FROM deck_signatures)"
+        )]
+        conn = self._conn()
+        for digest in missing:
+            result = self.get(digest)
+            created_at = conn.execute(
+                "SELECT created_at FROM analyses WHERE content_hash = ?", (digest,)
+            ).fetchone()[0]
+            with conn:
+                self._put_derived(conn, digest, result, created_at)
+        return len(missing)
+
+    def list(self, name: Optional[str] = None, limit: int = 50, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Lightweight listing (no payload), newest first, optionally filtered by name prefix and date.
+        """
+        query = ("SELECT content_hash, startup_name, filename, created_at, decision_outlook, confidence_score "
+                 "FROM analyses WHERE 1=1")
+        params: List[Any] = []
+        if name:
+            query += " AND startup_name LIKE ? COLLATE NOCASE"
+            params.append(f"{name}%")
+        if since:
+            query += " AND created_at >= ?"
+            params.append(since)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        columns = ("content_hash", "startup_name", "filename", "created_at", "decision_outlook", "confidence_score")
+        return [dict(zip(columns, row)) for row in self._conn().execute(query, params)]
+
+    def iter_results(self, batch_size: int = 500, since: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Streams every stored analysis (optionally only those saved after since)
+        in insertion order without loading them all at once.
+        """
+        last_rowid = 0
+        while True:
+            rows = self._conn().execute(
+                "SELECT rowid, content_hash, created_at, payload FROM analyses "
+                "WHERE rowid > ? AND created_at > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, since or 0, batch_size),
+            ).fetchall()
+            if not rows:
+                return
+            for rowid, digest, created_at, blob in rows:
+                result = self._decode(blob, digest)
+                result["created_at"] = created_at
+                yield result
+            last_rowid = rows[-1][0]
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
@@ -0,0 +1,82 @@
+"""
+Sidebar panel showing the span waterfall of the session's current trace
+(st.session_state.trace_id: the last analysis job or research question).
+"""
+from typing import Any, Dict, List, Tuple
+
+import streamlit as st
+
+from src.tracing import load_trace, trace_files_version, tracing_enabled
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_trace(trace_id: str, files_version: Tuple[Tuple[int, int], ...]) -> List[Dict[str, Any]]:
+    # files_version is only part of the cache key: new spans or a rotation invalidate the entry
+    return load_trace(trace_id)
+
+
+def waterfall_rows(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    One row per span, in start order, with offsets from the trace start and
+    the span name indented by its depth in the tree.
+    """
+    if not spans:
+        return []
+    origin = min(s["startTimeUnixNano"] for s in spans)
+    by_id = {s["spanId"]: s for s in spans}
+
+    def depth(s):
+        level = 0
+        while s.get("parentSpanId") in by_id and level < 20:
+            s = by_id[s["parentSpanId"]]
+            level += 1
+        return level
+
+    rows = []
+    for i, s in enumerate(spans):
+        attributes = {k: v for k, v in s["attributes"].items() if v is not None}
+        rows.append({
+            "order": i,
+            "span": "  " * depth(s) + s["name"],
+            "start_ms": round((s["startTimeUnixNano"] - origin) / 1e6, 1),
+            "end_ms": round((s["endTimeUnixNano"] - origin) / 1e6, 1),
+            "duration_ms": round((s["endTimeUnixNano"] - s["startTimeUnixNano"]) / 1e6, 1),
+            "status": s["status"]["code"],
+            "attributes": ", ".join(f"{k}={v}" for k, v in attributes.items()),
+        })
+    return rows
+
+
+def render_trace_panel() -> None:
+    """
+    Collapsible sidebar expander with the waterfall chart and span table.
+    The span files are only read once the user turns the panel on, and then
+    cached until they change, so ordinary reruns don't pay for the scan.
+    """
+    trace_id = st.session_state.get("trace_id")
+    if not tracing_enabled() or not trace_id:
+        return
+    with st.sidebar.expander("⏱️ Performance Trace"):
+        if not st.toggle("Show spans", key="trace_panel_on"):
+            return
+        rows = waterfall_rows(_cached_trace(trace_id, trace_files_version()))
+        if not rows:
+            st.caption("No spans recorded for this request yet.")
+            return
+        import altair as alt
+        import pandas as pd
+
+        frame = pd.DataFrame(rows)
+        total = frame["end_ms"].max()
+        st.caption(f"{len(rows)} spans · {total / 1000:.2f} s · trace {trace_id[:12]}")
+        chart = alt.Chart(frame).mark_bar().encode(
+            x=alt.X("start_ms:Q", title="ms"),
+            x2="end_ms:Q",
+            y=alt.Y("order:O", axis=alt.Axis(labelExpr="''", ticks=False), title=None),
+            color=alt.Color("status:N", scale=alt.Scale(domain=["OK", "ERROR"], range=["#4c78a8", "#e45756"]),
+                            legend=None),
+            tooltip=["span", "duration_ms", "attributes"],
+        ).properties(height=max(80, 18 * len(rows)))
+        st.altair_chart(chart, use_container_width=True)
+        st.dataframe(frame[["span", "start_ms", "duration_ms", "status", "attributes"]],
+                     hide_index=True, use_container_width=True)
@@ -0,0 +1,277 @@
+"""
+Lightweight tracing: nested, timed spans with attributes, exported as one
+JSON line per finished span (OTLP field names, flat attribute map) to
+HATCHUP_TRACE_PATH (default data/traces/spans.jsonl).
+
+    with span("parser.pdf", filename=name) as s:
+        pages = ...
+        s.set(pages=len(pages))
+
+Spans nest through a contextvar, so children opened in the same thread or
+asyncio task attach to the enclosing span. start_trace() begins a new
+trace with a chosen id (a job id, a chat turn) that the app can later load
+with load_trace(). LLM calls are traced by LLMTracingCallback, attached to
+every model built by src.llm.get_llm. HATCHUP_TRACING=off disables it all.
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+DEFAULT_TRACE_PATH = Path(__file__).parent.parent / "data" / "traces" / "spans.jsonl"
+# The file is rotated to spans.jsonl.1 once it grows past this
+MAX_TRACE_BYTES = int(float(os.getenv("HATCHUP_TRACE_MAX_MB", "20")) * 1024 * 1024)
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("hatchup_span", default=None)
+
+
+def tracing_enabled() -> bool:
+    return os.getenv("HATCHUP_TRACING", "on").lower() not in ("0", "off", "false", "no")
+
+
+def _trace_path() -> Path:
+    return Path(os.getenv("HATCHUP_TRACE_PATH", DEFAULT_TRACE_PATH))
+
+
+class JsonlSpanExporter:
+    """
+    Appends finished spans to a JSONL file. One line per span, written with a
+    single append so several processes (app, job workers) can share the file.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def export(self, record: Dict[str, Any]) -> None:
+        path = _trace_path()
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                if path.stat().st_size > MAX_TRACE_BYTES:
+                    path.replace(path.with_name(path.name + ".1"))
+            except FileNotFoundError:
+                pass
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+exporter = JsonlSpanExporter()
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        exporter.export({
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "OK"},
+            "resource": {"service.name": "hatchup", "process.pid": os.getpid()},
+        })
+
+
+class _NoopSpan:
+    trace_id = None
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class span:
+    """
+    Context manager (sync and async) for one span under the current one.
+    Exceptions are recorded on the span and re-raised.
+    """
+
+    def __init__(self, name: str, trace_id: Optional[str] = None, **attributes: Any):
+        self.name = name
+        self.trace_id = trace_id
+        self.attributes = attributes
+        self._span = None
+        self._token = None
+
+    def __enter__(self):
+        if not tracing_enabled():
+            return _NOOP
+        parent = _current.get()
+        if self.trace_id or parent is None:
+            trace_id, parent_id = self.trace_id or uuid.uuid4().hex, None
+        else:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        self._span = Span(self.name, trace_id, parent_id, self.attributes)
+        self._token = _current.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._span is None:
+            return False
+        if exc is not None:
+            self._span.error = f"{exc_type.__name__}: {exc}"[:500]
+        _current.reset(self._token)
+        self._span.end()
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+def start_trace(name: str, trace_id: Optional[str] = None, **attributes: Any) -> span:
+    """
+    A root span that begins a new trace, e.g. one per job or per chat turn.
+    """
+    return span(name, trace_id=trace_id or uuid.uuid4().hex, **attributes)
+
+
+def traced(name: str):
+    """
+    Decorator: runs the function inside span(name).
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span():
+    return _current.get() or _NOOP
+
+
+def trace_files_version() -> Tuple[Tuple[int, int], ...]:
+    """
+    (mtime, size) of the span files; changes whenever spans are exported or rotated.
+    """
+    path = _trace_path()
+    stats = []
+    for candidate in (path.with_name(path.name + ".1"), path):
+        try:
+            stat = candidate.stat()
+            stats.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stats.append((0, 0))
+    return tuple(stats)
+
+
+def load_trace(trace_id: str) -> List[Dict[str, Any]]:
+    """
+    All exported spans of one trace, oldest first.
+    """
+    path = _trace_path()
+    spans = []
+    for candidate in (path.with_name(path.name + ".1"), path):
+        if not candidate.exists():
+            continue
+        with open(candidate, encoding="utf-8") as f:
+            for line in f:
+                # Cheap substring check before parsing; most lines belong to other traces
+                if trace_id in line:
+                    record = json.loads(line)
+                    if record["traceId"] == trace_id:
+                        spans.append(record)
+    return sorted(spans, key=lambda s: s["startTimeUnixNano"])
+
+
+class LLMTracingCallback(BaseCallbackHandler):
+    """
+    One span per chat model call, child of whatever span is current when the
+    call starts. Records model, prompt / completion tokens, time to first
+    token (when streaming) and Groq's queue / prompt / completion times.
+    """
+
+    # Run in the caller's thread / task so the parent span is the current one
+    run_inline = True
+
+    def __init__(self):
+        self._spans: Dict[Any, Span] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        if not tracing_enabled():
+            return
+        parent = _current.get()
+        model = (kwargs.get("invocation_params") or {}).get("model_name") or \
+            (kwargs.get("invocation_params") or {}).get("model") or (serialized or {}).get("name")
+        attributes = {"llm.model": model, "llm.messages": sum(len(batch) for batch in messages),
+                      "llm.prompt_chars": sum(len(str(m.content)) for batch in messages for m in batch)}
+        if parent is None:
+            new = Span("llm.chat", uuid.uuid4().hex, None, attributes)
+        else:
+            new = Span("llm.chat", parent.trace_id, parent.span_id, attributes)
+        with self._lock:
+            self._spans[run_id] = new
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        current = self._spans.get(run_id)
+        if current is not None and "llm.time_to_first_token_ms" not in current.attributes:
+            current.attributes["llm.time_to_first_token_ms"] = round((time.time_ns() - current.start_ns) / 1e6, 1)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            current = self._spans.pop(run_id, None)
+        if current is None:
+            return
+        usage = {}
+        metadata = {}
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                if message is not None:
+                    usage = getattr(message, "usage_metadata", None) or usage
+                    metadata = message.response_metadata or metadata
+        token_usage = metadata.get("token_usage") or (response.llm_output or {}).get("token_usage") or {}
+        current.set(**{
+            "llm.prompt_tokens": usage.get("input_tokens", token_usage.get("prompt_tokens")),
+            "llm.completion_tokens": usage.get("output_tokens", token_usage.get("completion_tokens")),
+        })
+        # Groq reports where its time went; queue_time is time spent waiting for capacity
+        for key in ("queue_time", "prompt_time", "completion_time", "total_time"):
+            if token_usage.get(key) is not None:
+                current.attributes[f"groq.{key}_ms"] = round(token_usage[key] * 1000, 1)
+        current.end()
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            current = self._spans.pop(run_id, None)
+        if current is not None:
+            current.error = f"{type(error).__name__}: {error}"[:500]
+            current.end()
+
+
+llm_tracing_callback = LLMTracingCallback()
@@ -0,0 +1,287 @@
+"""
+Persistent ledger of LLM usage: one row per chat model call with the
+calling component (analyzer, memo, summary, research, chat, prefetch),
+the deal's content hash, the model, prompt / completion tokens and latency.
+
+Rows are written by UsageCallback, which src.llm.get_llm attaches to every
+model. Callers label their calls with usage_context():
+
+    with usage_context(component="research", deal=result["content_hash"]):
+        chain.invoke(...)
+
+or, where a context manager can't wrap the call (async generators), with
+run metadata: llm.astream(messages, config={"metadata": {"component": "research"}}).
+
+Token counts come from the response's usage metadata; when a backend does
+not report them (e.g. some streaming responses) they are estimated with
+src.tokens.count_tokens and the row is flagged as estimated.
+
+    python -m src.usage --by component --days 7
+"""
+import argparse
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+DEFAULT_USAGE_PATH = Path(__file__).parent.parent / "data" / "usage.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_usage (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    component TEXT NOT NULL,
+    deal_hash TEXT,
+    model TEXT,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    estimated INTEGER NOT NULL DEFAULT 0,
+    latency_ms REAL NOT NULL,
+    ttft_ms REAL,
+    ok INTEGER NOT NULL DEFAULT 1,
+    trace_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_usage_created ON llm_usage (created_at);
+CREATE INDEX IF NOT EXISTS idx_usage_deal ON llm_usage (deal_hash);
+"""
+
+# Grouping expressions for UsageLedger.aggregate
+GROUPS = {
+    "deal": "deal_hash",
+    "day": "date(created_at, 'unixepoch', 'localtime')",
+    "component": "component",
+    "model": "model",
+}
+
+_context: contextvars.ContextVar[Dict[str, Optional[str]]] = contextvars.ContextVar("hatchup_usage", default={})
+
+
+@contextmanager
+def usage_context(component: Optional[str] = None, deal: Optional[str] = None) -> Iterator[None]:
+    """
+    Labels LLM calls made inside the block. Unset values are inherited from
+    an enclosing usage_context, so a pipeline can set the deal once and each
+    stage its component.
+    """
+    labels = dict(_context.get())
+    if component:
+        labels["component"] = component
+    if deal:
+        labels["deal"] = deal
+    token = _context.set(labels)
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def usage_enabled() -> bool:
+    return os.getenv("HATCHUP_USAGE", "on").lower() not in ("0", "off", "false", "no")
+
+
+class UsageLedger:
+    """
+    SQLite ledger of LLM calls (HATCHUP_USAGE_PATH, default data/usage.db).
+    Kept apart from the analysis store so call logging never contends with
+    result writes.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or os.getenv("HATCHUP_USAGE_PATH", DEFAULT_USAGE_PATH))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # Same per-thread WAL connections as AnalysisStore
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record(self, component: str, deal_hash: Optional[str], model: Optional[str], prompt_tokens: int,
+               completion_tokens: int, latency_ms: float, estimated: bool = False,
+               ttft_ms: Optional[float] = None, ok: bool = True, trace_id: Optional[str] = None,
+               created_at: Optional[float] = None) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO llm_usage (created_at, component, deal_hash, model, prompt_tokens, completion_tokens, "
+                "estimated, latency_ms, ttft_ms, ok, trace_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (created_at or time.time(), component, deal_hash, model, prompt_tokens, completion_tokens,
+                 int(estimated), latency_ms, ttft_ms, int(ok), trace_id),
+            )
+
+    def aggregate(self, by: str = "component", since: Optional[float] = None,
+                  component: Optional[str] = None, deal: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Totals grouped by deal, day, component or model, largest token users first.
+        """
+        key = GROUPS[by]
+        query = (f"SELECT {key} AS key, COUNT(*), SUM(prompt_tokens), SUM(completion_tokens), "
+                 "SUM(estimated), SUM(1 - ok), SUM(latency_ms), AVG(latency_ms), MAX(latency_ms), AVG(ttft_ms) "
+                 "FROM llm_usage WHERE 1=1")
+        params: List[Any] = []
+        if since:
+            query += " AND created_at >= ?"
+            params.append(since)
+        if component:
+            query += " AND component = ?"
+            params.append(component)
+        if deal:
+            query += " AND deal_hash = ?"
+            params.append(deal)
+        query += " GROUP BY key ORDER BY SUM(prompt_tokens) + SUM(completion_tokens) DESC"
+        rows = []
+        for key, calls, prompt, completion, estimated, errors, total_ms, avg_ms, max_ms, ttft in \
+                self._conn().execute(query, params):
+            rows.append({
+                by: key,
+                "calls": calls,
+                "prompt_tokens": prompt,
+                "completion_tokens": completion,
+                "total_tokens": prompt + completion,
+                "estimated_calls": estimated,
+                "errors": errors,
+                "llm_time_s": round(total_ms / 1000, 2),
+                "avg_latency_ms": round(avg_ms, 1),
+                "max_latency_ms": round(max_ms, 1),
+                "avg_ttft_ms": round(ttft, 1) if ttft is not None else None,
+            })
+        return rows
+
+    def recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        columns = ("created_at", "component", "deal_hash", "model", "prompt_tokens", "completion_tokens",
+                   "estimated", "latency_ms", "ttft_ms", "ok", "trace_id")
+        rows = self._conn().execute(
+            f"SELECT {', '.join(columns)} FROM llm_usage ORDER BY created_at DESC LIMIT ?", (limit,)
+        )
+        return [dict(zip(columns, row)) for row in rows]
+
+
+_ledger: Optional[UsageLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> UsageLedger:
+    """
+    The process-wide ledger, opened on first use.
+    """
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = UsageLedger()
+        return _ledger
+
+
+class UsageCallback(BaseCallbackHandler):
+    """
+    Writes one ledger row per chat model call. Labels are read from
+    usage_context() when the call starts.
+    """
+
+    # Run in the caller's thread / task so usage_context() is visible
+    run_inline = True
+
+    def __init__(self):
+        self._calls: Dict[Any, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        if not usage_enabled():
+            return
+        from src.tracing import current_span
+
+        params = kwargs.get("invocation_params") or {}
+        labels = {**_context.get(), **{k: v for k, v in (kwargs.get("metadata") or {}).items()
+                                       if k in ("component", "deal") and v}}
+        with self._lock:
+            self._calls[run_id] = {
+                "started": time.perf_counter(),
+                "component": labels.get("component") or "other",
+                "deal": labels.get("deal"),
+                "model": params.get("model_name") or params.get("model") or (serialized or {}).get("name"),
+                "messages": messages,
+                "trace_id": current_span().trace_id,
+                "ttft_ms": None,
+            }
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        call = self._calls.get(run_id)
+        if call is not None and call["ttft_ms"] is None:
+            call["ttft_ms"] = (time.perf_counter() - call["started"]) * 1000
+
+    def _finish(self, run_id, response=None, ok: bool = True) -> None:
+        with self._lock:
+            call = self._calls.pop(run_id, None)
+        if call is None:
+            return
+        latency_ms = (time.perf_counter() - call["started"]) * 1000
+        prompt_tokens = completion_tokens = None
+        completion = ""
+        if response is not None:
+            for generations in response.generations:
+                for generation in generations:
+                    completion += generation.text or ""
+                    message = getattr(generation, "message", None)
+                    usage = getattr(message, "usage_metadata", None) if message is not None else None
+                    token_usage = (message.response_metadata or {}).get("token_usage") if message is not None else None
+                    if usage:
+                        prompt_tokens, completion_tokens = usage.get("input_tokens"), usage.get("output_tokens")
+                    elif token_usage:
+                        prompt_tokens = token_usage.get("prompt_tokens")
+                        completion_tokens = token_usage.get("completion_tokens")
+        estimated = prompt_tokens is None or completion_tokens is None
+        if estimated:
+            from src.tokens import count_tokens
+
+            if prompt_tokens is None:
+                prompt_tokens = sum(count_tokens(str(m.content)) for batch in call["messages"] for m in batch)
+            if completion_tokens is None:
+                completion_tokens = count_tokens(completion)
+        try:
+            get_ledger().record(call["component"], call["deal"], call["model"], prompt_tokens, completion_tokens,
+                                latency_ms, estimated=estimated, ttft_ms=call["ttft_ms"], ok=ok,
+                                trace_id=call["trace_id"])
+        except sqlite3.Error as e:
+            print(f"Error recording LLM usage: {e}")
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id, response)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, ok=False)
+
+
+usage_callback = UsageCallback()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Summarize the LLM usage ledger.")
+    parser.add_argument("--by", choices=sorted(GROUPS), default="component")
+    parser.add_argument("--days", type=float, help="Only the last N days")
+    parser.add_argument("--component", help="Only this component")
+    args = parser.parse_args(argv)
+
+    since = time.time() - args.days * 86400 if args.days else None
+    rows = get_ledger().aggregate(args.by, since=since, component=args.component)
+    if not rows:
+        print("No LLM calls recorded.")
+        return
+    print(f"{args.by:24} {'calls':>7} {'prompt':>10} {'completion':>11} {'LLM time s':>11} {'avg ms':>9}")
+    for row in rows:
+        print(f"{str(row[args.by])[:24]:24} {row['calls']:7} {row['prompt_tokens']:10} "
+              f"{row['completion_tokens']:11} {row['llm_time_s']:11} {row['avg_latency_ms']:9}")
+
+
+if __name__ == "__main__":
+    main()
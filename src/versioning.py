@@ -0,0 +1,287 @@
+"""
+Deck version detection and page-level diffs.
+
+A deck's signature is a MinHash over word 5-gram shingles of all its pages.
+Signatures are banded for LSH (BANDS x ROWS) and stored by AnalysisStore,
+so a new upload finds earlier versions of the same deck with one indexed
+lookup instead of comparing against every stored deal.
+
+diff_pages() matches the new deck's pages to the previous version's
+(identical text first, then best shingle overlap), and plan_update() turns
+the changed pages into the PitchDeckData fields and memo sections that need
+regenerating. AnalysisPipeline uses the plan to re-extract only those and
+reuse everything else from the stored version.
+"""
+import hashlib
+import re
+import zlib
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Sequence, Set
+
+import numpy as np
+
+from src.document_parser import DocumentParser
+from src.models import PitchDeckData
+from src.ranking import tokenize
+
+NUM_PERM = 128
+BANDS, ROWS = 32, 4
+SHINGLE_WORDS = 5
+# Estimated Jaccard similarity above which a stored deck counts as an earlier version
+VERSION_THRESHOLD = 0.5
+# Pages at least this similar to an old page are "modified"; less similar ones are "added"
+PAGE_MATCH_THRESHOLD = 0.3
+# Fewer distinct shingles than this (empty, boilerplate-only or unparsed decks) and a deck is never linked
+MIN_SHINGLES = 20
+# More changed than this (share of pages or of fields) and a full re-analysis is cheaper to trust
+MAX_CHANGED_SHARE = 0.5
+
+# Universal hashing (a * x + b) mod p; with a, b, x < p = 2^31 - 1 the product fits in uint64
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240611)
+_PERM_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+# Slide keywords that point at each extracted field; titles count more than body text.
+# Matched as whole words (plural "s" allowed), never as substrings of other words.
+FIELD_KEYWORDS = {
+    "problem": ("problem", "pain", "challenge"),
+    "solution": ("solution", "how it works", "approach"),
+    "product": ("product", "platform", "feature", "demo", "technology", "roadmap"),
+    "market_tam": ("market", "tam", "sam", "som", "opportunity"),
+    "business_model": ("business model", "pricing", "revenue model", "monetization", "monetize",
+                       "unit economics"),
+    "traction_metrics": ("traction", "arr", "mrr", "revenue", "customers", "users", "growth", "pilot",
+                         "retention"),
+    "team": ("team", "founder", "ceo", "cto", "advisor", "hiring"),
+    "competitive_landscape": ("competition", "competitor", "landscape", "alternatives", "moat"),
+    "funding_ask_stage": ("ask", "raising", "round", "pre-seed", "seed", "series", "use of funds", "runway"),
+}
+# Deck-wide judgments, re-extracted whenever anything changed
+DECK_WIDE_FIELDS = ("missing_sections", "weak_signals", "red_flags")
+
+# Memo section -> the PitchDeckData fields it is written from
+SECTION_FIELDS = {
+    "company_overview": ("startup_name", "problem", "solution", "product", "funding_ask_stage"),
+    "problem_solution_clarity": ("problem", "solution"),
+    "market_opportunity": ("market_tam", "competitive_landscape"),
+    "product_differentiation": ("product", "competitive_landscape"),
+    "traction_metrics_analysis": ("traction_metrics", "business_model"),
+    "team_assessment": ("team",),
+}
+# Sections that weigh the whole deal, regenerated whenever anything changed
+DECK_WIDE_SECTIONS = ("risks_concerns", "open_questions", "neutral_assessment")
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> Set[int]:
+    terms = tokenize(text)
+    if len(terms) < size:
+        return {zlib.crc32(" ".join(terms).encode("utf-8"))} if terms else set()
+    return {zlib.crc32(" ".join(terms[i:i + size]).encode("utf-8")) for i in range(len(terms) - size + 1)}
+
+
+def content_shingles(pages: Sequence[str]) -> Set[int]:
+    """
+    Shingles of all pages, skipping empty pages and parser error placeholders.
+    """
+    values: Set[int] = set()
+    for page in pages:
+        if page and not DocumentParser.is_parse_error(page):
+            values |= shingles(page)
+    return values
+
+
+def minhash(pages: Sequence[str]) -> np.ndarray:
+    """
+    NUM_PERM-value MinHash signature of all pages' shingles, as uint64.
+    """
+    values = content_shingles(pages)
+    if not values:
+        return np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    x = np.fromiter(values, dtype=np.uint64, count=len(values)) % np.uint64(_PRIME)
+    hashed = (_PERM_A[:, None] * x[None, :] + _PERM_B[:, None]) % np.uint64(_PRIME)
+    return hashed.min(axis=1)
+
+
+def deck_signature(pages: Sequence[str]) -> Optional[np.ndarray]:
+    """
+    The MinHash signature used for version linking, or None when the deck has
+    too little real content to tell it apart from other decks.
+    """
+    if len(content_shingles(pages)) < MIN_SHINGLES:
+        return None
+    return minhash(pages)
+
+
+def lsh_bands(signature: np.ndarray) -> List[str]:
+    """
+    One key per band; decks sharing any key are candidate versions of each other.
+    """
+    return [f"{band}:{hashlib.blake2b(signature[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).hexdigest()}"
+            for band in range(BANDS)]
+
+
+def estimated_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.mean(a == b))
+
+
+def _jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class PageDiff:
+    unchanged: List[int] = field(default_factory=list)
+    # (new page, old page) pairs
+    modified: List[List[int]] = field(default_factory=list)
+    added: List[int] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.modified or self.added or self.removed)
+
+    def changed_share(self, new_pages: int) -> float:
+        return (len(self.modified) + len(self.added) + len(self.removed)) / max(new_pages, 1)
+
+    def to_dict(self) -> Dict[str, List]:
+        return asdict(self)
+
+
+def diff_pages(old: Dict[int, str], new: Dict[int, str]) -> PageDiff:
+    """
+    Matches pages by identical text, then pairs each remaining new page with
+    the most similar remaining old page, then with the old page in the same
+    position (a slide rewritten in place). Keys are page numbers.
+    """
+    diff = PageDiff()
+    old_by_text: Dict[str, List[int]] = {}
+    for number, text in old.items():
+        old_by_text.setdefault(text, []).append(number)
+    unmatched_old = set(old)
+    matched: Dict[int, int] = {}
+    pending = []
+    for number, text in sorted(new.items()):
+        candidates = [n for n in old_by_text.get(text, []) if n in unmatched_old]
+        if candidates:
+            unmatched_old.discard(candidates[0])
+            matched[number] = candidates[0]
+            diff.unchanged.append(number)
+        else:
+            pending.append(number)
+
+    old_shingles = {number: shingles(old[number]) for number in unmatched_old}
+    for number in pending:
+        new_shingles = shingles(new[number])
+        best, score = None, 0.0
+        for candidate in sorted(unmatched_old):
+            similarity = _jaccard(new_shingles, old_shingles[candidate])
+            if similarity > score:
+                best, score = candidate, similarity
+        if best is not None and score >= PAGE_MATCH_THRESHOLD:
+            unmatched_old.discard(best)
+            matched[number] = best
+            diff.modified.append([number, best])
+        else:
+            diff.added.append(number)
+
+    # Position relative to the closest matched page before it
+    for number in list(diff.added):
+        anchor = max((n for n in matched if n < number), default=0)
+        same_place = matched[anchor] + (number - anchor) if anchor else number
+        if same_place in unmatched_old:
+            unmatched_old.discard(same_place)
+            matched[number] = same_place
+            diff.added.remove(number)
+            diff.modified.append([number, same_place])
+    diff.modified.sort()
+    diff.removed = sorted(unmatched_old)
+    return diff
+
+
+def _keyword_hits(keywords: Sequence[str], terms: Set[str], text: str) -> int:
+    """
+    How many keywords occur in the text: single words looked up in its token
+    set, phrases ("unit economics", "pre-seed") matched on word boundaries.
+    """
+    hits = 0
+    for keyword in keywords:
+        if " " in keyword or "-" in keyword:
+            hits += bool(re.search(rf"\b{re.escape(keyword)}s?\b", text))
+        else:
+            hits += keyword in terms or f"{keyword}s" in terms
+    return hits
+
+
+def page_fields(text: str, previous: PitchDeckData) -> Set[str]:
+    """
+    The fields a slide most likely feeds: keyword hits (title weighted) plus
+    word overlap with each field's previous value. Empty if nothing stands out.
+    """
+    lines = text.strip().lower().split("\n")
+    title, body = lines[0], " ".join(lines[1:])
+    title_terms, body_terms = set(tokenize(title)), set(tokenize(body))
+    page_terms = title_terms | body_terms
+    scores = {}
+    for name, keywords in FIELD_KEYWORDS.items():
+        score = 3 * _keyword_hits(keywords, title_terms, title) + _keyword_hits(keywords, body_terms, body)
+        field_terms = set(tokenize(getattr(previous, name) or ""))
+        if field_terms and page_terms:
+            score += 5 * len(page_terms & field_terms) / len(page_terms | field_terms)
+        scores[name] = score
+    best = max(scores.values())
+    if best < 1:
+        return set()
+    return {name for name, score in scores.items() if score >= max(1.0, best / 2)}
+
+
+@dataclass
+class UpdatePlan:
+    fields: List[str]
+    sections: List[str]
+    # Text of the changed slides (new text, or the old text of removed ones) for the re-extraction prompt
+    context: str
+    incremental: bool
+    reason: str = ""
+
+
+def plan_update(diff: PageDiff, old: Dict[int, str], new: Dict[int, str], previous: PitchDeckData) -> UpdatePlan:
+    """
+    Which fields / sections to regenerate for this diff, or a full re-analysis
+    when the change is too broad or a changed slide can't be attributed.
+    """
+    all_fields = list(PitchDeckData.model_fields)
+    if not diff.changed:
+        if sorted(old.values()) == sorted(new.values()) and len(content_shingles(new.values())) >= MIN_SHINGLES:
+            return UpdatePlan([], [], "", True, "no content changes")
+        return UpdatePlan(all_fields, [], "", False, "too little deck content to compare")
+    if diff.changed_share(len(new)) > MAX_CHANGED_SHARE:
+        return UpdatePlan(all_fields, [], "", False, "too many slides changed")
+
+    touched: Set[str] = set()
+    slides = []
+    for number in diff.added + [pair[0] for pair in diff.modified]:
+        page_touched = page_fields(new[number], previous)
+        old_number = next((o for n, o in diff.modified if n == number), None)
+        if old_number is not None:
+            page_touched |= page_fields(old[old_number], previous)
+        if not page_touched:
+            return UpdatePlan(all_fields, [], "", False, f"slide {number} doesn't map to a known section")
+        touched |= page_touched
+        slides.append(f"[Slide {number}]\n{new[number]}")
+    for number in diff.removed:
+        page_touched = page_fields(old[number], previous)
+        if not page_touched:
+            return UpdatePlan(all_fields, [], "", False, f"removed slide {number} doesn't map to a known section")
+        touched |= page_touched
+        slides.append(f"[Removed slide, was {number}]\n{old[number]}")
+    if 1 in diff.added or any(n == 1 for n, _ in diff.modified):
+        touched.add("startup_name")
+
+    fields = [f for f in all_fields if f in touched or f in DECK_WIDE_FIELDS]
+    if len(touched) > MAX_CHANGED_SHARE * len(FIELD_KEYWORDS):
+        return UpdatePlan(all_fields, [], "", False, "too many sections touched")
+    sections = [s for s, sources in SECTION_FIELDS.items() if touched & set(sources)] + list(DECK_WIDE_SECTIONS)
+    return UpdatePlan(fields, sections, "\n\n".join(slides), True)
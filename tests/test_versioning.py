@@ -0,0 +1,109 @@
+"""
+Page diffs and update plans decide which parts of a stored analysis are
+reused for a new deck version, so they are tested on small hand-written decks.
+"""
+from src.models import PitchDeckData
+from src.versioning import DECK_WIDE_FIELDS, deck_signature, diff_pages, estimated_similarity, page_fields, \
+    plan_update
+
+PREVIOUS = PitchDeckData(
+    startup_name="Acme Freight",
+    problem="Small shippers lose days booking freight by phone and email.",
+    solution="A self-serve booking marketplace with instant quotes.",
+    product="Web app with live tracking and automated customs paperwork.",
+    market_tam="US freight brokerage is a $90B market; SAM of $12B for small shippers.",
+    business_model="Take rate of 8% per booked load plus a SaaS tier for larger shippers.",
+    traction_metrics="$40k MRR, 120 paying customers, 15% month over month growth.",
+    team="Jane Doe (CEO, ex-Flexport), John Roe (CTO, ex-Uber Freight).",
+    competitive_landscape="Competes with Flexport, Convoy and traditional brokers.",
+    funding_ask_stage="Raising a $2M seed round.",
+    missing_sections=[],
+    weak_signals=[],
+    red_flags=[],
+)
+
+DECK = {
+    1: "Acme Freight\nSelf-serve freight booking for small shippers across the United States today",
+    2: "The Problem\nSmall shippers lose days booking freight by phone and email with slow brokers",
+    3: "Our Solution\nA self-serve booking marketplace with instant quotes and live tracking for every load",
+    4: "Market Opportunity\nUS freight brokerage is a ninety billion dollar market with twelve billion reachable",
+    5: "Traction\nForty thousand dollars MRR with one hundred twenty paying customers growing fifteen percent monthly",
+    6: "Team\nJane Doe CEO formerly at Flexport and John Roe CTO formerly at Uber Freight lead the company",
+    7: "Competition\nWe compete with Flexport Convoy and traditional brokers on speed and price transparency",
+    8: "The Ask\nRaising a two million dollar seed round to hire engineers and extend runway to two years",
+}
+
+
+def test_identical_deck_has_no_changes_and_reuses_everything():
+    diff = diff_pages(DECK, dict(DECK))
+    assert not diff.changed
+    plan = plan_update(diff, DECK, dict(DECK), PREVIOUS)
+    assert plan.incremental and plan.fields == [] and plan.sections == []
+
+
+def test_reordered_slides_are_unchanged():
+    order = [1, 2, 3, 5, 4, 6, 8, 7]
+    new = {number: DECK[old] for number, old in enumerate(order, start=1)}
+    diff = diff_pages(DECK, new)
+    assert not diff.changed
+    assert diff.unchanged == list(range(1, 9))
+    assert plan_update(diff, DECK, new, PREVIOUS).fields == []
+
+
+def test_slide_rewritten_in_place_is_modified():
+    new = dict(DECK)
+    new[5] = "Traction\nNow at ninety thousand dollars ARR after signing our first enterprise pilot last quarter"
+    diff = diff_pages(DECK, new)
+    assert diff.modified == [[5, 5]]
+    assert diff.added == [] and diff.removed == []
+
+    plan = plan_update(diff, DECK, new, PREVIOUS)
+    assert plan.incremental
+    assert set(plan.fields) == {"traction_metrics", *DECK_WIDE_FIELDS}
+    assert "traction_metrics_analysis" in plan.sections
+    assert "team_assessment" not in plan.sections
+    assert "[Slide 5]" in plan.context
+
+
+def test_removed_slide():
+    new = {number: DECK[old] for number, old in enumerate([1, 2, 3, 4, 5, 6, 8], start=1)}
+    diff = diff_pages(DECK, new)
+    assert diff.removed == [7]
+    assert diff.modified == [] and diff.added == []
+
+    plan = plan_update(diff, DECK, new, PREVIOUS)
+    assert plan.incremental
+    assert "competitive_landscape" in plan.fields
+    assert "[Removed slide, was 7]" in plan.context
+
+
+def test_too_many_changes_fall_back_to_full_analysis():
+    new = {number: f"Slide {number}\nCompletely new content about something else entirely {number}"
+           for number in DECK}
+    plan = plan_update(diff_pages(DECK, new), DECK, new, PREVIOUS)
+    assert not plan.incremental
+    assert plan.fields == list(PitchDeckData.model_fields)
+
+
+def test_thin_decks_are_never_linked_or_reused():
+    errors = {1: "Error parsing Image (OCR): cannot identify image file. Ensure Tesseract is installed."}
+    assert deck_signature(list(errors.values())) is None
+    assert deck_signature(["", "Thank you"]) is None
+
+    plan = plan_update(diff_pages(errors, dict(errors)), errors, dict(errors), PREVIOUS)
+    assert not plan.incremental
+
+
+def test_signature_similarity_tracks_overlap():
+    edited = dict(DECK)
+    edited[5] = "Traction\nNow at ninety thousand dollars ARR after signing our first enterprise pilot last quarter"
+    original = deck_signature(list(DECK.values()))
+    assert estimated_similarity(original, deck_signature(list(DECK.values()))) == 1.0
+    assert estimated_similarity(original, deck_signature(list(edited.values()))) > 0.5
+
+
+def test_keywords_match_whole_words_only():
+    team = ("Our Team\nJane led every task as a director in the logistics sector, with a background "
+            "in some narrow samples of freight data")
+    assert page_fields(team, PREVIOUS) == {"team"}
+    assert page_fields("The Ask\nRaising a pre-seed round", PREVIOUS) == {"funding_ask_stage"}